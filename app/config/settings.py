@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -30,6 +30,12 @@ class Config(BaseSettings):
     LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4o")
     LLM_PROVIDER: str = "openai"
     LLM_TEMPERATURE: float = 0.1
+    LLM_SUPPORTS_VISION: bool = True
+
+    # Attach a downscaled page screenshot to the first agent message
+    INLINE_SCREENSHOT: bool = False
+    INLINE_SCREENSHOT_MAX_WIDTH: int = 1024
+    INLINE_SCREENSHOT_MAX_BYTES: int = 150_000
 
     # Gemini Config for File Analysis
     GEMINI_API_KEYS: List[str] = (
@@ -41,6 +47,158 @@ class Config(BaseSettings):
     GEMINI_BASE_URL: str = os.getenv(
         "GEMINI_BASE_URL", "https://aipipe.org/openrouter/v1"
     )
+    GEMINI_MAX_CONCURRENCY: int = 8  # parallel map calls across keys
+    GEMINI_KEY_COOLDOWN_SECONDS: int = 60  # skip a failing key for this long
+
+    # Chunked media analysis
+    MEDIA_CHUNKING: bool = True
+    MEDIA_SEGMENT_SECONDS: int = 60
+    MEDIA_SEGMENT_OVERLAP_SECONDS: int = 2
+    VIDEO_MAX_INLINE_SECONDS: int = 600  # longer (or oversized) videos use keyframes
+    VIDEO_KEYFRAME_INTERVAL_SECONDS: float = 2.0
+    VIDEO_FRAMES_PER_SEGMENT: int = 10
+    VIDEO_MAX_FRAMES: int = 120
+
+    # Decode QR codes/barcodes locally before calling Gemini on images
+    LOCAL_DECODE_ENABLED: bool = True
+
+    # Local PDF extraction
+    PDF_PARALLEL_MIN_PAGES: int = 20  # fewer pages are extracted in-process
+    PDF_MAX_WORKERS: int = 4
+
+    # Chromium processes; page work is routed to the least-loaded one.
+    # 0 = one per two CPU cores, at most 4
+    BROWSER_SHARDS: int = 0
+    # Attach to already-running Chromium instances instead (one shard per
+    # endpoint), e.g. ["http://browser-1:9222", "http://browser-2:9222"]
+    BROWSER_CDP_ENDPOINTS: List[str] = []
+    BROWSER_CONNECT_TIMEOUT: int = 10  # seconds to wait for a CDP endpoint
+
+    # Python tool: code runs in worker processes holding per-quiz namespaces
+    PYTHON_KERNELS: int = 0  # 0 = one per CPU core, at most 4
+    PYTHON_TIMEOUT: int = 100  # seconds before a run is killed (below TOOL_TIMEOUT)
+    # Seconds to wait for a kernel busy with another session before giving up
+    # (PYTHON_QUEUE_TIMEOUT + PYTHON_TIMEOUT stays below TOOL_TIMEOUT)
+    PYTHON_QUEUE_TIMEOUT: int = 15
+    # Per-run limits inside the worker (0 disables each)
+    PYTHON_CPU_SECONDS: int = 90  # CPU time across all threads
+    PYTHON_MAX_MEMORY_MB: int = 4096  # new address space
+    PYTHON_MAX_OUTPUT_BYTES: int = 100_000  # printed output kept
+    # Imported once in the kernel fork server, so every worker starts with
+    # them loaded (modules that are not installed are skipped)
+    PYTHON_PRELOAD_MODULES: List[str] = [
+        "numpy",
+        "pandas",
+        "scipy",
+        "sklearn",
+        "matplotlib.pyplot",
+        "networkx",
+        "duckdb",
+        "cv2",
+    ]
+
+    # Multi-page crawl tool
+    CRAWL_CONCURRENCY: int = 4  # pages rendered at once
+    CRAWL_MAX_PAGES: int = 50
+
+    # Browser page pool (per Chromium shard)
+    BROWSER_POOL_CONTEXTS: int = 2
+    BROWSER_POOL_WARM_PAGES: int = 2
+    BROWSER_MAX_PAGES: int = 8  # concurrent pages; further requests wait
+    BROWSER_PAGE_MAX_USES: int = 50  # recycle a page after this many uses
+
+    # Browser health supervision
+    BROWSER_HEALTH_INTERVAL: int = 30  # seconds between liveness probes (0 disables)
+    BROWSER_PROBE_TIMEOUT: int = 10  # seconds before a probe counts as a hang
+    BROWSER_RECYCLE_PAGES: int = 500  # restart after this many page loads (0 disables)
+    BROWSER_MAX_MEMORY_MB: int = 1500  # restart a shard above this RSS (0 disables)
+    BROWSER_DRAIN_TIMEOUT: int = 30  # seconds to let in-flight pages finish first
+
+    # Request interception (images are still loaded when a screenshot is taken)
+    BROWSER_BLOCK_RESOURCES: bool = True
+    # Stylesheets are left alone: they decide which text is visible
+    BROWSER_BLOCK_RESOURCE_TYPES: List[str] = ["image", "media", "font"]
+    BROWSER_BLOCK_DOMAINS: List[str] = [
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "facebook.net",
+        "hotjar.com",
+    ]
+
+    # Disk cache for static assets (honors Cache-Control/Expires)
+    ASSET_CACHE_ENABLED: bool = True
+    ASSET_CACHE_TYPES: List[str] = ["script", "stylesheet", "font", "image"]
+    ASSET_CACHE_MAX_MB: int = 200
+    ASSET_CACHE_MAX_FILE_MB: int = 5
+
+    # HTTP fast path: fetch static pages without the browser
+    HTTP_FAST_PATH: bool = True
+    FAST_PATH_TIMEOUT: int = 5  # seconds
+    FAST_PATH_DECISION_TTL: int = 3600  # remember per-domain browser decisions
+    # Render pages with only simple inline scripts in QuickJS (uv sync --extra js)
+    JS_ENGINE_ENABLED: bool = True
+    JS_ENGINE_TIMEOUT: float = 1.0  # seconds of script execution before giving up
+
+    # Page capture: any of html, text, screenshot, aria (others on demand)
+    CAPTURE_OUTPUTS: List[str] = ["html", "text", "screenshot"]
+    SCREENSHOT_FULL_PAGE: bool = False  # viewport-only by default
+    SCREENSHOT_QUALITY: int = 70  # JPEG quality
+
+    # Network response capture: data fetched by the page is saved for the agent
+    CAPTURE_RESPONSES: bool = True
+    RESPONSE_CAPTURE_TYPES: List[str] = [
+        "application/json",
+        "text/csv",
+        "text/plain",
+        "text/tab-separated-values",
+        "application/xml",
+        "text/xml",
+        "application/pdf",
+        "application/vnd.ms-excel",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ]
+    RESPONSE_CAPTURE_MAX_BYTES: int = 10 * 1024 * 1024  # total per page load
+
+    # Page context sent to the LLM: condensed text instead of raw HTML
+    CONDENSE_HTML: bool = True
+
+    # Token budgets for agent messages (counted with the LLM_MODEL tokenizer)
+    LLM_CONTEXT_TOKENS: int = 128000  # context window of LLM_MODEL
+    LLM_RESPONSE_RESERVE_TOKENS: int = 8000  # system prompt, tool schemas, reply
+    FETCH_MESSAGE_MAX_TOKENS: int = 12000  # page content, logs, data file list
+    TOOL_OUTPUT_MAX_TOKENS: int = 8000  # per tool result
+
+    # Speculative prefetch of data links on the quiz page (into the download cache)
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_MAX_FILES: int = 5
+    PREFETCH_MAX_FILE_MB: int = 5
+    PREFETCH_CONCURRENCY: int = 3
+    PREFETCH_EXTENSIONS: List[str] = [
+        "csv",
+        "tsv",
+        "json",
+        "xml",
+        "txt",
+        "pdf",
+        "xlsx",
+        "xls",
+        "parquet",
+        "zip",
+        "mp3",
+        "wav",
+        "ogg",
+        "m4a",
+        "flac",
+        "mp4",
+        "webm",
+    ]
+
+    # Page readiness (replaces networkidle + fixed sleep)
+    READINESS_QUIET_MS: int = 300  # DOM must be unchanged this long
+    READINESS_TIMEOUT_MS: int = 10000  # give up waiting and capture anyway
+    READINESS_LONG_REQUEST_MS: int = 2000  # older pending requests are long-polls
+    READINESS_SELECTORS: Dict[str, str] = {}  # domain -> CSS selector to wait for
 
     # Timeouts & Limits
     BROWSER_PAGE_TIMEOUT: int = 10000  # milliseconds
@@ -2,30 +2,50 @@
 
 import asyncio
 from app.resources.api import APIClient
-from app.resources.browser import BrowserClient
+from app.resources.browser_manager import BrowserManager
+from app.resources.kernels import KernelPool
 from app.resources.llm import LLMClient
+from app.tools.pdf import shutdown_workers as shutdown_pdf_workers
 from app.utils.logging import logger
 
 
 class GlobalResources:
-    """Container for shared API, browser, and LLM clients."""
+    """Container for shared API, browser, LLM clients, and Python kernels."""
 
     def __init__(self):
         self.api_client: APIClient | None = None
-        self.browser: BrowserClient | None = None
+        self.browser: BrowserManager | None = None
         self.llm_client: LLMClient | None = None
+        self.kernels: KernelPool | None = None
 
     async def initialize(self) -> None:
         """Initialize all resources concurrently."""
         logger.info("Initializing global resources...")
         self.api_client = APIClient()
-        self.browser = BrowserClient()
+        self.browser = BrowserManager()
         self.llm_client = LLMClient()
-        await asyncio.gather(self.api_client.initialize(), self.browser.initialize())
+        self.kernels = KernelPool()
+        await asyncio.gather(
+            self.api_client.initialize(),
+            self.browser.initialize(),
+            self.kernels.initialize(),
+        )
         logger.info("Global resources initialized.")
 
+    def stats(self) -> dict:
+        """Runtime metrics for shared resources."""
+        return {
+            "browser": self.browser.stats() if self.browser else {},
+            "python": self.kernels.stats() if self.kernels else {},
+        }
+
     async def close(self) -> None:
         """Close all resources concurrently."""
         if self.api_client:
-            await asyncio.gather(self.api_client.close(), self.browser.close())
+            await asyncio.gather(
+                self.api_client.close(),
+                self.browser.close(),
+                self.kernels.close(),
+                asyncio.to_thread(shutdown_pdf_workers),
+            )
         logger.info("Global resources closed.")
@@ -15,6 +15,7 @@ class QuizState(TypedDict):
     email: str
     secret: str
     current_url: str
+    session_id: str
 
     # Workflow state
     answer_payload: Any
@@ -5,7 +5,6 @@ import time
 from langchain_core.messages import HumanMessage, RemoveMessage
 from app.config.settings import settings
 from app.graph.state import QuizState
-from app.tools.python import reset_python_session
 from app.utils.answers import save_correct_answer
 from app.utils.logging import logger
 
@@ -57,7 +56,7 @@ async def feedback_node(state: QuizState) -> dict:
         ]
         if not next_url:
             return {"is_complete": True, "completed_quizzes": completed_quizzes}
-        reset_python_session()
+        await state["resources"].kernels.reset(state["session_id"])
         return _create_reset_state(next_url, completed_quizzes, state["messages"])
 
     # Handle incorrect answer
@@ -71,7 +70,7 @@ async def feedback_node(state: QuizState) -> dict:
     if elapsed > settings.QUIZ_TIMEOUT_SECONDS:
         if next_url:
             logger.warning(f"⏰ Timeout! Moving to next quiz: {next_url}")
-            reset_python_session()
+            await state["resources"].kernels.reset(state["session_id"])
             return _create_reset_state(next_url, completed_quizzes, state["messages"])
         logger.warning("⏰ Timeout! No more quizzes, marking complete.")
         return {"is_complete": True, "completed_quizzes": completed_quizzes}
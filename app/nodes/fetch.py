@@ -1,25 +1,195 @@
 """Fetch node for retrieving page content."""
 
+import asyncio
+import hashlib
+from urllib.parse import urlparse
+from app.config.settings import settings
+from app.graph.resources import GlobalResources
 from app.graph.state import QuizState
+from app.utils.cache import get_cache_key, cache_get, cache_set
+from app.utils.html import condense_html, html_to_text, needs_browser
+from app.utils.jsrender import render_inline_scripts
 from app.utils.logging import logger
+from app.utils.prefetch import start_prefetch
+from app.utils.tokens import available_tokens, count_tokens, fit_sections
+from app.utils.vision import image_to_data_uri
 from langchain_core.messages import HumanMessage
 
 
+def _inline_screenshot(screenshot_path: str) -> dict | None:
+    """Build an image content part from the screenshot, if enabled and it fits."""
+    if not (
+        settings.INLINE_SCREENSHOT and settings.LLM_SUPPORTS_VISION and screenshot_path
+    ):
+        return None
+    data_uri = image_to_data_uri(
+        screenshot_path,
+        settings.INLINE_SCREENSHOT_MAX_WIDTH,
+        settings.INLINE_SCREENSHOT_MAX_BYTES,
+    )
+    return {"type": "image_url", "image_url": {"url": data_uri}} if data_uri else None
+
+
+# Share of the fetch message budget each section gets when they do not all fit
+SECTION_WEIGHTS = {"page": 6, "console_logs": 3, "responses": 1}
+# Fixed instructions and markers around the sections
+MESSAGE_FRAME_TOKENS = 300
+
+
+def _page_context(html: str, url: str) -> tuple[str, str]:
+    """Build the page content sent to the LLM and save the raw HTML.
+
+    Returns:
+        Tuple of (condensed or raw page content, path of the saved raw HTML).
+    """
+    raw_path = (
+        settings.TEMP_DIR / f"page_{hashlib.sha256(url.encode()).hexdigest()[:16]}.html"
+    )
+    raw_path.write_text(html, encoding="utf-8")
+    content = condense_html(html, url) if settings.CONDENSE_HTML else html
+    return content, str(raw_path)
+
+
+def _fit_message(state: QuizState, sections: dict, notes: str) -> tuple[dict, dict]:
+    """Fit page content, logs, and data file list into the fetch message budget."""
+    budget = min(
+        settings.FETCH_MESSAGE_MAX_TOKENS,
+        available_tokens(state.get("messages", [])),
+    )
+    budget -= MESSAGE_FRAME_TOKENS + count_tokens(notes)
+    weighted = {name: (text, SECTION_WEIGHTS[name]) for name, text in sections.items()}
+    return fit_sections(weighted, budget)
+
+
+def _analyze_static(html: str, url: str) -> tuple[str | None, str, str, list]:
+    """Decide whether a fetched page is complete without the browser.
+
+    Pages that only need simple inline scripts are rendered in the embedded
+    JS engine first.
+
+    Returns:
+        Tuple of (reason a browser is needed or None, HTML, visible text,
+        console logs).
+    """
+    reason = needs_browser(html)
+    logs = []
+    if reason and settings.JS_ENGINE_ENABLED:
+        rendered = render_inline_scripts(html, url, settings.JS_ENGINE_TIMEOUT)
+        if rendered:
+            html, logs = rendered
+            logger.info(f"Rendered inline scripts without a browser: {url}")
+            reason = None
+    return reason, html, "" if reason else html_to_text(html), logs
+
+
+async def _fetch_static(resources: GlobalResources, url: str) -> dict | None:
+    """Fetch a page over plain HTTP when it does not need JavaScript rendering.
+
+    Domains where a page needed the browser skip the HTTP attempt for
+    FAST_PATH_DECISION_TTL seconds.
+
+    Returns:
+        Page data in the same shape as BrowserClient.fetch_page_content, or
+        None to fall back to the browser.
+    """
+    if not settings.HTTP_FAST_PATH or (
+        settings.INLINE_SCREENSHOT and settings.LLM_SUPPORTS_VISION
+    ):
+        return None
+    decision_key = get_cache_key("render_mode", urlparse(url).hostname or "")
+    hit, mode = cache_get(decision_key, ttl_seconds=settings.FAST_PATH_DECISION_TTL)
+    if hit and mode == "browser":
+        return None
+
+    try:
+        html = await resources.api_client.get_html(
+            url, timeout=settings.FAST_PATH_TIMEOUT
+        )
+        if html is None:
+            return None
+        reason, html, text, logs = await asyncio.to_thread(_analyze_static, html, url)
+    except Exception as e:
+        logger.warning(f"HTTP fast path failed for {url}: {e}")
+        return None
+
+    cache_set(decision_key, "browser" if reason else "static")
+    if reason:
+        logger.info(f"Using browser for {url}: {reason}")
+        return None
+    logger.info(f"Fetched static page over HTTP: {url} (length: {len(html)})")
+    return {
+        "html": html,
+        "text": text,
+        "screenshot_path": None,
+        "aria_snapshot": None,
+        "console_logs": logs,
+        "responses": [],
+    }
+
+
 async def fetch_context_node(state: QuizState) -> dict:
     """Fetch page content, screenshot, and console logs from URL."""
     logger.info(f"Fetching context for {state['current_url']}")
     try:
-        browser = state["resources"].browser
-        data = await browser.fetch_page_content(state["current_url"])
+        data = await _fetch_static(state["resources"], state["current_url"])
+        if data is None:
+            data = await state["resources"].browser.fetch_page_content(
+                state["current_url"], session_id=state.get("session_id")
+            )
 
-        # Truncate HTML and logs to avoid hitting token limits
-        html = data["html"][:20000] + ("..." if len(data["html"]) > 20000 else "")
+        # Condense the page and truncate logs to avoid hitting token limits
+        page_content, raw_path = await asyncio.to_thread(
+            _page_context, data["html"], state["current_url"]
+        )
         logs = (
-            "\n".join(data["console_logs"][:10000])
+            "\n".join(data["console_logs"])
             if data["console_logs"]
             else "No console logs."
         )
 
+        responses = data.get("responses") or []
+        # Download linked data files while the first LLM call is in flight
+        start_prefetch(
+            data["html"], state["current_url"], skip=[r["url"] for r in responses]
+        )
+        responses_text = (
+            "\n".join(
+                f"- {r['url']} -> {r['path']} ({r['content_type']}, {r['size']} bytes)"
+                for r in responses
+            )
+            if responses
+            else "No data responses captured."
+        )
+
+        page_intro = (
+            "The page content is below, condensed: scripts and styles removed, tables as CSV, "
+            "links, media, forms and inline scripts listed at the end."
+            if settings.CONDENSE_HTML
+            else "The page contains the following HTML content:"
+        ) + f"\nThe full raw HTML is saved at: {raw_path}"
+
+        image_part = await asyncio.to_thread(
+            _inline_screenshot, data["screenshot_path"]
+        )
+        if not data["screenshot_path"]:
+            screenshot_note = (
+                "No screenshot was taken. Use capture_page_tool if you need one."
+            )
+        elif image_part:
+            screenshot_note = f"""The screenshot of the page has been saved at: {data['screenshot_path']}
+A downscaled copy of the screenshot is attached below."""
+        else:
+            screenshot_note = f"""The screenshot of the page has been saved at: {data['screenshot_path']}
+Use the screenshot path if you need to reference visual elements on the page (viewport only; use capture_page_tool for the full page)."""
+
+        fitted, usage = await asyncio.to_thread(
+            _fit_message,
+            state,
+            {"page": page_content, "console_logs": logs, "responses": responses_text},
+            page_intro + screenshot_note,
+        )
+        logger.info(f"Fetch message token budget: {usage}")
+
         return {
             "messages": [
                 HumanMessage(
@@ -28,24 +198,29 @@ async def fetch_context_node(state: QuizState) -> dict:
                             "type": "text",
                             "text": f"""I have visited the URL: {state['current_url']}
 
-The page contains the following HTML content:
+{page_intro}
 
-{"#" * 15 + " HTML Content Start " + "#" * 15}
-{html}
-{"#" * 15 + " HTML Content End " + "#" * 15}
+{"#" * 15 + " Page Content Start " + "#" * 15}
+{fitted["page"]}
+{"#" * 15 + " Page Content End " + "#" * 15}
 
 The console logs during page (Don't ignore them, sometimes they contain important info):
 
 {"#" * 15 + " Console Logs Start " + "#" * 15}
-{logs}
+{fitted["console_logs"]}
 {"#" * 15 + " Console Logs End " + "#" * 15}
 
-The screenshot of the page has been saved at: {data['screenshot_path']}
-Use the screenshot path if you need to reference visual elements on the page.
+Data files the page fetched while loading (already saved locally; use these paths instead of downloading them again):
+
+{fitted["responses"]}
+
+{screenshot_note}
 
 Please analyze this information and submit the answer.""",
                         }
                     ]
+                    + ([image_part] if image_part else []),
+                    response_metadata={"token_budget": usage},
                 )
             ],
             "html": data["html"],
@@ -4,6 +4,7 @@ import asyncio
 from app.config.settings import settings
 from app.graph.state import QuizState
 from app.utils.logging import logger
+from app.utils.tokens import available_tokens, count_tokens, truncate_to_tokens
 from langchain_core.messages import ToolMessage
 
 
@@ -16,6 +17,11 @@ async def tool_execution_node(state: QuizState) -> dict:
         logger.warning("No tool calls found in last message")
         return {"messages": []}
 
+    # Parallel tool calls share what is left of the context window. Tokenizing
+    # long conversations and outputs is CPU-bound, so it runs off the event loop.
+    available = await asyncio.to_thread(available_tokens, state["messages"])
+    per_call = min(settings.TOOL_OUTPUT_MAX_TOKENS, available // len(tool_calls))
+
     result = []
     for tc in tool_calls:
         tool_name, tool_id = tc.get("name", "unknown"), tc.get("id", "unknown")
@@ -43,7 +49,25 @@ async def tool_execution_node(state: QuizState) -> dict:
                 observation = f"Tool '{tool_name}' timed out after {settings.TOOL_TIMEOUT} seconds"
                 logger.error(observation)
 
-            result.append(ToolMessage(content=str(observation), tool_call_id=tool_id))
+            content = str(observation)
+            needed = await asyncio.to_thread(count_tokens, content)
+            if needed > per_call:
+                logger.warning(
+                    f"Tool '{tool_name}' output cut from {needed} to {per_call} tokens"
+                )
+                content = await asyncio.to_thread(truncate_to_tokens, content, per_call)
+            result.append(
+                ToolMessage(
+                    content=content,
+                    tool_call_id=tool_id,
+                    response_metadata={
+                        "token_budget": {
+                            "tokens": min(needed, per_call),
+                            "needed": needed,
+                        }
+                    },
+                )
+            )
 
         except Exception as e:
             error_msg = f"Error executing {tool_name}: {str(e)}"
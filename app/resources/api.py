@@ -55,6 +55,28 @@ class APIClient:
             logger.error(f"API call failed: {url} - {e}")
             return {"error": str(e), "status": None}
 
+    async def get_html(self, url: str, timeout: float) -> Optional[str]:
+        """GET a page once, without retries.
+
+        Returns:
+            The HTML body, or None if the request failed or did not return HTML.
+        """
+        try:
+            resp = await self.client.get(
+                url,
+                headers={"User-Agent": "YantraSolve/1.0"},
+                follow_redirects=True,
+                timeout=timeout,
+            )
+        except httpx.HTTPError as e:
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+            return None
+        if resp.status_code != 200 or "html" not in resp.headers.get(
+            "Content-Type", ""
+        ):
+            return None
+        return resp.text
+
     async def close(self):
         """Close the HTTP client."""
         if self.client:
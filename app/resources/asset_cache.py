@@ -0,0 +1,155 @@
+"""Disk cache for static page assets shared across page loads and shards."""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+# Cached bodies are stored decoded, so wire-level headers are dropped
+DROP_HEADERS = {
+    "connection",
+    "content-encoding",
+    "content-length",
+    "set-cookie",
+    "transfer-encoding",
+}
+
+
+def freshness_seconds(headers: Dict[str, str], now: Optional[float] = None) -> int:
+    """Seconds a response may be reused for, per its cache headers.
+
+    Only explicitly fresh responses are cacheable: max-age (or Expires) must be
+    given and no-store/no-cache/private must be absent. Responses that vary on
+    anything but encoding are not cached. Returns 0 if not cacheable.
+    """
+    headers = {k.lower(): v for k, v in headers.items()}
+    vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+    if vary - {"accept-encoding"}:
+        return 0
+
+    directives = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        directives[name] = value.strip('"')
+    if directives.keys() & {"no-store", "no-cache", "private"}:
+        return 0
+    if directives.get("max-age", "").isdigit():
+        return int(directives["max-age"])
+
+    if expires := headers.get("expires"):
+        try:
+            expires_at = parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return 0
+        return max(0, int(expires_at - (now or time.time())))
+    return 0
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file so concurrent readers never see a partial file.
+
+    The temp name is unique per call, so concurrent writers (threads or
+    processes) never share one.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class AssetCache:
+    """Store cacheable static responses on disk, keyed by URL.
+
+    Entries expire per their Cache-Control/Expires headers. When the cache
+    grows past `max_bytes`, the oldest entries are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        resource_types: Iterable[str],
+        max_bytes: int,
+        max_file_bytes: int,
+    ):
+        self.directory = Path(directory)
+        self.resource_types = set(resource_types)
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.bytes_served = 0
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / f"{digest}.bin"
+
+    def get(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Return (status, headers, body) for a fresh entry, else None."""
+        try:
+            # One JSON metadata line, then the body
+            header, _, body = self._path(url).read_bytes().partition(b"\n")
+            meta = json.loads(header)
+            if meta["url"] != url or meta["expires"] <= time.time():
+                raise KeyError("stale")
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bytes_served += len(body)
+        return meta["status"], meta["headers"], body
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        """Store a response if its headers allow reuse. Returns True if stored."""
+        ttl = freshness_seconds(headers)
+        if status != 200 or ttl <= 0 or len(body) > self.max_file_bytes:
+            return False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {
+                k: v for k, v in headers.items() if k.lower() not in DROP_HEADERS
+            },
+            "expires": time.time() + ttl,
+        }
+        # Metadata and body share one file, so concurrent puts cannot pair
+        # one writer's metadata with another's body
+        _write_atomic(self._path(url), json.dumps(meta).encode("utf-8") + b"\n" + body)
+        self.stored += 1
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        """Delete the oldest entries until the cache fits in max_bytes."""
+        entries = []
+        for path in self.directory.glob("*.bin"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def stats(self) -> dict:
+        """Hit/miss counts and hit ratio."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stored": self.stored,
+            "bytes_served": self.bytes_served,
+        }
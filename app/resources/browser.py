@@ -1,11 +1,19 @@
 """Browser automation client using Playwright."""
 
 import asyncio
-import hashlib
-import json
-from typing import Optional
-from playwright.async_api import async_playwright, Browser, Playwright, Page
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, Optional
+from playwright.async_api import async_playwright, Browser, Playwright
 from app.config.settings import settings
+from app.resources.asset_cache import AssetCache
+from app.resources.capture import capture_page, parse_outputs
+from app.resources.interception import RequestRouter
+from app.resources.page_pool import PagePool, PooledPage
+from app.resources.readiness import load_page
+from app.resources.responses import ResponseRecorder
+from app.resources.supervisor import BrowserSupervisor
 from app.utils.cache import get_cache_key, cache_get, cache_set
 from app.utils.logging import logger
 
@@ -13,88 +21,322 @@ from app.utils.logging import logger
 class BrowserClient:
     """Headless browser for JS-rendered pages, screenshots, and console capture."""
 
-    def __init__(self):
+    def __init__(self, name: str = "0", cdp_endpoint: Optional[str] = None):
+        self.name = name
+        # Attach to a running Chromium over CDP instead of launching one
+        self.cdp_endpoint = cdp_endpoint
+        # Passed to Chromium so the supervisor can find this shard's processes
+        self.process_marker = f"--yantrasolve-shard={name}"
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
+        self.pool: Optional[PagePool] = None
+        self.router: Optional[RequestRouter] = None
+        # Pages kept alive for the duration of a quiz session, keyed by session id
+        self.sessions: Dict[str, PooledPage] = {}
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self.metrics = {"loads": 0, "ready_total_ms": 0.0, "ready_max_ms": 0.0}
+        self.health = {
+            "restarts": 0,
+            "restart_reasons": Counter(),
+            "pages_since_restart": 0,
+            "memory_mb": None,
+            "last_probe_ms": None,
+        }
+        self.supervisor = BrowserSupervisor(self)
+        # Cleared while the browser is being restarted; page users wait on it
+        self._ready = asyncio.Event()
+        self._ready.set()
+        self._active = 0
+        self._restart_lock = asyncio.Lock()
+        self._restart_task: Optional[asyncio.Task] = None
         self._initialized = False
 
     async def initialize(self):
-        """Launch headless Chromium browser."""
+        """Launch headless Chromium, or connect to the CDP endpoint.
+
+        An unreachable CDP endpoint does not fail startup; the supervisor
+        keeps reconnecting and the shard is skipped until it is back.
+        """
         if self._initialized:
             return
         try:
             self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=True, args=["--disable-blink-features=AutomationControlled"]
-            )
+            self.router = self._create_router()
+            try:
+                await self._launch()
+            except Exception as e:
+                if not self.cdp_endpoint:
+                    raise
+                logger.warning(f"CDP endpoint {self.cdp_endpoint} unavailable: {e}")
+            self.supervisor.start()
             self._initialized = True
         except Exception as e:
             logger.error(f"Failed to initialize browser: {e}")
             raise
 
-    async def fetch_page_content(self, url: str) -> dict:
-        """Fetch page HTML, text, screenshot, and console logs.
+    @staticmethod
+    def _create_router() -> Optional[RequestRouter]:
+        """Request router for resource blocking and the static asset cache."""
+        block = settings.BROWSER_BLOCK_RESOURCES
+        if not block and not settings.ASSET_CACHE_ENABLED:
+            return None
+        asset_cache = None
+        if settings.ASSET_CACHE_ENABLED:
+            asset_cache = AssetCache(
+                settings.CACHE_DIR / "assets",
+                settings.ASSET_CACHE_TYPES,
+                max_bytes=settings.ASSET_CACHE_MAX_MB * 1024 * 1024,
+                max_file_bytes=settings.ASSET_CACHE_MAX_FILE_MB * 1024 * 1024,
+            )
+        return RequestRouter(
+            settings.BROWSER_BLOCK_RESOURCE_TYPES if block else [],
+            settings.BROWSER_BLOCK_DOMAINS if block else [],
+            asset_cache=asset_cache,
+        )
+
+    async def _launch(self) -> None:
+        """Launch (or connect to) Chromium and fill its page pool."""
+        if self.cdp_endpoint:
+            self.browser = await self.playwright.chromium.connect_over_cdp(
+                self.cdp_endpoint, timeout=settings.BROWSER_CONNECT_TIMEOUT * 1000
+            )
+            logger.info(f"Connected to Chromium at {self.cdp_endpoint}")
+        else:
+            self.browser = await self.playwright.chromium.launch(
+                headless=True,
+                args=[
+                    "--disable-blink-features=AutomationControlled",
+                    self.process_marker,
+                ],
+            )
+        self.browser.on("disconnected", self._on_disconnected)
+        self.pool = PagePool(
+            self.browser,
+            contexts=settings.BROWSER_POOL_CONTEXTS,
+            max_pages=settings.BROWSER_MAX_PAGES,
+            router=self.router,
+        )
+        await self.pool.start(warm_pages=settings.BROWSER_POOL_WARM_PAGES)
+        self.health["pages_since_restart"] = 0
+
+    async def _shutdown(self) -> None:
+        """Close the page pool and Chromium. Session pages are dropped."""
+        self.sessions.clear()
+        self._session_locks.clear()
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+        if self.browser:
+            logger.info("Closing browser")
+            browser, self.browser = self.browser, None
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {e}")
+
+    def _on_disconnected(self, browser: Browser) -> None:
+        """Restart after an unexpected disconnect (crash or killed process)."""
+        if browser is self.browser and self._initialized:
+            logger.error("Browser disconnected unexpectedly")
+            self._restart_task = asyncio.create_task(self.restart("crash"))
+
+    async def restart(self, reason: str) -> None:
+        """Drain in-flight page work, then relaunch (or reconnect) Chromium.
+
+        New page requests wait until the restart finishes. Pages still in use
+        after BROWSER_DRAIN_TIMEOUT are closed with the old browser.
+        """
+        if self._restart_lock.locked():
+            return
+        async with self._restart_lock:
+            logger.warning(f"Restarting browser ({reason})")
+            self._ready.clear()
+            try:
+                deadline = time.monotonic() + settings.BROWSER_DRAIN_TIMEOUT
+                while self._active and time.monotonic() < deadline:
+                    await asyncio.sleep(0.1)
+                if self._active:
+                    logger.warning(f"Restarting with {self._active} page(s) in use")
+                await self._shutdown()
+                await self._launch()
+                self.health["restarts"] += 1
+                self.health["restart_reasons"][reason] += 1
+            except Exception as e:
+                logger.error(f"Browser restart failed: {e}")
+            finally:
+                self._ready.set()
+
+    @property
+    def load_score(self) -> int:
+        """In-flight page work plus pages pinned by sessions."""
+        return self._active + len(self.sessions)
+
+    @property
+    def ready(self) -> bool:
+        """False while Chromium is being restarted or is not connected."""
+        return (
+            self._ready.is_set()
+            and self.browser is not None
+            and self.browser.is_connected()
+        )
+
+    @asynccontextmanager
+    async def _in_flight(self) -> AsyncIterator[None]:
+        """Wait out any restart, then count the caller as using a page."""
+        await self._ready.wait()
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+
+    async def fetch_page_content(
+        self,
+        url: str,
+        session_id: Optional[str] = None,
+        outputs: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """Load a page and capture the configured outputs plus console logs.
 
         Args:
             url: URL of the page to fetch.
+            session_id: Keep the loaded page alive for this quiz session so
+                later tools (javascript_tool) can reuse it without reloading.
+            outputs: Capture outputs (html, text, screenshot, aria). Defaults
+                to CAPTURE_OUTPUTS.
 
         Returns:
-            Dict with 'html', 'text', 'screenshot_path', and 'console_logs'.
+            Dict with 'html', 'text', 'screenshot_path', 'aria_snapshot',
+            'console_logs', and 'responses' (data responses saved to TEMP_DIR).
         """
+        outputs = parse_outputs(outputs or settings.CAPTURE_OUTPUTS)
+        full_page = settings.SCREENSHOT_FULL_PAGE
+
         # Check cache
-        cache_key = get_cache_key("fetch_page_content", url)
+        cache_key = get_cache_key("fetch_page_content", url, outputs, full_page)
         hit, cached = cache_get(cache_key, ttl_seconds=3600)
         if hit:
             logger.info(f"Cache hit for page: {url}")
             return cached
 
-        page: Optional[Page] = None
         try:
-            page = await self.browser.new_page()
-            console_logs = []
-
-            async def handle_console(msg):
-                for arg in msg.args:
-                    try:
-                        console_logs.append(
-                            f"[{msg.type}] {json.dumps(await arg.json_value(), indent=2)}"
-                        )
-                    except Exception:
-                        console_logs.append(f"[{msg.type}] {msg.text}")
-
-            page.on("console", handle_console)
-            page.set_default_timeout(settings.BROWSER_PAGE_TIMEOUT)
-            await page.goto(url, wait_until="networkidle")
-            await asyncio.sleep(1)
-
-            raw_html = await page.content()
-            full_text = await page.inner_text("body")
-            filename = f"{hashlib.sha256(url.encode()).hexdigest()}.png"
-            await page.screenshot(full_page=True, path=settings.TEMP_DIR / filename)
-
-            data = {
-                "html": raw_html,
-                "text": full_text,
-                "screenshot_path": str(settings.TEMP_DIR / filename),
-                "console_logs": console_logs,
-            }
-            logger.info(f"Fetched page: {url} (length: {len(raw_html)})")
+            page_cm = (
+                self.session_page(session_id) if session_id else self.acquire_page()
+            )
+            recorder = ResponseRecorder() if settings.CAPTURE_RESPONSES else None
+            async with page_cm as pooled:
+                pooled.console_logs.clear()
+                pooled.allow_images = "screenshot" in outputs
+                if recorder:
+                    recorder.attach(pooled.page)
+                try:
+                    await self.load(pooled, url)
+                    data = await capture_page(pooled.page, url, outputs, full_page)
+                finally:
+                    if recorder:
+                        recorder.detach(pooled.page)
+                data["console_logs"] = list(pooled.console_logs)
+            data["responses"] = await recorder.save() if recorder else []
+            logger.info(f"Fetched page: {url} (length: {len(data['html'])})")
             cache_set(cache_key, data)
             return data
 
         except Exception as e:
             logger.error(f"Error fetching page {url}: {e}")
             raise
-        finally:
-            if page:
-                await page.close()
+
+    async def capture(
+        self,
+        url: str,
+        outputs: Iterable[str],
+        session_id: Optional[str] = None,
+        full_page: bool = True,
+    ) -> dict:
+        """Capture outputs on demand, reusing the session page when it has url loaded.
+
+        The page is reloaded only if it shows a different URL, or if a
+        screenshot is requested and images were blocked on the first load.
+        """
+        outputs = parse_outputs(outputs)
+        page_cm = self.session_page(session_id) if session_id else self.acquire_page()
+        async with page_cm as pooled:
+            wants_images = "screenshot" in outputs
+            images_blocked = (
+                self.router is not None
+                and self.router.blocks_images
+                and not pooled.allow_images
+            )
+            if pooled.loaded_url != url or (wants_images and images_blocked):
+                pooled.allow_images = pooled.allow_images or wants_images
+                await self.load(pooled, url)
+            return await capture_page(pooled.page, url, outputs, full_page)
+
+    async def load(self, pooled: PooledPage, url: str) -> None:
+        """Navigate a pooled page and wait until its content is ready."""
+        ready_ms = await load_page(pooled.page, url)
+        pooled.loaded_url = url
+        self.health["pages_since_restart"] += 1
+        self.metrics["loads"] += 1
+        self.metrics["ready_total_ms"] += ready_ms
+        self.metrics["ready_max_ms"] = max(self.metrics["ready_max_ms"], ready_ms)
+
+    @asynccontextmanager
+    async def acquire_page(self) -> AsyncIterator[PooledPage]:
+        """Check out a warm page from the pool; it is reset and returned on exit."""
+        async with self._in_flight(), self.pool.acquire() as pooled:
+            yield pooled
+
+    @asynccontextmanager
+    async def session_page(self, session_id: str) -> AsyncIterator[PooledPage]:
+        """Yield the page kept alive for a quiz session, opening one on first use.
+
+        Use of a session page is serialized; the page (in a context of its
+        own) stays open until release_session is called.
+        """
+        async with self._in_flight():
+            lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+            async with lock:
+                pooled = self.sessions.get(session_id)
+                if pooled is not None and pooled.page.is_closed():
+                    await self.pool.close_session(pooled)
+                    pooled = None
+                if pooled is None:
+                    pooled = self.sessions[session_id] = await self.pool.open_session()
+                yield pooled
+
+    async def release_session(self, session_id: str) -> None:
+        """Close a session's page and context."""
+        self._session_locks.pop(session_id, None)
+        pooled = self.sessions.pop(session_id, None)
+        if pooled and self.pool:
+            await self.pool.close_session(pooled)
+
+    def stats(self) -> dict:
+        """Browser pool, health, request interception, and page readiness metrics."""
+        loads = self.metrics["loads"]
+        return {
+            "health": {
+                **self.health,
+                "restart_reasons": dict(self.health["restart_reasons"]),
+                "connected": bool(self.browser and self.browser.is_connected()),
+                "endpoint": self.cdp_endpoint,
+            },
+            "pool": self.pool.stats() if self.pool else {},
+            "sessions": len(self.sessions),
+            "interception": self.router.stats() if self.router else {},
+            "readiness": {
+                **self.metrics,
+                "ready_avg_ms": (
+                    self.metrics["ready_total_ms"] / loads if loads else 0.0
+                ),
+            },
+        }
 
     async def close(self) -> None:
         """Clean up browser resources."""
-        if self.browser:
-            logger.info("Closing browser")
-            await self.browser.close()
-            self.browser = None
+        self._initialized = False
+        await self.supervisor.stop()
+        await self._shutdown()
         if self.playwright:
             await self.playwright.stop()
             self.playwright = None
@@ -0,0 +1,132 @@
+"""Several Chromium processes behind the BrowserClient interface."""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+from app.config.settings import settings
+from app.resources.browser import BrowserClient
+from app.resources.page_pool import PooledPage
+from app.utils.logging import logger
+
+AUTO_MAX_SHARDS = 4
+
+
+def shard_count() -> int:
+    """Configured number of Chromium shards, or one per two CPU cores."""
+    if settings.BROWSER_SHARDS > 0:
+        return settings.BROWSER_SHARDS
+    return max(1, min(AUTO_MAX_SHARDS, (os.cpu_count() or 1) // 2))
+
+
+class BrowserManager:
+    """Spread page work across several Chromium shards.
+
+    Each shard is a BrowserClient with its own process, page pool, and
+    supervisor; with BROWSER_CDP_ENDPOINTS set, each shard is attached to one
+    remote Chromium instead. Work without a session goes to the least-loaded
+    shard; a quiz session stays on the shard that served it first, so its live
+    page can be reused. The public methods mirror BrowserClient.
+    """
+
+    def __init__(self, shards: Optional[int] = None):
+        if settings.BROWSER_CDP_ENDPOINTS:
+            self.shards: List[BrowserClient] = [
+                BrowserClient(str(i), cdp_endpoint=endpoint)
+                for i, endpoint in enumerate(settings.BROWSER_CDP_ENDPOINTS)
+            ]
+        else:
+            count = shards or shard_count()
+            self.shards = [BrowserClient(str(i)) for i in range(count)]
+        self._session_shards: Dict[str, BrowserClient] = {}
+
+    async def initialize(self) -> None:
+        """Launch every shard concurrently."""
+        await asyncio.gather(*(shard.initialize() for shard in self.shards))
+        ready = sum(shard.ready for shard in self.shards)
+        if not ready:
+            raise RuntimeError("No browser shard is available")
+        logger.info(f"Browser ready with {ready}/{len(self.shards)} Chromium shard(s)")
+
+    def _least_loaded(self) -> BrowserClient:
+        # Shards in the middle of a restart are only picked if all are
+        return min(self.shards, key=lambda s: (not s.ready, s.load_score))
+
+    def shard_for(self, session_id: Optional[str] = None) -> BrowserClient:
+        """Pick the session's shard, assigning the least-loaded one on first use.
+
+        A session whose shard went down moves to a healthy one; its page was
+        lost with the old browser anyway.
+        """
+        if session_id is None:
+            return self._least_loaded()
+        shard = self._session_shards.get(session_id)
+        if shard is None or not shard.ready and any(s.ready for s in self.shards):
+            shard = self._session_shards[session_id] = self._least_loaded()
+        return shard
+
+    async def fetch_page_content(
+        self,
+        url: str,
+        session_id: Optional[str] = None,
+        outputs: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """See BrowserClient.fetch_page_content."""
+        shard = self.shard_for(session_id)
+        return await shard.fetch_page_content(url, session_id, outputs)
+
+    async def capture(
+        self,
+        url: str,
+        outputs: Iterable[str],
+        session_id: Optional[str] = None,
+        full_page: bool = True,
+    ) -> dict:
+        """See BrowserClient.capture."""
+        shard = self.shard_for(session_id)
+        return await shard.capture(url, outputs, session_id, full_page)
+
+    async def load(self, pooled: PooledPage, url: str) -> None:
+        """Navigate a page on the shard it was checked out from."""
+        owner = next(
+            (s for s in self.shards if s.pool and s.pool.owns(pooled.context)),
+            self.shards[0],
+        )
+        await owner.load(pooled, url)
+
+    @asynccontextmanager
+    async def acquire_page(self) -> AsyncIterator[PooledPage]:
+        """Check out a warm page from the least-loaded shard."""
+        async with self._least_loaded().acquire_page() as pooled:
+            yield pooled
+
+    @asynccontextmanager
+    async def session_page(self, session_id: str) -> AsyncIterator[PooledPage]:
+        """Yield the session's page from the shard the session is pinned to."""
+        async with self.shard_for(session_id).session_page(session_id) as pooled:
+            yield pooled
+
+    async def release_session(self, session_id: str) -> None:
+        """Return a session's page to its shard and unpin the session."""
+        shard = self._session_shards.pop(session_id, None)
+        if shard:
+            await shard.release_session(session_id)
+
+    def stats(self) -> dict:
+        """Per-shard browser metrics."""
+        return {
+            "shards": [{"name": s.name, **s.stats()} for s in self.shards],
+            "sessions": len(self._session_shards),
+        }
+
+    async def close(self) -> None:
+        """Close every shard."""
+        await asyncio.gather(*(shard.close() for shard in self.shards))
+        self._session_shards.clear()
+
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
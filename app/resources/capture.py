@@ -0,0 +1,58 @@
+"""Selectable, concurrent capture of page HTML, text, screenshot, and ARIA tree."""
+
+import asyncio
+import hashlib
+from typing import Iterable
+from playwright.async_api import Page
+from app.config.settings import settings
+
+CAPTURE_OUTPUTS = ("html", "text", "screenshot", "aria")
+
+
+def parse_outputs(outputs: Iterable[str]) -> tuple:
+    """Normalize an output selection, rejecting unknown kinds."""
+    selected = tuple(o for o in CAPTURE_OUTPUTS if o in set(outputs))
+    unknown = set(outputs) - set(CAPTURE_OUTPUTS)
+    if unknown:
+        raise ValueError(
+            f"Unknown capture output(s) {sorted(unknown)}; choose from {CAPTURE_OUTPUTS}"
+        )
+    return selected
+
+
+async def _screenshot(page: Page, url: str, full_page: bool) -> str:
+    """Save a JPEG screenshot (viewport unless full_page) and return its path."""
+    suffix = "full" if full_page else "view"
+    filename = f"{hashlib.sha256(url.encode()).hexdigest()}_{suffix}.jpg"
+    path = settings.TEMP_DIR / filename
+    await page.screenshot(
+        path=path, type="jpeg", quality=settings.SCREENSHOT_QUALITY, full_page=full_page
+    )
+    return str(path)
+
+
+async def capture_page(
+    page: Page, url: str, outputs: Iterable[str], full_page: bool = False
+) -> dict:
+    """Capture the selected outputs from a loaded page concurrently.
+
+    Returns:
+        Dict with 'html', 'text', 'screenshot_path', and 'aria_snapshot'.
+        Outputs that were not selected are empty strings / None.
+    """
+    selected = parse_outputs(outputs)
+    jobs = {
+        "html": lambda: page.content(),
+        "text": lambda: page.inner_text("body"),
+        "screenshot": lambda: _screenshot(page, url, full_page),
+        "aria": lambda: page.locator("body").aria_snapshot(),
+    }
+    results = dict(
+        zip(selected, await asyncio.gather(*(jobs[kind]() for kind in selected)))
+    )
+    return {
+        "html": results.get("html", ""),
+        "text": results.get("text", ""),
+        "screenshot_path": results.get("screenshot"),
+        "aria_snapshot": results.get("aria"),
+    }
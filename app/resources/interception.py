@@ -0,0 +1,125 @@
+"""Request routing that blocks or stubs page resources the agent does not need."""
+
+import asyncio
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from playwright.async_api import Request, Response, Route
+from app.resources.asset_cache import AssetCache
+from app.utils.logging import logger
+
+# Blocked requests of these types get an empty response instead of an error,
+# so pages waiting on onload/onerror handlers keep working.
+STUB_CONTENT_TYPES = {"stylesheet": "text/css", "script": "application/javascript"}
+
+
+class RequestRouter:
+    """Decide per request whether to let it through, stub it, or abort it.
+
+    Blocked requests are never sent, so their size is unknown; bytes avoided
+    are estimated from the average Content-Length seen for the same resource
+    type on allowed responses. Allowed static assets are served from
+    `asset_cache` when one is given.
+    """
+
+    def __init__(
+        self,
+        block_types: List[str],
+        block_domains: List[str],
+        asset_cache: Optional[AssetCache] = None,
+    ):
+        self.block_types = set(block_types)
+        self.asset_cache = asset_cache
+        self.block_domains = [d.lower().lstrip(".") for d in block_domains]
+        self.allowed = 0
+        self.blocked_by_type: Counter = Counter()
+        self.bytes_avoided_est = 0
+        # resource type -> [total bytes, responses] observed on allowed responses
+        self._sizes: Dict[str, List[int]] = {}
+
+    @property
+    def blocks_images(self) -> bool:
+        return "image" in self.block_types
+
+    def _blocked_domain(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == d or host.endswith("." + d) for d in self.block_domains)
+
+    def should_block(self, request: Request, allow_images: bool = False) -> bool:
+        """True if the request is not needed to read the page."""
+        resource_type = request.resource_type
+        if resource_type == "document" and request.is_navigation_request():
+            return False
+        if resource_type == "image" and allow_images:
+            return False
+        return resource_type in self.block_types or self._blocked_domain(request.url)
+
+    async def handle(self, route: Route, allow_images: bool = False) -> None:
+        """Playwright route handler."""
+        request = route.request
+        try:
+            if not self.should_block(request, allow_images):
+                self.allowed += 1
+                cache = self.asset_cache
+                if (
+                    cache
+                    and request.method == "GET"
+                    and request.resource_type in cache.resource_types
+                ):
+                    await self._serve_cached(route)
+                else:
+                    await route.continue_()
+                return
+
+            resource_type = request.resource_type
+            self.blocked_by_type[resource_type] += 1
+            total, count = self._sizes.get(resource_type, (0, 0))
+            if count:
+                self.bytes_avoided_est += total // count
+            if resource_type in STUB_CONTENT_TYPES:
+                await route.fulfill(
+                    status=200, body="", content_type=STUB_CONTENT_TYPES[resource_type]
+                )
+            else:
+                await route.abort("blockedbyclient")
+        except Exception as e:
+            # The page may have navigated away or closed mid-request
+            logger.debug(f"Route handling failed for {request.url}: {e}")
+
+    async def _serve_cached(self, route: Route) -> None:
+        """Serve a static asset from the disk cache, storing it on a miss."""
+        url = route.request.url
+        cached = await asyncio.to_thread(self.asset_cache.get, url)
+        if cached:
+            status, headers, body = cached
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception as e:
+            logger.debug(f"Asset fetch failed for {url}: {e}")
+            await route.continue_()
+            return
+        await route.fulfill(response=response, body=body)
+        await asyncio.to_thread(
+            self.asset_cache.put, url, response.status, response.headers, body
+        )
+
+    def observe(self, response: Response) -> None:
+        """Record response sizes (from headers) to estimate bytes avoided."""
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            sizes = self._sizes.setdefault(response.request.resource_type, [0, 0])
+            sizes[0] += int(length)
+            sizes[1] += 1
+
+    def stats(self) -> dict:
+        """Requests allowed and avoided, bytes avoided, and asset cache hits."""
+        return {
+            "allowed": self.allowed,
+            "blocked": sum(self.blocked_by_type.values()),
+            "blocked_by_type": dict(self.blocked_by_type),
+            "bytes_avoided_est": self.bytes_avoided_est,
+            "asset_cache": self.asset_cache.stats() if self.asset_cache else {},
+        }
@@ -0,0 +1,137 @@
+"""Compact printing of pandas and numpy objects inside Python kernels.
+
+Whole DataFrames and arrays printed by agent code would otherwise be resent
+to the LLM on every later turn. Large ones are shown as shape, dtypes, head
+and tail, and summary statistics; `dump()` writes one out in full instead.
+"""
+
+import builtins
+import json
+import sys
+import uuid
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+MAX_ROWS = 20  # frames/series up to this many rows print in full
+MAX_COLUMNS = 20
+EDGE_ROWS = 5  # rows shown from each end of a larger frame
+MAX_ARRAY_ITEMS = 100  # larger arrays are abbreviated
+
+_dump_dir: Optional[Path] = None
+
+
+def configure(dump_dir: Optional[str] = None) -> None:
+    """Set compact pandas/numpy display options and the dump() directory."""
+    global _dump_dir
+    _dump_dir = Path(dump_dir) if dump_dir else None
+    pd.set_option("display.max_rows", MAX_ROWS)
+    pd.set_option("display.min_rows", 2 * EDGE_ROWS)
+    pd.set_option("display.max_columns", MAX_COLUMNS)
+    pd.set_option("display.width", 120)
+    pd.set_option("display.max_colwidth", 60)
+    np.set_printoptions(threshold=MAX_ARRAY_ITEMS, edgeitems=3, linewidth=120)
+
+
+def _summary(numeric: pd.DataFrame) -> str:
+    stats = numeric.iloc[:, :MAX_COLUMNS].describe().T
+    return stats[["mean", "std", "min", "max"]].to_string()
+
+
+def _frame(df: pd.DataFrame) -> str:
+    rows, cols = df.shape
+    dtypes = ", ".join(f"{c}: {t}" for c, t in df.dtypes.iloc[:MAX_COLUMNS].items())
+    lines = [
+        f"DataFrame with {rows} rows x {cols} columns",
+        f"dtypes: {dtypes}" + (", ..." if cols > MAX_COLUMNS else ""),
+        df.to_string(
+            max_rows=2 * EDGE_ROWS,
+            min_rows=2 * EDGE_ROWS,
+            max_cols=MAX_COLUMNS,
+            show_dimensions=False,
+        ),
+    ]
+    numeric = df.select_dtypes("number")
+    if not numeric.empty:
+        lines.append("summary:\n" + _summary(numeric))
+    return "\n".join(lines)
+
+
+def _series(series: pd.Series) -> str:
+    lines = [
+        f"Series {series.name!r} with {len(series)} values, dtype: {series.dtype}",
+        series.to_string(max_rows=2 * EDGE_ROWS, min_rows=2 * EDGE_ROWS),
+    ]
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        lines.append(
+            f"mean {series.mean():.6g}, std {series.std():.6g}, "
+            f"min {series.min():.6g}, max {series.max():.6g}"
+        )
+    return "\n".join(lines)
+
+
+def _array(array: np.ndarray) -> str:
+    lines = [f"ndarray with shape {array.shape}, dtype: {array.dtype}", str(array)]
+    if np.issubdtype(array.dtype, np.number) and not np.issubdtype(
+        array.dtype, np.complexfloating
+    ):
+        lines.append(
+            f"mean {np.nanmean(array):.6g}, std {np.nanstd(array):.6g}, "
+            f"min {np.nanmin(array):.6g}, max {np.nanmax(array):.6g}"
+        )
+    return "\n".join(lines)
+
+
+def render(obj):
+    """Compact text for a large DataFrame, Series, or array; obj unchanged otherwise."""
+    try:
+        if isinstance(obj, pd.DataFrame):
+            if len(obj) > MAX_ROWS or obj.shape[1] > MAX_COLUMNS:
+                return _frame(obj)
+        elif isinstance(obj, pd.Series):
+            if len(obj) > MAX_ROWS:
+                return _series(obj)
+        elif isinstance(obj, np.ndarray):
+            if obj.size > MAX_ARRAY_ITEMS:
+                return _array(obj)
+    except Exception:  # unusual dtypes: fall back to the object's own str()
+        pass
+    return obj
+
+
+def compact_print(*args, sep=" ", end="\n", file=None, flush=False):
+    """print() that renders large pandas/numpy objects compactly on stdout."""
+    if file is None or file is sys.stdout:
+        args = [render(arg) for arg in args]
+    builtins.print(*args, sep=sep, end=end, file=file, flush=flush)
+
+
+def dump(obj, name: str = "") -> str:
+    """Write obj in full to a file and return its path.
+
+    DataFrames, Series, and 1-D/2-D arrays are saved as CSV, other arrays as
+    .npy, and anything else as JSON (or text if it is not serializable).
+    """
+    directory = _dump_dir or Path.cwd()
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = directory / (Path(name).name or f"dump_{uuid.uuid4().hex[:8]}")
+    if isinstance(obj, pd.DataFrame):
+        path = stem.with_suffix(".csv")
+        obj.to_csv(path, index=not isinstance(obj.index, pd.RangeIndex))
+    elif isinstance(obj, pd.Series):
+        path = stem.with_suffix(".csv")
+        obj.to_csv(path)
+    elif isinstance(obj, np.ndarray) and obj.ndim <= 2:
+        path = stem.with_suffix(".csv")
+        np.savetxt(path, obj, delimiter=",", fmt="%s")
+    elif isinstance(obj, np.ndarray):
+        path = stem.with_suffix(".npy")
+        np.save(path, obj)
+    else:
+        try:
+            text, path = json.dumps(obj, indent=2), stem.with_suffix(".json")
+        except (TypeError, ValueError):
+            text, path = str(obj), stem.with_suffix(".txt")
+        path.write_text(text, encoding="utf-8")
+    return str(path)
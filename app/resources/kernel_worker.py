@@ -0,0 +1,224 @@
+"""Loop run inside each Python kernel process.
+
+Deliberately free of app settings and logging: a worker only needs the
+libraries that user code is given.
+"""
+
+import builtins
+import contextlib
+import io
+import math
+import signal
+import traceback
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from app.resources import kernel_display
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class CPULimitExceeded(Exception):
+    """Raised in user code when the run passes its CPU time limit."""
+
+
+class OutputLimitExceeded(Exception):
+    """Raised in user code when it prints more than the output limit."""
+
+
+class LimitedOutput(io.TextIOBase):
+    """stdout/stderr replacement that keeps at most `limit` bytes.
+
+    Printing past the limit raises OutputLimitExceeded, which stops runaway
+    print loops; `written` still counts every byte the code tried to print.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.parts = []
+        self.size = 0
+        self.written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        data = text.encode("utf-8", "replace")
+        self.written += len(data)
+        if self.size + len(data) > self.limit:
+            room = self.limit - self.size
+            self.parts.append(data[:room].decode("utf-8", "ignore"))
+            self.size = self.limit
+            raise OutputLimitExceeded(
+                f"Output limit of {self.limit} bytes exceeded; print a summary "
+                "(head, shape, aggregates) instead of everything"
+            )
+        self.parts.append(text)
+        self.size += len(data)
+        return len(text)
+
+    def getvalue(self) -> str:
+        return "".join(self.parts)
+
+
+def _on_cpu_limit(signum, frame):
+    raise CPULimitExceeded("CPU time limit exceeded")
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _vm_bytes() -> int:
+    """Current address space size of this process."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[0])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return pages * resource.getpagesize()
+
+
+def _reset_peak_rss() -> None:
+    """Start a new peak-RSS measurement (Linux only)."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident memory since the last reset, or of the process's life."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextlib.contextmanager
+def _rlimits(cpu_seconds: int, memory_bytes: int):
+    """Cap CPU time and new address space for one run, restoring them after.
+
+    Both limits are process-wide and cumulative, so they are set relative to
+    what the process has already used. Only soft limits are changed; an
+    unprivileged process could never raise a lowered hard limit again.
+    """
+    if resource is None:
+        yield
+        return
+    saved = {}
+    wanted = {}
+    if cpu_seconds:
+        wanted[resource.RLIMIT_CPU] = math.ceil(_cpu_seconds()) + cpu_seconds
+    if memory_bytes and _vm_bytes():
+        wanted[resource.RLIMIT_AS] = _vm_bytes() + memory_bytes
+    for kind, soft in wanted.items():
+        saved[kind] = resource.getrlimit(kind)
+        hard = saved[kind][1]
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(kind, (soft, hard))
+    try:
+        yield
+    finally:
+        for kind, limits in saved.items():
+            resource.setrlimit(kind, limits)
+
+
+def new_namespace() -> dict:
+    """Globals for a fresh session.
+
+    pandas and numpy are pre-imported, print() shows large DataFrames and
+    arrays compactly, and dump() saves an object in full to a file.
+    """
+    return {
+        "pd": kernel_display.pd,
+        "np": kernel_display.np,
+        "print": kernel_display.compact_print,
+        "dump": kernel_display.dump,
+        "__builtins__": builtins,
+    }
+
+
+def run(code: str, namespace: dict, limits: Dict[str, int]) -> Tuple[bool, str, dict]:
+    """Execute code in a namespace within the given limits.
+
+    Args:
+        limits: cpu_seconds, memory_bytes, and output_bytes (0 disables each).
+
+    Returns:
+        Tuple of (succeeded, printed output, usage). Usage has cpu_seconds,
+        peak_rss_mb, output_bytes (everything the code tried to print), and
+        the limit that stopped the run ("cpu", "memory", "output"), if any.
+    """
+    output = LimitedOutput(limits.get("output_bytes") or math.inf)
+    cpu_start = _cpu_seconds() if resource else 0.0
+    _reset_peak_rss()
+    ok, error, limit = True, "", None
+    try:
+        with _rlimits(limits.get("cpu_seconds", 0), limits.get("memory_bytes", 0)):
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                exec(code, namespace)
+    except CPULimitExceeded:
+        ok, limit = False, "cpu"
+        error = (
+            f"CPULimitExceeded: the run used more than {limits['cpu_seconds']}s "
+            "of CPU time"
+        )
+    except OutputLimitExceeded as e:
+        ok, error, limit = False, f"OutputLimitExceeded: {e}", "output"
+    except MemoryError:
+        ok = False
+        error = traceback.format_exc()
+        if limits.get("memory_bytes"):
+            limit = "memory"
+            limit_mb = limits["memory_bytes"] // 2**20
+            error += (
+                f"The run may allocate at most {limit_mb} MB; process the data "
+                "in chunks or select fewer columns."
+            )
+    except BaseException:  # exit() and KeyboardInterrupt must not end the worker
+        ok, error = False, traceback.format_exc()
+    usage = {
+        "cpu_seconds": round(_cpu_seconds() - cpu_start, 3) if resource else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1) if resource else None,
+        "output_bytes": output.written,
+        "limit": limit,
+    }
+    printed = output.getvalue()
+    if not ok and printed and not printed.endswith("\n"):
+        printed += "\n"
+    return ok, printed + error, usage
+
+
+def serve(
+    conn, limits: Optional[Dict[str, int]] = None, dump_dir: Optional[str] = None
+) -> None:
+    """Answer ("exec", session_id, code) and ("reset", session_id, None) requests.
+
+    Each session gets its own namespace, kept until it is reset. Every run is
+    held to `limits` (see run); dump() writes to `dump_dir`. The loop ends
+    when the server closes its end of the pipe.
+    """
+    limits = limits or {}
+    kernel_display.configure(dump_dir)
+    if hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+    namespaces: Dict[str, dict] = {}
+    while True:
+        try:
+            op, session_id, code = conn.recv()
+        except (EOFError, OSError):
+            return
+        if op == "exec":
+            if session_id not in namespaces:
+                namespaces[session_id] = new_namespace()
+            conn.send(run(code, namespaces[session_id], limits))
+        elif op == "reset":
+            namespaces.pop(session_id, None)
+            conn.send((True, "", {}))
@@ -0,0 +1,340 @@
+"""Pool of worker processes that run python_tool code outside the server."""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from app.config.settings import settings
+from app.resources import kernel_worker
+from app.utils.logging import logger
+
+AUTO_MAX_KERNELS = 4
+KILL_WAIT_SECONDS = 5
+RESTART_NOTICE = (
+    "Note: the Python session was restarted; variables from earlier steps are gone.\n"
+)
+BUSY_MESSAGE = (
+    "The Python kernel is busy running another session's code. Nothing was "
+    "run; try again shortly."
+)
+
+
+def _context():
+    """Process context for kernels, forking them from a preloaded server.
+
+    Forking the app itself is unsafe (threads, event loop), so workers are
+    forked from a single-threaded fork server that has imported
+    PYTHON_PRELOAD_MODULES once. Falls back to spawn where fork servers are
+    not supported.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(
+        [kernel_worker.__name__, *settings.PYTHON_PRELOAD_MODULES]
+    )
+    return context
+
+
+def _limits() -> Dict[str, int]:
+    """Per-run resource limits enforced inside each worker."""
+    return {
+        "cpu_seconds": settings.PYTHON_CPU_SECONDS,
+        "memory_bytes": settings.PYTHON_MAX_MEMORY_MB * 2**20,
+        "output_bytes": settings.PYTHON_MAX_OUTPUT_BYTES,
+    }
+
+
+def kernel_count() -> int:
+    """Configured number of Python kernels, or one per CPU core."""
+    if settings.PYTHON_KERNELS > 0:
+        return settings.PYTHON_KERNELS
+    return max(1, min(AUTO_MAX_KERNELS, os.cpu_count() or 1))
+
+
+async def _wait_readable(conn, timeout: float) -> None:
+    """Wait until the worker has answered (or exited) without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Event()
+    fd = conn.fileno()
+    loop.add_reader(fd, ready.set)
+    try:
+        await asyncio.wait_for(ready.wait(), timeout)
+    finally:
+        loop.remove_reader(fd)
+
+
+class Kernel:
+    """One worker process and the sessions whose namespaces it holds."""
+
+    def __init__(self, name: str, context):
+        self.name = name
+        self.context = context
+        self.process = None
+        self.conn = None
+        self.sessions: Set[str] = set()
+        # Sessions that lost their namespace and have not been told yet
+        self.stale: Set[str] = set()
+        self.lock = asyncio.Lock()
+        # In-progress worker replacement, run in a thread off the event loop
+        self.replacing: Optional[asyncio.Future] = None
+        self.executions = 0
+        self.restarts = 0
+        self.cpu_seconds = 0.0
+        self.peak_rss_mb = 0.0
+        self.output_bytes = 0
+        self.limit_hits: Dict[str, int] = {}
+
+    def start(self) -> None:
+        """Start the worker process."""
+        self.conn, child = self.context.Pipe()
+        self.process = self.context.Process(
+            target=kernel_worker.serve,
+            args=(child, _limits(), str(settings.TEMP_DIR)),
+            name=f"python-kernel-{self.name}",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+
+    def kill(self) -> None:
+        """Kill the worker process, whatever it is doing."""
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(KILL_WAIT_SECONDS)
+        if self.conn is not None:
+            self.conn.close()
+
+    def _replace(self) -> None:
+        """Kill the worker and start a new one (blocking)."""
+        self.kill()
+        self.start()
+
+    async def restart(self, reason: str) -> None:
+        """Replace the worker; every session on it loses its namespace.
+
+        Killing and starting a process blocks for up to KILL_WAIT_SECONDS, so
+        it runs in a thread. It is shielded: a cancelled caller still leaves a
+        working kernel, and unlock() waits for it.
+        """
+        logger.warning(f"Restarting Python kernel {self.name}: {reason}")
+        self.restarts += 1
+        self.stale |= self.sessions
+        self.replacing = asyncio.ensure_future(asyncio.to_thread(self._replace))
+        await asyncio.shield(self.replacing)
+
+    def unlock(self) -> None:
+        """Release the lock, or once an interrupted restart has finished."""
+        if self.replacing is None or self.replacing.done():
+            self.lock.release()
+            return
+
+        def release(replacing: asyncio.Future) -> None:
+            if not replacing.cancelled() and replacing.exception():
+                logger.error(f"Restarting Python kernel {self.name} failed")
+            self.lock.release()
+
+        self.replacing.add_done_callback(release)
+
+    def account(self, usage: dict) -> None:
+        """Add one run's resource usage to this kernel's totals."""
+        self.executions += 1
+        self.cpu_seconds += usage.get("cpu_seconds") or 0.0
+        self.peak_rss_mb = max(self.peak_rss_mb, usage.get("peak_rss_mb") or 0.0)
+        self.output_bytes += usage.get("output_bytes") or 0
+        limit = usage.get("limit")
+        if limit:
+            self.limit_hits[limit] = self.limit_hits.get(limit, 0) + 1
+
+    async def request(self, message: tuple, timeout: float) -> tuple:
+        """Send a request to the worker and wait for its reply."""
+        self.conn.send(message)
+        await _wait_readable(self.conn, timeout)
+        return await asyncio.to_thread(self.conn.recv)
+
+
+class KernelPool:
+    """Run python_tool code in worker processes with per-session namespaces.
+
+    A quiz session stays on the kernel that served it first, so its variables
+    persist between calls; new sessions go to the kernel with the fewest
+    sessions. Workers are forked with PYTHON_PRELOAD_MODULES already
+    imported, so neither a new session nor a replaced worker pays their import
+    cost. A kernel runs one execution at a time, held to PYTHON_CPU_SECONDS,
+    PYTHON_MAX_MEMORY_MB of new memory, and PYTHON_MAX_OUTPUT_BYTES of output
+    inside the worker. A call that waits longer than PYTHON_QUEUE_TIMEOUT for
+    a busy kernel returns without running; the run timeout only starts once
+    the kernel is free. An execution that passes its timeout, is cancelled
+    while running, or crashes the worker gets the worker killed and replaced;
+    other sessions on it are told their variables are gone on their next call.
+    """
+
+    def __init__(self, kernels: Optional[int] = None):
+        count = kernels or kernel_count()
+        context = _context()
+        self.kernels: List[Kernel] = [Kernel(str(i), context) for i in range(count)]
+        self._session_kernels: Dict[str, Kernel] = {}
+
+    async def initialize(self) -> None:
+        """Start every worker process.
+
+        The first start launches the fork server, which imports the preload
+        modules before it answers, so this runs off the event loop.
+        """
+        for kernel in self.kernels:
+            await asyncio.to_thread(kernel.start)
+        logger.info(f"Python ready with {len(self.kernels)} kernel process(es)")
+
+    def kernel_for(self, session_id: str) -> Kernel:
+        """Pick the session's kernel, assigning the least-used one on first use."""
+        kernel = self._session_kernels.get(session_id)
+        if kernel is None:
+            kernel = min(self.kernels, key=lambda k: (len(k.sessions), k.lock.locked()))
+            kernel.sessions.add(session_id)
+            self._session_kernels[session_id] = kernel
+        return kernel
+
+    async def execute(
+        self, session_id: str, code: str, timeout: Optional[float] = None
+    ) -> Tuple[bool, str, dict]:
+        """Run code in the session's namespace.
+
+        Returns:
+            Tuple of (succeeded, printed output or error, usage). Usage has
+            wall_seconds, cpu_seconds, peak_rss_mb, output_bytes, and the
+            limit that stopped the run ("wall", "cpu", "memory", "output"),
+            if any, or "busy" when the kernel never became free.
+        """
+        timeout = timeout or settings.PYTHON_TIMEOUT
+        kernel = self.kernel_for(session_id)
+        queued = time.perf_counter()
+        # Cancelled here, the caller has not run anything, so nothing is killed
+        try:
+            async with asyncio.timeout(settings.PYTHON_QUEUE_TIMEOUT):
+                await kernel.lock.acquire()
+        except TimeoutError:
+            logger.warning(f"Python kernel {kernel.name} busy; {session_id} gave up")
+            waited = round(time.perf_counter() - queued, 3)
+            return False, BUSY_MESSAGE, {"wall_seconds": waited, "limit": "busy"}
+        try:
+            return await self._run(kernel, session_id, code, timeout)
+        finally:
+            kernel.unlock()
+
+    async def _run(
+        self, kernel: Kernel, session_id: str, code: str, timeout: float
+    ) -> Tuple[bool, str, dict]:
+        """Run code on a kernel whose lock the caller holds."""
+        notice = RESTART_NOTICE if session_id in kernel.stale else ""
+        kernel.stale.discard(session_id)
+        started = time.perf_counter()
+        try:
+            ok, output, usage = await kernel.request(
+                ("exec", session_id, code), timeout
+            )
+        except asyncio.TimeoutError:
+            await kernel.restart(f"execution passed {timeout}s")
+            kernel.stale.discard(session_id)
+            usage = {"wall_seconds": timeout, "limit": "wall"}
+            kernel.account(usage)
+            return (
+                False,
+                f"Execution timed out after {timeout}s and was killed. "
+                "The Python session was restarted; variables from earlier "
+                "steps are gone.",
+                usage,
+            )
+        except asyncio.CancelledError:
+            # The worker is still running this caller's code
+            await kernel.restart("execution cancelled")
+            kernel.stale.discard(session_id)
+            raise
+        except (EOFError, OSError) as e:
+            await kernel.restart(f"worker exited ({e or type(e).__name__})")
+            kernel.stale.discard(session_id)
+            return (
+                False,
+                "The Python process crashed (out of memory or a native "
+                "library error). The session was restarted; variables from "
+                "earlier steps are gone.",
+                {"wall_seconds": round(time.perf_counter() - started, 3)},
+            )
+        usage["wall_seconds"] = round(time.perf_counter() - started, 3)
+        kernel.account(usage)
+        logger.info(
+            f"Python run on kernel {kernel.name}: "
+            f"{usage['wall_seconds']:.2f}s wall, "
+            f"{usage['cpu_seconds'] or 0:.2f}s CPU, "
+            f"{usage['peak_rss_mb'] or 0:.0f} MB peak RSS, "
+            f"{usage['output_bytes']} bytes printed"
+            + (f", stopped by the {usage['limit']} limit" if usage["limit"] else "")
+        )
+        return ok, notice + output, usage
+
+    async def reset(self, session_id: str) -> None:
+        """Clear the session's namespace, keeping it on its kernel."""
+        kernel = self._session_kernels.get(session_id)
+        if kernel is None:
+            return
+        await kernel.lock.acquire()
+        try:
+            kernel.stale.discard(session_id)
+            try:
+                await kernel.request(
+                    ("reset", session_id, None), settings.PYTHON_TIMEOUT
+                )
+            except (asyncio.TimeoutError, EOFError, OSError) as e:
+                await kernel.restart(f"reset failed ({e or type(e).__name__})")
+                kernel.stale.discard(session_id)
+        finally:
+            kernel.unlock()
+
+    async def release(self, session_id: str) -> None:
+        """Drop the session's namespace and unpin it from its kernel."""
+        await self.reset(session_id)
+        kernel = self._session_kernels.pop(session_id, None)
+        if kernel:
+            kernel.sessions.discard(session_id)
+            kernel.stale.discard(session_id)
+
+    def stats(self) -> dict:
+        """Per-kernel process metrics."""
+        return {
+            "kernels": [
+                {
+                    "name": k.name,
+                    "pid": k.process.pid if k.process else None,
+                    "alive": bool(k.process and k.process.is_alive()),
+                    "busy": k.lock.locked(),
+                    "sessions": len(k.sessions),
+                    "executions": k.executions,
+                    "restarts": k.restarts,
+                    "cpu_seconds": round(k.cpu_seconds, 1),
+                    "peak_rss_mb": round(k.peak_rss_mb, 1),
+                    "output_bytes": k.output_bytes,
+                    "limit_hits": dict(k.limit_hits),
+                }
+                for k in self.kernels
+            ],
+            "sessions": len(self._session_kernels),
+        }
+
+    async def close(self) -> None:
+        """Stop every worker process."""
+        await asyncio.gather(
+            *(k.replacing for k in self.kernels if k.replacing),
+            return_exceptions=True,
+        )
+        await asyncio.gather(
+            *(asyncio.to_thread(kernel.kill) for kernel in self.kernels)
+        )
+        self._session_kernels.clear()
+
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
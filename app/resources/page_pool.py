@@ -0,0 +1,235 @@
+"""Pool of pre-created browser contexts and pages."""
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional
+from playwright.async_api import Browser, BrowserContext, Page
+from app.config.settings import settings
+from app.resources.interception import RequestRouter
+from app.utils.logging import logger
+
+# Clears the current origin's web storage; opaque origins such as about:blank throw
+CLEAR_STORAGE_JS = (
+    "() => { try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} }"
+)
+
+
+@dataclass
+class PooledPage:
+    """A reusable page with its console log buffer already attached."""
+
+    page: Page
+    context: BrowserContext
+    console_logs: List[str] = field(default_factory=list)
+    loaded_url: str = ""
+    allow_images: bool = False  # let images through the request router
+    uses: int = 0
+
+
+class PagePool:
+    """Bounded pool of warm pages spread across a few browser contexts.
+
+    Pages are reset to about:blank and returned to the pool after each use.
+    At most `max_pages` pages are checked out at once; further callers wait.
+    Session pages (open_session) get a context of their own and do not take
+    one of those slots.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        contexts: int,
+        max_pages: int,
+        router: Optional[RequestRouter] = None,
+    ):
+        self.browser = browser
+        self.router = router
+        self.context_count = max(1, contexts)
+        self.max_pages = max(1, max_pages)
+        self.contexts: List[BrowserContext] = []
+        self._idle: List[PooledPage] = []
+        # Contexts owned by open session pages, closed with the session
+        self._session_contexts: List[BrowserContext] = []
+        self._semaphore = asyncio.Semaphore(self.max_pages)
+        self._next_context = 0
+        self.in_use = 0
+        self.metrics = {
+            "acquired": 0,
+            "created": 0,
+            "recycled": 0,
+            "wait_total_ms": 0.0,
+            "wait_max_ms": 0.0,
+        }
+
+    async def start(self, warm_pages: int = 0) -> None:
+        """Create the browser contexts and pre-create `warm_pages` idle pages."""
+        self.contexts = [
+            await self.browser.new_context() for _ in range(self.context_count)
+        ]
+        warm = min(warm_pages, self.max_pages)
+        self._idle = list(
+            await asyncio.gather(*(self._create_page() for _ in range(warm)))
+        )
+        logger.info(
+            f"Page pool ready ({self.context_count} context(s), {warm} warm page(s))"
+        )
+
+    async def _create_page(
+        self, context: Optional[BrowserContext] = None
+    ) -> PooledPage:
+        """Open a page and attach listeners.
+
+        The page goes in `context`, or the next shared context (round-robin).
+        """
+        if context is None:
+            context = self.contexts[self._next_context % len(self.contexts)]
+            self._next_context += 1
+        page = await context.new_page()
+        pooled = PooledPage(page=page, context=context)
+
+        async def handle_console(msg):
+            for arg in msg.args:
+                try:
+                    pooled.console_logs.append(
+                        f"[{msg.type}] {json.dumps(await arg.json_value(), indent=2)}"
+                    )
+                except Exception:
+                    pooled.console_logs.append(f"[{msg.type}] {msg.text}")
+
+        page.on("console", handle_console)
+        if self.router:
+            router = self.router
+            await page.route(
+                "**/*", lambda route: router.handle(route, pooled.allow_images)
+            )
+            page.on("response", router.observe)
+        page.set_default_timeout(settings.BROWSER_PAGE_TIMEOUT)
+        self.metrics["created"] += 1
+        return pooled
+
+    async def checkout(self) -> PooledPage:
+        """Take a page out of the pool, waiting if the concurrency cap is reached.
+
+        Every checkout must be paired with a checkin.
+        """
+        start = time.perf_counter()
+        await self._semaphore.acquire()
+        wait_ms = (time.perf_counter() - start) * 1000
+        self.metrics["acquired"] += 1
+        self.metrics["wait_total_ms"] += wait_ms
+        self.metrics["wait_max_ms"] = max(self.metrics["wait_max_ms"], wait_ms)
+        if wait_ms > 100:
+            logger.debug(f"Waited {wait_ms:.0f}ms for a browser page")
+
+        self.in_use += 1
+        try:
+            return self._idle.pop() if self._idle else await self._create_page()
+        except Exception:
+            self.in_use -= 1
+            self._semaphore.release()
+            raise
+
+    async def checkin(self, pooled: PooledPage) -> None:
+        """Reset a checked-out page and return its slot to the pool."""
+        self.in_use -= 1
+        try:
+            await self._reset(pooled)
+        finally:
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[PooledPage]:
+        """Check out a page for the duration of the block."""
+        pooled = await self.checkout()
+        try:
+            yield pooled
+        finally:
+            await self.checkin(pooled)
+
+    async def open_session(self) -> PooledPage:
+        """Open a page in a fresh context for one quiz session.
+
+        A session page is held for a whole quiz run, so it does not count
+        against `max_pages` (which would leave one-off fetches waiting on
+        it), and its cookies and storage die with its context instead of
+        leaking into the next session. Every open_session must be paired
+        with a close_session.
+        """
+        context = await self.browser.new_context()
+        try:
+            pooled = await self._create_page(context)
+        except Exception:
+            await context.close()
+            raise
+        self._session_contexts.append(context)
+        return pooled
+
+    async def close_session(self, pooled: PooledPage) -> None:
+        """Close a session page together with its context."""
+        if pooled.context in self._session_contexts:
+            self._session_contexts.remove(pooled.context)
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing session context: {e}")
+
+    def owns(self, context: BrowserContext) -> bool:
+        """Whether a pooled or session context belongs to this pool."""
+        return context in self.contexts or context in self._session_contexts
+
+    async def _reset(self, pooled: PooledPage) -> None:
+        """Reset a page and return it to the idle list, or close it if unhealthy."""
+        pooled.uses += 1
+        pooled.loaded_url = ""
+        pooled.allow_images = False
+        try:
+            if pooled.page.is_closed():
+                raise RuntimeError("page closed")
+            if pooled.uses >= settings.BROWSER_PAGE_MAX_USES:
+                raise RuntimeError("page reached max uses")
+            # Drop the cookies and storage this use left behind so the next
+            # caller starts clean. Cookies are per context, so this also clears
+            # them for other pages in the context; one-off fetches don't rely
+            # on them, and session pages have their own contexts.
+            async with asyncio.timeout(settings.BROWSER_PAGE_TIMEOUT / 1000):
+                await pooled.page.evaluate(CLEAR_STORAGE_JS)
+            await pooled.context.clear_cookies()
+            await pooled.page.goto("about:blank")
+            pooled.console_logs.clear()
+            self._idle.append(pooled)
+        except Exception as e:
+            logger.debug(f"Recycling browser page: {e}")
+            self.metrics["recycled"] += 1
+            try:
+                await pooled.page.close()
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        """Pool size and wait-time metrics."""
+        acquired = self.metrics["acquired"]
+        return {
+            **self.metrics,
+            "wait_avg_ms": (
+                self.metrics["wait_total_ms"] / acquired if acquired else 0.0
+            ),
+            "in_use": self.in_use,
+            "sessions": len(self._session_contexts),
+            "idle": len(self._idle),
+            "max_pages": self.max_pages,
+            "contexts": len(self.contexts),
+        }
+
+    async def close(self) -> None:
+        """Close every context (and with them, every page)."""
+        for context in self.contexts + self._session_contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser context: {e}")
+        self.contexts = []
+        self._session_contexts = []
+        self._idle = []
@@ -0,0 +1,113 @@
+"""Page readiness detection: DOM quiescence plus pending script/XHR tracking."""
+
+import asyncio
+import time
+from typing import Dict
+from urllib.parse import urlparse
+from playwright.async_api import Error as PlaywrightError, Page, Request
+from app.config.settings import settings
+from app.utils.logging import logger
+
+POLL_INTERVAL = 0.05  # seconds
+# Resource types whose completion can still change the rendered content
+TRACKED_TYPES = {"document", "script", "xhr", "fetch"}
+# evaluate() errors raised when the page navigates (redirect, client-side routing)
+NAVIGATION_ERRORS = (
+    "Execution context was destroyed",
+    "Cannot find context with specified id",
+)
+
+# Records the time of the last DOM mutation; returns ms since then
+QUIET_MS_SCRIPT = """() => {
+    if (window.__lastMutation === undefined) {
+        window.__lastMutation = performance.now();
+        new MutationObserver(() => { window.__lastMutation = performance.now(); })
+            .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    }
+    return document.readyState === "loading" ? 0 : performance.now() - window.__lastMutation;
+}"""
+
+
+class RequestTracker:
+    """Count in-flight script/XHR requests for a page while it loads."""
+
+    def __init__(self):
+        self.pending: Dict[Request, float] = {}
+
+    def _on_request(self, request: Request) -> None:
+        if request.resource_type in TRACKED_TYPES:
+            self.pending[request] = time.perf_counter()
+
+    def _on_done(self, request: Request) -> None:
+        self.pending.pop(request, None)
+
+    def attach(self, page: Page) -> None:
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_done)
+        page.on("requestfailed", self._on_done)
+
+    def detach(self, page: Page) -> None:
+        page.remove_listener("request", self._on_request)
+        page.remove_listener("requestfinished", self._on_done)
+        page.remove_listener("requestfailed", self._on_done)
+
+    def busy(self) -> bool:
+        """True while a tracked request is pending; long-polls are ignored."""
+        cutoff = time.perf_counter() - settings.READINESS_LONG_REQUEST_MS / 1000
+        return any(started > cutoff for started in self.pending.values())
+
+
+async def _wait_for_quiet(page: Page, tracker: RequestTracker, deadline: float) -> bool:
+    """Poll until requests settle and the DOM has been quiet long enough.
+
+    A navigation during a poll counts as a change: the new document starts
+    its own quiet timer on the next poll.
+    """
+    while time.perf_counter() < deadline:
+        if not tracker.busy():
+            try:
+                quiet_ms = await page.evaluate(QUIET_MS_SCRIPT)
+            except PlaywrightError as e:
+                if not any(marker in e.message for marker in NAVIGATION_ERRORS):
+                    raise
+                logger.debug(f"Page navigated while waiting for quiet: {e.message}")
+                quiet_ms = 0
+            if quiet_ms >= settings.READINESS_QUIET_MS:
+                return True
+        await asyncio.sleep(POLL_INTERVAL)
+    return False
+
+
+async def load_page(page: Page, url: str) -> float:
+    """Navigate to url and return as soon as the page content stops changing.
+
+    Waits for DOMContentLoaded, an optional per-domain selector, then for
+    tracked requests to finish and the DOM to stay unchanged for
+    READINESS_QUIET_MS. Gives up (without failing) after READINESS_TIMEOUT_MS.
+
+    Returns:
+        Milliseconds from navigation start until the page was considered ready.
+    """
+    start = time.perf_counter()
+    deadline = start + settings.READINESS_TIMEOUT_MS / 1000
+    tracker = RequestTracker()
+    tracker.attach(page)
+    try:
+        await page.goto(url, wait_until="domcontentloaded")
+
+        selector = settings.READINESS_SELECTORS.get(urlparse(url).hostname or "")
+        if selector:
+            remaining_ms = max(0.0, (deadline - time.perf_counter()) * 1000)
+            try:
+                await page.wait_for_selector(selector, timeout=remaining_ms)
+            except Exception as e:
+                logger.debug(f"Readiness selector {selector!r} not found: {e}")
+
+        if not await _wait_for_quiet(page, tracker, deadline):
+            logger.warning(f"Page not quiet after {settings.READINESS_TIMEOUT_MS}ms")
+    finally:
+        tracker.detach(page)
+
+    ready_ms = (time.perf_counter() - start) * 1000
+    logger.debug(f"Page ready in {ready_ms:.0f}ms: {url}")
+    return ready_ms
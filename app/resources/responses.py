@@ -0,0 +1,127 @@
+"""Record data-like network responses (JSON, CSV, ...) while a page loads."""
+
+import asyncio
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from playwright.async_api import Page, Response
+from app.config.settings import settings
+from app.utils.logging import logger
+
+BODY_TIMEOUT = 10  # seconds to wait for outstanding response bodies
+
+
+class ResponseRecorder:
+    """Collect bodies of data responses within a byte budget and save them.
+
+    Attach before navigation and detach after capture; save() then writes the
+    bodies to TEMP_DIR.
+    """
+
+    def __init__(self):
+        self.content_types = {t.lower() for t in settings.RESPONSE_CAPTURE_TYPES}
+        self.budget = settings.RESPONSE_CAPTURE_MAX_BYTES
+        self.per_file = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        self._tasks: List[asyncio.Task] = []
+        self._seen: set = set()
+
+    def _wanted(self, response: Response) -> Optional[str]:
+        """Return the content type if the response should be kept, else None."""
+        if response.status != 200 or response.request.is_navigation_request():
+            return None
+        content_type = response.headers.get("content-type", "").split(";")[0]
+        content_type = content_type.strip().lower()
+        if content_type not in self.content_types or response.url in self._seen:
+            return None
+        length = response.headers.get("content-length", "")
+        if length.isdigit() and int(length) > self.per_file:
+            return None
+        return content_type
+
+    def _on_response(self, response: Response) -> None:
+        content_type = self._wanted(response)
+        if content_type:
+            self._seen.add(response.url)
+            self._tasks.append(asyncio.create_task(self._read(response, content_type)))
+
+    @staticmethod
+    async def _body_size(response: Response) -> Optional[int]:
+        """Body size in bytes, known before the body is read, or None.
+
+        Playwright can only read a body whole, so without Content-Length the
+        size the browser received is used instead (like Content-Length, the
+        compressed size for a compressed body).
+        """
+        length = response.headers.get("content-length", "")
+        if length.isdigit():
+            return int(length)
+        try:
+            return (await response.request.sizes())["responseBodySize"]
+        except Exception as e:
+            logger.debug(f"Could not get response size {response.url}: {e}")
+            return None
+
+    async def _read(self, response: Response, content_type: str) -> Optional[dict]:
+        size = await self._body_size(response)
+        if size is None or size > self.per_file:
+            logger.debug(f"Skipped response of unknown or excess size: {response.url}")
+            return None
+        try:
+            body = await response.body()
+        except Exception as e:
+            logger.debug(f"Could not read response body {response.url}: {e}")
+            return None
+        return {"url": response.url, "content_type": content_type, "body": body}
+
+    def attach(self, page: Page) -> None:
+        page.on("response", self._on_response)
+
+    def detach(self, page: Page) -> None:
+        page.remove_listener("response", self._on_response)
+
+    @staticmethod
+    def _filename(url: str, content_type: str) -> str:
+        """Readable, collision-free file name for a response URL."""
+        name = Path(urlparse(url).path).name or "response"
+        if not Path(name).suffix:
+            name += mimetypes.guess_extension(content_type) or ".bin"
+        return f"net_{hashlib.sha256(url.encode()).hexdigest()[:8]}_{name}"
+
+    async def save(self) -> List[Dict[str, object]]:
+        """Write recorded bodies (in arrival order, within budget) to TEMP_DIR.
+
+        Returns:
+            List of dicts with 'url', 'path', 'content_type', and 'size'.
+        """
+        if not self._tasks:
+            return []
+        done, pending = await asyncio.wait(self._tasks, timeout=BODY_TIMEOUT)
+        for task in pending:
+            task.cancel()
+
+        saved, used = [], 0
+        for task in self._tasks:
+            result = task.result() if task in done else None
+            if not result or len(result["body"]) > self.per_file:
+                continue
+            if used + len(result["body"]) > self.budget:
+                logger.info(f"Response capture budget reached; skipped {result['url']}")
+                continue
+            path = settings.TEMP_DIR / self._filename(
+                result["url"], result["content_type"]
+            )
+            path.write_bytes(result["body"])
+            used += len(result["body"])
+            saved.append(
+                {
+                    "url": result["url"],
+                    "path": str(path),
+                    "content_type": result["content_type"],
+                    "size": len(result["body"]),
+                }
+            )
+        if saved:
+            logger.info(f"Captured {len(saved)} data response(s) ({used} bytes)")
+        return saved
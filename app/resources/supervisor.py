@@ -0,0 +1,151 @@
+"""Background health checks that restart or recycle the shared Chromium."""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+from app.config.settings import settings
+from app.utils.logging import logger
+
+if TYPE_CHECKING:
+    from app.resources.browser import BrowserClient
+
+CHROMIUM_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+def _process_table() -> Dict[int, tuple]:
+    """Map pid -> (parent pid, process name, RSS in bytes) from /proc."""
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    table = {}
+    for stat_path in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            stat = stat_path.read_text()
+        except OSError:
+            continue  # process exited while scanning
+        # comm is wrapped in parentheses and may itself contain spaces
+        name = stat[stat.index("(") + 1 : stat.rindex(")")]
+        fields = stat[stat.rindex(")") + 2 :].split()
+        table[int(stat_path.parent.name)] = (
+            int(fields[1]),
+            name,
+            int(fields[21]) * page_size,
+        )
+    return table
+
+
+def _cmdline(pid: int) -> str:
+    try:
+        return Path(f"/proc/{pid}/cmdline").read_bytes().decode(errors="replace")
+    except OSError:
+        return ""
+
+
+def chromium_rss_mb(marker: Optional[str] = None) -> Optional[float]:
+    """Total resident memory of Chromium processes started by this server.
+
+    Args:
+        marker: Only count the browser launched with this command-line
+            argument, plus its child processes (one shard of several).
+
+    Returns:
+        Megabytes, or None where /proc is not available.
+    """
+    if not Path("/proc/self/stat").exists():
+        return None
+    table = _process_table()
+    children: Dict[int, List[int]] = {}
+    for pid, (ppid, _, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+
+    total = 0
+    stack = [(pid, marker is None) for pid in children.get(os.getpid(), [])]
+    while stack:
+        pid, counted = stack.pop()
+        _, name, rss = table[pid]
+        if any(n in name.lower() for n in CHROMIUM_NAMES):
+            counted = counted or marker in _cmdline(pid)
+            if counted:
+                total += rss
+        stack.extend((child, counted) for child in children.get(pid, []))
+    return total / (1024 * 1024)
+
+
+class BrowserSupervisor:
+    """Periodically probe Chromium and restart or recycle it when needed.
+
+    A restart is triggered when the browser is disconnected or does not answer
+    a probe in time. It is recycled after BROWSER_RECYCLE_PAGES page loads or
+    when its memory passes BROWSER_MAX_MEMORY_MB.
+    """
+
+    def __init__(self, client: "BrowserClient"):
+        self.client = client
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and settings.BROWSER_HEALTH_INTERVAL > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.BROWSER_HEALTH_INTERVAL)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Browser health check failed: {e}")
+
+    async def _probe(self) -> Optional[str]:
+        """Return why the browser is unhealthy, or None if it responds."""
+        browser = self.client.browser
+        if browser is None or not browser.is_connected():
+            return "crash"
+        start = time.perf_counter()
+        try:
+            context = await asyncio.wait_for(
+                browser.new_context(), timeout=settings.BROWSER_PROBE_TIMEOUT
+            )
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Browser probe failed: {e}")
+            return "hang"
+        self.client.health["last_probe_ms"] = (time.perf_counter() - start) * 1000
+        return None
+
+    def _recycle_reason(self) -> Optional[str]:
+        """Return why the browser should be recycled, or None."""
+        health = self.client.health
+        # A remote (CDP) browser's memory is not visible from here
+        memory_mb = (
+            None
+            if self.client.cdp_endpoint
+            else chromium_rss_mb(self.client.process_marker)
+        )
+        health["memory_mb"] = memory_mb
+        if (
+            settings.BROWSER_RECYCLE_PAGES
+            and health["pages_since_restart"] >= settings.BROWSER_RECYCLE_PAGES
+        ):
+            return "pages"
+        if (
+            settings.BROWSER_MAX_MEMORY_MB
+            and memory_mb is not None
+            and memory_mb >= settings.BROWSER_MAX_MEMORY_MB
+        ):
+            return "memory"
+        return None
+
+    async def check(self) -> None:
+        """Run one probe and restart the browser if needed."""
+        reason = await self._probe() or await asyncio.to_thread(self._recycle_reason)
+        if reason:
+            await self.client.restart(reason)
@@ -1,21 +1,63 @@
 """LLM tools for multimodal file analysis using Gemini."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 from langchain_core.tools import tool
 from app.config.settings import settings
 from app.utils.logging import logger
 from app.utils.gemini import (
+    gemini_key_manager,
     get_gemini_client,
+    get_mime_type,
     create_data_uri,
     is_text_file,
 )
+from app.utils.media import (
+    Segment,
+    format_timestamp,
+    get_media_kind,
+    get_video_duration,
+    sample_video_keyframes,
+    split_audio,
+)
+from app.utils.vision import decode_codes, format_decoded_codes
 
 SYSTEM_PROMPT = (
     "You are an expert file analyzer. Extract information accurately and concisely."
 )
 
+MAP_PROMPT_TEMPLATE = """This file is one of several being analyzed for the following task:
+
+{prompt}
+
+Extract everything in this file that is relevant to the task (facts, numbers, text, table rows).
+Do not attempt the overall task; report the relevant content as faithfully as possible."""
+
+AUDIO_SEGMENT_PROMPT_TEMPLATE = """This is part {index} of {total} of an audio file, covering {start}-{end}.
+Transcribe it verbatim, then note anything relevant to the following task:
+
+{prompt}"""
+
+VIDEO_SEGMENT_PROMPT_TEMPLATE = """These {count} frames were sampled in order from a video, covering {start}-{end}.{audio_note}
+Describe what happens and read any visible text, focusing on what is relevant to the following task:
+
+{prompt}"""
+
+VIDEO_AUDIO_NOTE = " The video's audio for the same span is attached after the frames; transcribe any speech."
+
+REDUCE_PROMPT_TEMPLATE = """Complete the following task:
+
+{prompt}
+
+The input was analyzed in separate parts. Here is what was extracted from each part, in order
+(consecutive media segments overlap slightly; ignore repeated content at the boundaries):
+
+{partials}"""
+
+FAILED_PART_NOTE = "(Analysis of this part failed; its content is unavailable. Say so if the task depends on it.)"
+
 
 def _build_file_content(file_path: str) -> dict:
     """Build content dict for a single file (text or binary)."""
@@ -42,7 +84,9 @@ def _validate_files(file_paths: List[str]) -> str | None:
     return None
 
 
-def _call_gemini(prompt: str, file_paths: List[str]) -> str:
+def _call_gemini(
+    prompt: str, file_paths: List[str], api_key: Optional[str] = None
+) -> str:
     """Core function to call Gemini LLM with files."""
     if error := _validate_files(file_paths):
         return error
@@ -53,7 +97,7 @@ def _call_gemini(prompt: str, file_paths: List[str]) -> str:
     ]
 
     result = (
-        get_gemini_client()
+        get_gemini_client(api_key)
         .chat.completions.create(
             model=settings.GEMINI_MODEL,
             temperature=0.1,
@@ -70,27 +114,167 @@ def _call_gemini(prompt: str, file_paths: List[str]) -> str:
     return result
 
 
+def _call_with_retry(prompt: str, file_paths: List[str]) -> str:
+    """Call Gemini on a healthy key, retrying once on another key after a failure."""
+    error = None
+    for _ in range(2):
+        key = None
+        try:
+            key = gemini_key_manager.get_next_key()
+            return _call_gemini(prompt, file_paths, api_key=key)
+        except Exception as e:
+            logger.warning(f"Gemini call failed for {len(file_paths)} file(s): {e}")
+            if key:
+                gemini_key_manager.mark_unhealthy(key)
+            error = e
+    return f"Error: {error}"
+
+
+def _run_parallel(jobs: List[Tuple[str, List[str]]]) -> List[str]:
+    """Run (prompt, file_paths) jobs concurrently, one worker per healthy key.
+
+    Results are returned in job order.
+    """
+    workers = max(
+        1,
+        min(
+            len(jobs),
+            gemini_key_manager.healthy_count(),
+            settings.GEMINI_MAX_CONCURRENCY,
+        ),
+    )
+    logger.info(f"Running {len(jobs)} Gemini call(s) with {workers} worker(s)")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda job: _call_with_retry(*job), jobs))
+
+
+def _is_error(result: str) -> bool:
+    """Whether a Gemini call result is one of this module's error strings."""
+    return result.startswith("Error:")
+
+
+def _reduce(prompt: str, labels: List[str], partials: List[str]) -> str:
+    """Combine ordered partial results with one text-only Gemini call.
+
+    Failed parts are marked as missing instead of being passed off as
+    extracted content. If every part failed, their errors are returned
+    without calling the model.
+    """
+    failed = [label for label, partial in zip(labels, partials) if _is_error(partial)]
+    if len(failed) == len(partials):
+        details = "; ".join(
+            f"{label}: {partial}" for label, partial in zip(labels, partials)
+        )
+        return f"Error: analysis failed for every part. {details}"
+    if failed:
+        logger.warning(
+            f"Reducing without {len(failed)} failed part(s): {', '.join(failed)}"
+        )
+    combined = "\n\n".join(
+        f"--- {label} ---\n{FAILED_PART_NOTE if _is_error(partial) else partial}\n--- END ---"
+        for label, partial in zip(labels, partials)
+    )
+    return _call_gemini(
+        REDUCE_PROMPT_TEMPLATE.format(prompt=prompt, partials=combined), []
+    )
+
+
+def _map_reduce_gemini(prompt: str, file_paths: List[str]) -> str:
+    """Analyze each file concurrently, then combine the partial results.
+
+    The size limit applies per file rather than to the whole batch.
+    """
+    for fp in file_paths:
+        if not os.path.exists(fp):
+            return f"Error: File not found: {fp}"
+
+    map_prompt = MAP_PROMPT_TEMPLATE.format(prompt=prompt)
+    partials = _run_parallel([(map_prompt, [fp]) for fp in file_paths])
+    return _reduce(prompt, [f"FILE: {Path(fp).name}" for fp in file_paths], partials)
+
+
+def _split_media(file_path: str) -> Optional[List[Segment]]:
+    """Split long or oversized audio/video into segments, or None to send it whole.
+
+    Video is only reduced to keyframes when it is over the size limit or
+    VIDEO_MAX_INLINE_SECONDS; otherwise Gemini gets the original, sound and all.
+    """
+    kind = get_media_kind(file_path)
+    if kind == "audio":
+        return split_audio(file_path)
+    if kind == "video":
+        too_large = os.path.getsize(file_path) > settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        duration = get_video_duration(file_path)
+        if too_large or (duration and duration > settings.VIDEO_MAX_INLINE_SECONDS):
+            return sample_video_keyframes(file_path)
+    return None
+
+
+def _analyze_media(prompt: str, file_path: str) -> Optional[str]:
+    """Analyze audio/video segments concurrently and merge them in order.
+
+    Returns None when the file is not chunkable, so the caller sends it whole.
+    """
+    segments = _split_media(file_path)
+    if not segments:
+        return None
+
+    is_audio = get_media_kind(file_path) == "audio"
+    jobs, labels = [], []
+    for i, (start, end, paths) in enumerate(segments):
+        span = {"start": format_timestamp(start), "end": format_timestamp(end)}
+        if is_audio:
+            segment_prompt = AUDIO_SEGMENT_PROMPT_TEMPLATE.format(
+                index=i + 1, total=len(segments), prompt=prompt, **span
+            )
+        else:
+            frames = [p for p in paths if get_media_kind(p) != "audio"]
+            segment_prompt = VIDEO_SEGMENT_PROMPT_TEMPLATE.format(
+                count=len(frames),
+                audio_note=VIDEO_AUDIO_NOTE if len(frames) < len(paths) else "",
+                prompt=prompt,
+                **span,
+            )
+        jobs.append((segment_prompt, paths))
+        labels.append(f"PART {i + 1} [{span['start']}-{span['end']}]")
+
+    return _reduce(prompt, labels, _run_parallel(jobs))
+
+
 @tool
-def call_llm_tool(file_path: str, prompt: str) -> str:
+def call_llm_tool(file_path: str, prompt: str, local_decode: bool = True) -> str:
     """
     Analyze a file using Gemini 2.5 Flash multimodal LLM.
 
     Only use this tool to:
+    - Read QR codes/barcodes (decoded locally and instantly when possible)
     - Extract text/OCR from images
     - Understand PDF documents
-    - Transcribe audio files
-    - Analyze video content
+    - Transcribe audio files (long audio is split and transcribed in parallel)
+    - Analyze video content (very long or large videos are sampled into keyframes)
     - Understand charts/graphs
     - Any other file understanding task
 
     Args:
         file_path: Absolute path to the file to analyze (image, PDF, audio, video, etc.)
         prompt: The question or instruction about the file content
+        local_decode: For images, return decoded QR codes/barcodes directly when
+            any are found. Set to False to always ask the LLM.
 
     Returns:
         LLM response as a string with the analysis results
     """
     try:
+        if (
+            local_decode
+            and settings.LOCAL_DECODE_ENABLED
+            and get_mime_type(file_path).startswith("image/")
+            and (codes := decode_codes(file_path))
+        ):
+            return format_decoded_codes(codes)
+        if settings.MEDIA_CHUNKING and os.path.exists(file_path):
+            if (result := _analyze_media(prompt, file_path)) is not None:
+                return result
         return _call_gemini(prompt, [file_path])
     except Exception as e:
         logger.error(f"Error calling Gemini LLM: {e}")
@@ -98,7 +282,9 @@ def call_llm_tool(file_path: str, prompt: str) -> str:
 
 
 @tool
-def call_llm_with_multiple_files_tool(file_paths: List[str], prompt: str) -> str:
+def call_llm_with_multiple_files_tool(
+    file_paths: List[str], prompt: str, map_reduce: bool = False
+) -> str:
     """
     Analyze multiple files together using Gemini 2.5 Flash multimodal LLM.
 
@@ -107,14 +293,21 @@ def call_llm_with_multiple_files_tool(file_paths: List[str], prompt: str) -> str
     - Combine data from multiple sources
     - Cross-reference information across files
 
+    Set map_reduce=True for many or large files: each file is analyzed
+    separately in parallel and the results are combined in a final step.
+    This lifts the combined size limit (each file must still fit on its own).
+
     Args:
         file_paths: List of absolute paths to files to analyze
         prompt: The question or instruction about the files
+        map_reduce: Analyze files separately in parallel, then combine
 
     Returns:
         LLM response as a string with the analysis results
     """
     try:
+        if map_reduce and len(file_paths) > 1:
+            return _map_reduce_gemini(prompt, file_paths)
         return _call_gemini(prompt, file_paths)
     except Exception as e:
         logger.error(f"Error calling Gemini LLM: {e}")
@@ -0,0 +1,69 @@
+"""On-demand page capture tool (full screenshots, ARIA tree, fresh HTML/text)."""
+
+import hashlib
+from typing import Optional
+from langchain_core.tools import tool
+from app.config.settings import settings
+from app.resources.browser import BrowserClient
+from app.utils.logging import logger
+
+INLINE_CHARS = 10000
+
+
+def create_capture_tool(
+    browser_client: BrowserClient, session_id: Optional[str] = None
+):
+    """Factory to create a page capture tool bound to a browser client.
+
+    With a session_id, capture runs on the quiz session's live page, so it
+    reflects any changes made with javascript_tool.
+    """
+
+    @tool
+    async def capture_page_tool(
+        url: str, outputs: str = "screenshot", full_page: bool = True
+    ) -> str:
+        """
+        Capture the current state of a web page on demand.
+
+        Use this when the initial page content is not enough: e.g. a full-page
+        screenshot for call_llm_tool, the accessibility tree to understand
+        page structure, or fresh HTML/text after running javascript_tool.
+
+        Args:
+            url: The URL of the page to capture.
+            outputs: Comma-separated outputs: screenshot, aria, html, text.
+            full_page: Screenshot the whole page instead of just the viewport.
+
+        Returns:
+            Screenshot path, ARIA snapshot, and HTML/text saved to files.
+        """
+        try:
+            logger.info(f"Capturing {outputs} from: {url}")
+            selected = [o.strip() for o in outputs.split(",") if o.strip()]
+            data = await browser_client.capture(
+                url, selected, session_id=session_id, full_page=full_page
+            )
+        except Exception as e:
+            logger.error(f"Capture failed for {url}: {e}")
+            return f"Capture Error: {str(e)}"
+
+        stem = hashlib.sha256(url.encode()).hexdigest()[:16]
+        lines = []
+        if data["screenshot_path"]:
+            lines.append(f"Screenshot saved at: {data['screenshot_path']}")
+        for kind, suffix in (("html", "html"), ("text", "txt")):
+            if data[kind]:
+                path = settings.TEMP_DIR / f"{stem}_capture.{suffix}"
+                path.write_text(data[kind], encoding="utf-8")
+                lines.append(
+                    f"{kind.upper()} ({len(data[kind])} chars) saved at: {path}"
+                )
+        if data["aria_snapshot"]:
+            aria = data["aria_snapshot"]
+            lines.append("Accessibility tree:\n" + aria[:INLINE_CHARS])
+            if len(aria) > INLINE_CHARS:
+                lines.append("... (truncated)")
+        return "\n".join(lines) or "Nothing captured."
+
+    return capture_page_tool
@@ -0,0 +1,199 @@
+"""Concurrent multi-page crawl tool backed by the browser page pool."""
+
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import re
+import time
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup
+from langchain_core.tools import tool
+from app.config.settings import settings
+from app.resources.browser import BrowserClient
+from app.utils.html import extract_links, extract_tables
+from app.utils.logging import logger
+
+PREVIEW_CHARS = 200
+SUMMARY_CHARS = 4000
+
+
+def _parse_urls(urls: str) -> List[str]:
+    """Split a comma/whitespace separated URL list."""
+    return [u for u in re.split(r"[\s,]+", urls) if u]
+
+
+def _extract(html: str, text: str, url: str) -> dict:
+    """Title, text, tables (CSV), and links of a rendered page."""
+    soup = BeautifulSoup(html, "html.parser")
+    return {
+        "url": url,
+        "title": soup.title.get_text(strip=True) if soup.title else "",
+        "text": text,
+        "tables": extract_tables(html),
+        "links": extract_links(html, url),
+    }
+
+
+async def crawl(
+    browser_client: BrowserClient,
+    start_urls: List[str],
+    link_pattern: Optional[str] = None,
+    max_pages: int = 20,
+) -> List[dict]:
+    """Render pages concurrently, following links that match link_pattern.
+
+    Pages are rendered at most CRAWL_CONCURRENCY at a time. Newly found
+    matching links are queued as soon as their page is done, until max_pages
+    URLs have been visited.
+
+    Returns:
+        One dict per visited URL in discovery order: url, title, text, tables,
+        links, or url and error if the page failed.
+    """
+    pattern = re.compile(link_pattern) if link_pattern else None
+    semaphore = asyncio.Semaphore(max(1, settings.CRAWL_CONCURRENCY))
+    seen = list(dict.fromkeys(start_urls))[:max_pages]
+    results: Dict[str, dict] = {}
+
+    async def visit(url: str) -> List[str]:
+        try:
+            async with semaphore:
+                data = await browser_client.fetch_page_content(
+                    url, outputs=["html", "text"]
+                )
+            page = await asyncio.to_thread(_extract, data["html"], data["text"], url)
+        except Exception as e:
+            logger.warning(f"Crawl failed for {url}: {e}")
+            results[url] = {"url": url, "error": str(e)}
+            return []
+        results[url] = page
+        return [link for link in page["links"] if pattern and pattern.search(link)]
+
+    tasks = {asyncio.create_task(visit(url)) for url in seen}
+    while tasks:
+        done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            for link in task.result():
+                if link not in seen and len(seen) < max_pages:
+                    seen.append(link)
+                    tasks.add(asyncio.create_task(visit(link)))
+    return [results[url] for url in seen]
+
+
+def merge_tables(pages: List[dict]) -> List[List[List[str]]]:
+    """Combine tables with the same header across pages, tagging each row's source.
+
+    Returns:
+        List of merged tables (header row first, source_url column appended).
+    """
+    merged: Dict[tuple, List[List[str]]] = {}
+    for page in pages:
+        for table in page.get("tables", []):
+            rows = list(csv.reader(io.StringIO(table)))
+            if not rows:
+                continue
+            header = tuple(rows[0])
+            target = merged.setdefault(header, [list(header) + ["source_url"]])
+            target += [row + [page["url"]] for row in rows[1:]]
+    return list(merged.values())
+
+
+def _write_outputs(stem: str, pages: List[dict]) -> tuple:
+    """Save all pages as JSON and each merged table as CSV in the temp directory."""
+    pages_path = settings.TEMP_DIR / f"{stem}.json"
+    pages_path.write_text(
+        json.dumps(pages, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    table_paths = []
+    for n, rows in enumerate(merge_tables(pages), 1):
+        path = settings.TEMP_DIR / f"{stem}_table{n}.csv"
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        path.write_text(buffer.getvalue(), encoding="utf-8")
+        table_paths.append((path, len(rows) - 1))
+    return pages_path, table_paths
+
+
+def create_crawl_tool(browser_client: BrowserClient):
+    """Factory to create a crawl tool bound to a browser client."""
+
+    @tool
+    async def crawl_pages_tool(
+        seed_url: str = "", link_pattern: str = "", urls: str = "", max_pages: int = 20
+    ) -> str:
+        """
+        Render many pages at once (JavaScript included) and extract their text and tables.
+
+        Use this instead of visiting pages one by one for pagination or
+        per-item detail pages. Tables with the same header are merged across
+        pages into one CSV.
+
+        Args:
+            seed_url: Page to start from; its links matching link_pattern are followed.
+            link_pattern: Regex matched against absolute link URLs, e.g. "page=\\d+"
+                or "/items/\\d+". Links on followed pages are checked too.
+            urls: Alternatively, an explicit comma-separated list of URLs to render.
+            max_pages: Maximum number of pages to visit.
+
+        Returns:
+            Summary with per-page previews, the path of a JSON file holding every
+            page (url, title, text, tables, links), and merged table CSV paths.
+        """
+        start_urls = ([seed_url] if seed_url else []) + _parse_urls(urls)
+        if not start_urls:
+            return "Crawl Error: provide seed_url or urls."
+        max_pages = max(1, min(max_pages, settings.CRAWL_MAX_PAGES))
+        try:
+            started = time.perf_counter()
+            logger.info(f"Crawling from {start_urls[0]} (max {max_pages} pages)")
+            pages = await crawl(
+                browser_client, start_urls, link_pattern or None, max_pages
+            )
+            elapsed = time.perf_counter() - started
+            stem = (
+                "crawl_"
+                + hashlib.sha256(
+                    json.dumps([start_urls, link_pattern, max_pages]).encode()
+                ).hexdigest()[:12]
+            )
+            pages_path, table_paths = await asyncio.to_thread(
+                _write_outputs, stem, pages
+            )
+        except re.error as e:
+            return f"Crawl Error: invalid link_pattern: {e}"
+        except Exception as e:
+            logger.error(f"Crawl failed: {e}")
+            return f"Crawl Error: {str(e)}"
+
+        failed = [p for p in pages if "error" in p]
+        lines = [
+            f"Crawled {len(pages)} page(s) in {elapsed:.1f}s"
+            + (f", {len(failed)} failed" if failed else "")
+            + ".",
+            f"All pages (JSON): {pages_path}",
+        ]
+        if table_paths:
+            lines.append("Merged tables (CSV, with source_url column):")
+            lines += [f"- {path} ({rows} rows)" for path, rows in table_paths]
+        if link_pattern and len(pages) >= max_pages:
+            lines.append(f"Stopped at max_pages={max_pages}; more links may exist.")
+
+        lines.append("\nPreview:")
+        budget = SUMMARY_CHARS
+        for page in pages:
+            if budget <= 0:
+                lines.append("... (see JSON file)")
+                break
+            if "error" in page:
+                lines.append(f"--- {page['url']} ---\nError: {page['error']}")
+                continue
+            text = " ".join(page["text"].split())
+            preview = text[: min(PREVIEW_CHARS, budget)]
+            budget -= len(preview)
+            ellipsis = "..." if len(text) > len(preview) else ""
+            lines.append(f"--- {page['url']} ---\n{preview}{ellipsis}")
+        return "\n".join(lines)
+
+    return crawl_pages_tool
@@ -1,8 +1,14 @@
 """File download tool with caching and streaming support."""
 
+import hashlib
 import os
 import re
 import mimetypes
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
 from urllib.parse import urlparse, unquote
 import httpx
 from langchain_core.tools import tool
@@ -11,6 +17,12 @@ from app.utils.logging import logger
 from app.utils.cache import get_cache_key, cache_get, cache_set
 
 CHUNK_SIZE = 1024 * 1024  # 1MB
+IN_FLIGHT_WAIT = 60  # seconds to wait for another download of the same URL
+
+# URL -> event set when its download finishes, so concurrent callers (the
+# agent and background prefetch) download each URL once
+_in_flight: Dict[str, threading.Event] = {}
+_in_flight_lock = threading.Lock()
 
 
 def _get_filename(response: httpx.Response) -> str:
@@ -42,48 +54,46 @@ def _sanitize_filename(filename: str) -> str:
     return re.sub(r'[<>:"/\\|?*]', "_", filename)
 
 
-@tool
-def download_file_tool(url: str) -> str:
-    """Download a file from URL to temp directory.
-
-    Args:
-        url: The URL of the file to download
-
-    Returns:
-        Local file path where file was saved, or error message
-    """
-    # Check cache
+def _download(url: str, max_bytes: int, data_only: bool) -> str:
+    """Stream url into TEMP_DIR and cache its local path."""
     cache_key = get_cache_key("download_file", url)
-    hit, cached_data = cache_get(cache_key, ttl_seconds=3600)
-    if hit:
-        logger.info(f"Cache hit for file: {url}")
-        return cached_data
-
     try:
         logger.info(f"Downloading: {url}")
         with httpx.Client(timeout=60.0) as client:
             with client.stream("GET", url, follow_redirects=True) as response:
                 response.raise_for_status()
 
+                content_type = response.headers.get("Content-Type", "")
+                if data_only and content_type.startswith("text/html"):
+                    return f"Not a data file: {url} returned {content_type}"
+
                 # Check size limit
                 content_length = response.headers.get("Content-Length")
-                if (
-                    content_length
-                    and int(content_length) > settings.MAX_FILE_SIZE_MB * 1024 * 1024
-                ):
-                    return f"File too large: {int(content_length) / (1024 * 1024):.2f} MB (limit {settings.MAX_FILE_SIZE_MB} MB)"
+                if content_length and int(content_length) > max_bytes:
+                    return f"File too large: {int(content_length) / (1024 * 1024):.2f} MB (limit {max_bytes / (1024 * 1024):.0f} MB)"
 
+                # Prefix with a URL hash so same-named files from different
+                # URLs never overwrite each other
                 filename = _sanitize_filename(_get_filename(response))
-                local_path = settings.TEMP_DIR / filename
-
-                # Stream and write
-                downloaded_size = 0
-                with open(local_path, "wb") as file:
-                    for chunk in response.iter_bytes(CHUNK_SIZE):
-                        downloaded_size += len(chunk)
-                        if downloaded_size > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
-                            return f"Download aborted: Exceeded {settings.MAX_FILE_SIZE_MB}MB limit."
-                        file.write(chunk)
+                url_hash = hashlib.sha256(url.encode()).hexdigest()[:8]
+                local_path = settings.TEMP_DIR / f"{url_hash}_{filename}"
+
+                # Stream into a temp file and move it into place once complete,
+                # so no reader or other writer ever sees a partial file
+                fd, tmp_path = tempfile.mkstemp(
+                    prefix=f".{filename}.", suffix=".part", dir=settings.TEMP_DIR
+                )
+                try:
+                    downloaded_size = 0
+                    with os.fdopen(fd, "wb") as file:
+                        for chunk in response.iter_bytes(CHUNK_SIZE):
+                            downloaded_size += len(chunk)
+                            if downloaded_size > max_bytes:
+                                return f"Download aborted: Exceeded {max_bytes / (1024 * 1024):.0f}MB limit."
+                            file.write(chunk)
+                    os.replace(tmp_path, local_path)
+                finally:
+                    Path(tmp_path).unlink(missing_ok=True)
 
                 cache_set(cache_key, str(local_path.absolute()))
                 return str(local_path.absolute())
@@ -91,3 +101,62 @@ def download_file_tool(url: str) -> str:
     except Exception as e:
         logger.error(f"Failed to download {url}: {e}")
         return f"Failed to download {url}. Error: {str(e)}"
+
+
+def download_file(
+    url: str, max_bytes: Optional[int] = None, data_only: bool = False
+) -> str:
+    """Download a file to TEMP_DIR, reusing the cache and in-flight downloads.
+
+    Args:
+        url: The URL of the file to download.
+        max_bytes: Size limit; defaults to MAX_FILE_SIZE_MB.
+        data_only: Refuse HTML responses (used for speculative prefetch).
+
+    Returns:
+        Local file path where file was saved, or error message
+    """
+    # Check cache
+    cache_key = get_cache_key("download_file", url)
+    hit, cached_data = cache_get(cache_key, ttl_seconds=3600)
+    if hit:
+        logger.info(f"Cache hit for file: {url}")
+        return cached_data
+
+    # Become the one downloader of url, or wait for the current one and reuse
+    # its result. If it failed (or refused the file), try again to take over.
+    deadline = time.monotonic() + IN_FLIGHT_WAIT
+    while True:
+        with _in_flight_lock:
+            event = _in_flight.get(url)
+            if event is None:
+                event = _in_flight[url] = threading.Event()
+                break
+        logger.info(f"Waiting for in-flight download: {url}")
+        if not event.wait(timeout=max(0.0, deadline - time.monotonic())):
+            return f"Failed to download {url}. Error: another download of it is still running"
+        hit, cached_data = cache_get(cache_key, ttl_seconds=3600)
+        if hit:
+            return cached_data
+
+    try:
+        return _download(
+            url, max_bytes or settings.MAX_FILE_SIZE_MB * 1024 * 1024, data_only
+        )
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(url, None)
+        event.set()
+
+
+@tool
+def download_file_tool(url: str) -> str:
+    """Download a file from URL to temp directory.
+
+    Args:
+        url: The URL of the file to download
+
+    Returns:
+        Local file path where file was saved, or error message
+    """
+    return download_file(url)
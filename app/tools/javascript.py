@@ -1,20 +1,29 @@
 """JavaScript execution tool for browser automation."""
 
-import asyncio
 import json
+from typing import Optional
 from langchain_core.tools import tool
 from app.resources.browser import BrowserClient
 from app.utils.logging import logger
 
 
-def create_javascript_tool(browser_client: BrowserClient):
-    """Factory to create a JavaScript tool bound to a browser client."""
+def create_javascript_tool(
+    browser_client: BrowserClient, session_id: Optional[str] = None
+):
+    """Factory to create a JavaScript tool bound to a browser client.
+
+    With a session_id, code runs on the quiz session's live page (the one
+    loaded by fetch_context), so DOM state persists between calls and the
+    page is only reloaded when the URL changes.
+    """
 
     @tool
     async def javascript_tool(code: str, url: str) -> str:
         """
         Executes JavaScript code on the specified web page.
         Use this only when needed to interact with the page directly.
+        The current quiz page is already loaded, and page state persists
+        between calls for the same URL.
 
         Args:
             code: The JavaScript code to execute.
@@ -23,14 +32,19 @@ def create_javascript_tool(browser_client: BrowserClient):
         Returns:
             The result of the JavaScript execution as a string.
         """
-        page = None
         try:
             logger.info(f"Executing JavaScript on: {url}")
-            page = await browser_client.browser.new_page()
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(1)
+            page_cm = (
+                browser_client.session_page(session_id)
+                if session_id
+                else browser_client.acquire_page()
+            )
+            async with page_cm as pooled:
+                page = pooled.page
+                if pooled.loaded_url != url:
+                    await browser_client.load(pooled, url)
 
-            result = await page.evaluate(code)
+                result = await page.evaluate(code)
 
             if result is None:
                 return "JavaScript executed successfully. (No value returned)"
@@ -48,8 +62,5 @@ def create_javascript_tool(browser_client: BrowserClient):
             elif "Cannot read properties" in error_msg or "undefined" in error_msg:
                 error_msg += "\nHint: Element/property may not exist. Check selector."
             return f"JavaScript Error: {error_msg}"
-        finally:
-            if page:
-                await page.close()
 
     return javascript_tool
@@ -0,0 +1,190 @@
+"""Local PDF text and table extraction tool with page-level caching."""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.tools import tool
+from app.config.settings import settings
+from app.utils.cache import get_cache_key, cache_get, cache_set
+from app.utils.helpers import hash_content
+from app.utils.logging import logger
+from app.utils.pdf import extract_pages, get_page_count, parse_page_ranges
+
+PAGE_CACHE_TTL = 7 * 24 * 3600  # pages are keyed by content hash
+PREVIEW_CHARS = 300
+SUMMARY_CHARS = 4000
+
+# Worker processes for large documents, started on first use and reused
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _file_hash(file_path: str) -> str:
+    """Hash file contents so cached pages survive renames and re-downloads."""
+    with open(file_path, "rb") as f:
+        return hash_content(f.read())
+
+
+def _worker_pool() -> ProcessPoolExecutor:
+    """The shared extraction pool, created on first use.
+
+    Starting a worker re-imports the main module, so workers are kept for
+    reuse rather than started per document. They come from the fork server
+    (spawned where unsupported), never from the app process itself, which
+    runs an event loop and threads. The fork server's preload is set by the
+    Python kernels, which share it; extraction itself only needs the light
+    app.utils.pdf.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, min(os.cpu_count() or 1, settings.PDF_MAX_WORKERS)),
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _pool
+
+
+def shutdown_workers() -> None:
+    """Stop the extraction worker processes, if started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def _extract_uncached(file_path: str, indices: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Extract pages, spreading large documents across worker processes."""
+    if len(indices) < settings.PDF_PARALLEL_MIN_PAGES:
+        return dict(zip(indices, extract_pages(file_path, indices)))
+
+    global _pool
+    pool = _worker_pool()
+    workers = min(os.cpu_count() or 1, settings.PDF_MAX_WORKERS, len(indices))
+    chunks = [indices[i::workers] for i in range(workers)]
+    logger.info(f"Extracting {len(indices)} PDF page(s) with {workers} process(es)")
+    try:
+        results = pool.map(extract_pages, [file_path] * len(chunks), chunks)
+        pages = {}
+        for chunk, chunk_pages in zip(chunks, results):
+            pages.update(zip(chunk, chunk_pages))
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); start a fresh pool next time
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
+    return pages
+
+
+def extract_pdf(
+    file_path: str, pages: str = ""
+) -> Tuple[str, Dict[int, Dict[str, Any]]]:
+    """Extract text and tables for the selected pages, using the page cache.
+
+    Returns:
+        Tuple of (file hash, {0-based page index: {'text', 'tables'}}).
+    """
+    file_hash = _file_hash(file_path)
+    indices = parse_page_ranges(pages, get_page_count(file_path))
+
+    result, missing = {}, []
+    for i in indices:
+        hit, cached = cache_get(
+            get_cache_key("pdf_page", file_hash, i), ttl_seconds=PAGE_CACHE_TTL
+        )
+        if hit:
+            result[i] = cached
+        else:
+            missing.append(i)
+    logger.info(f"PDF pages: {len(result)} cached, {len(missing)} to extract")
+
+    if missing:
+        for i, data in _extract_uncached(file_path, missing).items():
+            cache_set(get_cache_key("pdf_page", file_hash, i), data)
+            result[i] = data
+    return file_hash, dict(sorted(result.items()))
+
+
+def _write_outputs(
+    file_path: str, file_hash: str, pages: Dict[int, Dict[str, Any]]
+) -> Tuple[Path, List[Tuple[int, Path]]]:
+    """Write the full text and each table to the temp directory."""
+    stem = f"{Path(file_path).stem}_{file_hash[:12]}"
+    text_path = settings.TEMP_DIR / f"{stem}.txt"
+    text_path.write_text(
+        "\n\n".join(f"=== Page {i + 1} ===\n{p['text']}" for i, p in pages.items()),
+        encoding="utf-8",
+    )
+    table_paths = []
+    for i, page in pages.items():
+        for n, table in enumerate(page["tables"], 1):
+            table_path = settings.TEMP_DIR / f"{stem}_p{i + 1}_table{n}.csv"
+            table_path.write_text(table, encoding="utf-8")
+            table_paths.append((i, table_path))
+    return text_path, table_paths
+
+
+@tool
+def extract_pdf_tool(file_path: str, pages: str = "") -> str:
+    """
+    Extract text and simple tables from a PDF locally (fast, no LLM call).
+
+    Prefer this over call_llm_tool for PDFs. Pages without a text layer
+    (scanned images) still need call_llm_tool.
+
+    Args:
+        file_path: Absolute path to the PDF file
+        pages: Optional 1-based page selection, e.g. "1-3,5". Empty for all pages.
+
+    Returns:
+        Summary with per-page previews, CSV paths for detected tables, and the
+        path of a text file holding the full extracted text.
+    """
+    if not os.path.exists(file_path):
+        return f"Error: File not found: {file_path}"
+    try:
+        file_hash, extracted = extract_pdf(file_path, pages)
+        if not extracted:
+            return f"Error: No pages selected (pages='{pages}')."
+        text_path, table_paths = _write_outputs(file_path, file_hash, extracted)
+    except Exception as e:
+        logger.error(f"PDF extraction failed for {file_path}: {e}")
+        return f"Error extracting PDF: {str(e)}"
+
+    total_chars = sum(len(p["text"]) for p in extracted.values())
+    lines = [
+        f"Extracted {len(extracted)} page(s), {total_chars} characters.",
+        f"Full text: {text_path}",
+    ]
+    if table_paths:
+        lines.append("Tables (CSV):")
+        lines += [f"- page {i + 1}: {path}" for i, path in table_paths]
+
+    empty = [str(i + 1) for i, p in extracted.items() if not p["text"]]
+    if empty:
+        lines.append(
+            f"No text layer on page(s) {', '.join(empty)}; use call_llm_tool for those."
+        )
+
+    lines.append("\nPreview:")
+    budget = SUMMARY_CHARS
+    for i, page in extracted.items():
+        if budget <= 0:
+            lines.append("... (see full text file)")
+            break
+        preview = page["text"][: min(PREVIEW_CHARS, budget)]
+        budget -= len(preview)
+        ellipsis = "..." if len(page["text"]) > len(preview) else ""
+        lines.append(f"--- Page {i + 1} ---\n{preview}{ellipsis}")
+    return "\n".join(lines)
@@ -1,52 +1,44 @@
-"""Python code execution tool with persistent session."""
+"""Python code execution tool with a persistent per-quiz session."""
 
-import sys
-import io
-import traceback
 from langchain_core.tools import tool
-import pandas as pd
-import numpy as np
+from app.resources.kernels import KernelPool
 
-# Global scope for persistent session state
-GLOBAL_SCOPE = {"pd": pd, "np": np, "__builtins__": __builtins__}
 
+def create_python_tool(kernels: KernelPool, session_id: str):
+    """Factory to create a Python tool bound to a quiz session's namespace.
 
-def reset_python_session():
-    """Reset the Python session globals for a new quiz."""
-    global GLOBAL_SCOPE
-    GLOBAL_SCOPE = {"pd": pd, "np": np, "__builtins__": __builtins__}
-
-
-@tool
-def python_tool(code: str):
-    """
-    Args:
-        code: Valid Python code to execute. Must use print() to output results.
+    Code runs in a kernel process from the pool, so CPU-heavy work does not
+    stall the server and runaway code is killed at PYTHON_TIMEOUT.
     """
-    global GLOBAL_SCOPE
-
-    # Capture stdout
-    old_stdout = sys.stdout
-    redirected_output = io.StringIO()
-    sys.stdout = redirected_output
-
-    try:
-        # execute code using the persistent scope
-        exec(code, GLOBAL_SCOPE)
-
-        output = redirected_output.getvalue()
-        return (
-            output.strip()
-            if output.strip()
-            else "Code executed. (No output provided. Did you forget to print?)"
-        )
-    except Exception:
-        error_msg = traceback.format_exc()
+
+    @tool
+    async def python_tool(code: str) -> str:
+        """
+        Runs Python in a persistent session (variables survive between calls).
+        print() shows large DataFrames, Series, and arrays as shape, dtypes,
+        head/tail, and summary statistics. To see everything, call
+        dump(obj) to save it in full to a file (returns the path), or print
+        obj.to_string() for a moderately sized one.
+
+        Args:
+            code: Valid Python code to execute. Must use print() to output results.
+        """
+        ok, output, usage = await kernels.execute(session_id, code)
+        if usage.get("limit") == "busy":
+            return output
+        if ok:
+            return (
+                output.strip()
+                if output.strip()
+                else "Code executed. (No output provided. Did you forget to print?)"
+            )
+
+        error_msg = output
         # Try to give a hint if it's a common error
         if "NameError" in error_msg:
             error_msg += "\nHint: Did you define the variable in a previous step? Remember session is stateful."
         if "ModuleNotFoundError" in error_msg:
             error_msg += "\nHint: The module may not be installed. Try using an alternative or install it via pip."
         return f"Runtime Error:\n{error_msg}. Please fix the code and try again."
-    finally:
-        sys.stdout = old_stdout
+
+    return python_tool
@@ -2,7 +2,10 @@
 
 import base64
 import mimetypes
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Optional
 from openai import OpenAI
 from app.config.settings import settings
 from app.utils.logging import logger
@@ -39,30 +42,65 @@ MIME_TYPE_FALLBACKS = {
 
 
 class GeminiKeyManager:
-    """Round-robin API key rotation for Gemini."""
+    """Round-robin API key rotation for Gemini, skipping keys that recently failed."""
 
     def __init__(self):
         self.keys = [k for k in settings.GEMINI_API_KEYS if k]
         self.current_index = 0
+        self.unhealthy_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
         logger.info(f"Loaded {len(self.keys)} Gemini API key(s)")
 
+    def _is_healthy(self, key: str, now: float) -> bool:
+        """Check whether a key is outside its failure cooldown."""
+        return self.unhealthy_until.get(key, 0) <= now
+
     def get_next_key(self) -> str:
-        """Get next API key in round-robin fashion."""
+        """Get next healthy API key in round-robin fashion.
+
+        Falls back to plain rotation when every key is cooling down.
+        """
         if not self.keys:
             raise ValueError("No Gemini API keys configured")
-        key = self.keys[self.current_index]
-        logger.debug(f"Using Gemini key index: {self.current_index}")
-        self.current_index = (self.current_index + 1) % len(self.keys)
-        return key
+        with self._lock:
+            now = time.time()
+            order = [
+                (self.current_index + i) % len(self.keys) for i in range(len(self.keys))
+            ]
+            index = next(
+                (i for i in order if self._is_healthy(self.keys[i], now)), order[0]
+            )
+            logger.debug(f"Using Gemini key index: {index}")
+            self.current_index = (index + 1) % len(self.keys)
+            return self.keys[index]
+
+    def mark_unhealthy(self, key: str, cooldown: Optional[float] = None) -> None:
+        """Take a key out of rotation for `cooldown` seconds after a failure."""
+        cooldown = (
+            settings.GEMINI_KEY_COOLDOWN_SECONDS if cooldown is None else cooldown
+        )
+        with self._lock:
+            self.unhealthy_until[key] = time.time() + cooldown
+        logger.warning(f"Gemini key marked unhealthy for {cooldown:.0f}s")
+
+    def healthy_count(self) -> int:
+        """Number of keys currently available for requests."""
+        now = time.time()
+        return sum(1 for k in self.keys if self._is_healthy(k, now))
 
 
 gemini_key_manager = GeminiKeyManager()
 
 
-def get_gemini_client() -> OpenAI:
-    """Create Gemini client using OpenAI-compatible API with round-robin key."""
+def get_gemini_client(api_key: Optional[str] = None) -> OpenAI:
+    """Create Gemini client using OpenAI-compatible API.
+
+    Uses the given key, or the next round-robin key when none is provided.
+    """
     return OpenAI(
-        base_url=GEMINI_BASE_URL, api_key=gemini_key_manager.get_next_key(), timeout=30
+        base_url=GEMINI_BASE_URL,
+        api_key=api_key or gemini_key_manager.get_next_key(),
+        timeout=30,
     )
 
 
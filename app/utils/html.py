@@ -0,0 +1,251 @@
+"""HTML heuristics and text extraction for pages fetched without a browser."""
+
+import csv
+import io
+import re
+from pathlib import PurePosixPath
+from typing import Iterable, List, Optional
+from urllib.parse import unquote, urljoin, urlparse
+from bs4 import BeautifulSoup, Tag
+
+MIN_BODY_TEXT = 20  # fewer visible characters than this means content is rendered by JS
+# Script types that never execute
+DATA_SCRIPT_TYPES = {"application/json", "application/ld+json", "text/template"}
+# Names through which inline script code can reach the page, its elements, or
+# output only a browser shows; a script using none of them is DOM-free
+DOM_ACCESS_PATTERN = re.compile(
+    r"\b(?:document|window|self|this|globalThis|parent|top|frames|location|navigator"
+    r"|console|alert|fetch|XMLHttpRequest|localStorage|sessionStorage|jQuery"
+    r"|React|ReactDOM|Vue|createApp|customElements)\b|\$\(|\$\.|\beval\("
+)
+MAX_SCRIPT_CHARS = 4000  # each inline script kept by condense_html
+SPA_ROOT_IDS = ("root", "app", "__next", "__nuxt")
+# Dropped entirely when condensing
+NOISE_TAGS = ["style", "noscript", "template", "svg", "link", "meta"]
+MEDIA_TAGS = ["img", "audio", "video", "source", "iframe", "embed", "object"]
+BLOCK_TAGS = [
+    "p",
+    "div",
+    "section",
+    "article",
+    "header",
+    "footer",
+    "main",
+    "nav",
+    "aside",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "ul",
+    "ol",
+    "li",
+    "dl",
+    "dt",
+    "dd",
+    "blockquote",
+    "form",
+    "fieldset",
+    "label",
+    "figure",
+    "figcaption",
+    "details",
+    "summary",
+]
+
+
+def needs_browser(html: str) -> Optional[str]:
+    """Decide whether a page needs JavaScript rendering.
+
+    Returns:
+        The reason a browser is needed, or None if the static HTML is complete.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup.find_all("script"):
+        script_type = (script.get("type") or "").lower()
+        if script_type in DATA_SCRIPT_TYPES:
+            continue
+        if script.get("src"):
+            return f"external script {script['src']}"
+        if DOM_ACCESS_PATTERN.search(script.string or ""):
+            return "inline script uses the DOM"
+
+    for noscript in soup.find_all("noscript"):
+        if "javascript" in noscript.get_text().lower():
+            return "noscript JavaScript notice"
+
+    for root_id in SPA_ROOT_IDS:
+        root = soup.find(id=root_id)
+        if root is not None and not root.get_text(strip=True):
+            return f"empty #{root_id} mount point"
+
+    if len(html_to_text(soup)) < MIN_BODY_TEXT:
+        return "empty body"
+    return None
+
+
+def html_to_text(html: str | BeautifulSoup) -> str:
+    """Visible body text, approximating the browser's inner_text('body')."""
+    soup = (
+        html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, "html.parser")
+    )
+    body = soup.body or soup
+    for tag in body.find_all(["script", "style", "noscript", "template"]):
+        tag.extract()
+    return body.get_text("\n", strip=True)
+
+
+def extract_data_links(
+    html: str,
+    base_url: str,
+    extensions: Iterable[str],
+    content_types: Iterable[str] = (),
+) -> List[str]:
+    """Absolute URLs of links that look like data files, in page order.
+
+    A link matches on its file extension, or on its `type` attribute (e.g.
+    <a type="text/csv">) when that is one of content_types.
+    """
+    extensions = {e.lower().lstrip(".") for e in extensions}
+    content_types = {t.lower() for t in content_types}
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for tag in soup.find_all(["a", "audio", "video", "source", "embed", "object"]):
+        href = tag.get("href") or tag.get("src") or tag.get("data")
+        if not href:
+            continue
+        url = urljoin(base_url, href.strip()).split("#")[0]
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            continue
+        suffix = PurePosixPath(unquote(parsed.path)).suffix.lower().lstrip(".")
+        link_type = (tag.get("type") or "").split(";")[0].strip().lower()
+        if (suffix in extensions or link_type in content_types) and url not in links:
+            links.append(url)
+    return links
+
+
+def extract_links(html: str, base_url: str) -> List[str]:
+    """Absolute http(s) URLs of all anchors, in page order, without fragments."""
+    links = []
+    for a in BeautifulSoup(html, "html.parser").find_all("a", href=True):
+        url = urljoin(base_url, a["href"].strip()).split("#")[0]
+        if urlparse(url).scheme in ("http", "https") and url not in links:
+            links.append(url)
+    return links
+
+
+def extract_tables(html: str) -> List[str]:
+    """Every HTML table on the page as CSV text."""
+    soup = BeautifulSoup(html, "html.parser")
+    return [csv_text for t in soup.find_all("table") if (csv_text := _table_to_csv(t))]
+
+
+def _table_to_csv(table: Tag) -> str:
+    """Render an HTML table's rows as CSV."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in table.find_all("tr"):
+        cells = row.find_all(["th", "td"])
+        writer.writerow(" ".join(c.get_text(" ", strip=True).split()) for c in cells)
+    return buffer.getvalue().strip()
+
+
+def _describe_form(form: Tag, base_url: str) -> str:
+    """One line per form: method, target, and its fields."""
+    method = (form.get("method") or "GET").upper()
+    action = urljoin(base_url, form.get("action") or "")
+    fields = []
+    for field in form.find_all(["input", "select", "textarea", "button"]):
+        name = field.get("name") or field.get("id")
+        if not name:
+            continue
+        kind = field.get("type") or field.name
+        value = field.get("value")
+        fields.append(f"{name} ({kind}{f'={value!r}' if value else ''})")
+    return f"- {method} {action}: {', '.join(fields) or 'no named fields'}"
+
+
+def condense_html(html: str, base_url: str) -> str:
+    """Condense a page into the parts an LLM needs to answer from it.
+
+    Drops styles and non-content markup, renders tables as CSV, keeps headings
+    and list structure, and lists links, media, forms, and page-building
+    scripts (every inline script, each cut to MAX_SCRIPT_CHARS, plus JSON
+    data scripts) with absolute URLs.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text(strip=True) if soup.title else ""
+
+    scripts, external = [], []
+    for script in soup.find_all("script"):
+        code = (script.string or "").strip()
+        if script.get("src"):
+            external.append(urljoin(base_url, script["src"]))
+        elif len(code) > MAX_SCRIPT_CHARS:
+            cut = len(code) - MAX_SCRIPT_CHARS
+            scripts.append(f"{code[:MAX_SCRIPT_CHARS]}\n... ({cut} more characters)")
+        elif code:
+            scripts.append(code)
+        script.decompose()
+    for tag in soup.find_all(NOISE_TAGS):
+        tag.decompose()
+
+    links = []
+    for a in soup.find_all("a", href=True):
+        href = urljoin(base_url, a["href"])
+        text = " ".join(a.get_text(" ", strip=True).split())
+        if href not in (link for _, link in links):
+            links.append((text, href))
+    media = []
+    for tag in soup.find_all(MEDIA_TAGS):
+        src = tag.get("src") or tag.get("data")
+        if src:
+            alt = tag.get("alt") or tag.get("title") or ""
+            media.append(f"- {tag.name}: {urljoin(base_url, src)} {alt}".rstrip())
+    forms = [_describe_form(form, base_url) for form in soup.find_all("form")]
+
+    for n, table in enumerate(soup.find_all("table"), 1):
+        table.replace_with(f"\n[Table {n}]\n{_table_to_csv(table)}\n")
+    for level in range(1, 7):
+        for heading in soup.find_all(f"h{level}"):
+            heading.insert(0, "#" * level + " ")
+    for item in soup.find_all("li"):
+        item.insert(0, "- ")
+    # Preformatted text keeps its whitespace; swapped back in after collapsing
+    preformatted = []
+    for pre in soup.find_all("pre"):
+        preformatted.append(pre.get_text().strip("\n"))
+        pre.replace_with(f"\n@@PRE{len(preformatted) - 1}@@\n")
+    for field in soup.find_all(["input", "textarea"]):
+        label = field.get("value") or field.get("placeholder")
+        if label and field.get("type") != "hidden":
+            field.replace_with(f"[{field.get('type') or field.name}: {label}]")
+    for br in soup.find_all("br"):
+        br.replace_with("\n")
+    for block in soup.find_all(BLOCK_TAGS):
+        block.insert_before("\n")
+        block.insert_after("\n")
+
+    body = soup.body or soup
+    lines = [" ".join(line.split()) for line in body.get_text().splitlines()]
+    text = "\n".join(line for line in lines if line)
+    for n, block in enumerate(preformatted):
+        text = text.replace(f"@@PRE{n}@@", f"```\n{block}\n```", 1)
+    sections = [f"Title: {title}"] if title else []
+    sections.append(text)
+    if links:
+        sections.append(
+            "Links:\n" + "\n".join(f"- {t or '(no text)'} -> {h}" for t, h in links)
+        )
+    if media:
+        sections.append("Media:\n" + "\n".join(media))
+    if forms:
+        sections.append("Forms:\n" + "\n".join(forms))
+    if scripts:
+        sections.append("Inline scripts:\n" + "\n---\n".join(scripts))
+    if external:
+        sections.append("External scripts:\n" + "\n".join(f"- {u}" for u in external))
+    return "\n\n".join(sections)
@@ -0,0 +1,286 @@
+"""Run simple inline page scripts in an embedded JS engine instead of Chromium.
+
+Many quiz pages only decode or compute a string and write it into an element.
+Such pages are rendered here against a minimal DOM shim. Anything the shim
+does not model (external scripts, network, DOM creation, unknown properties)
+raises, and the caller falls back to the browser.
+"""
+
+import json
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+from app.utils.html import DATA_SCRIPT_TYPES, needs_browser
+from app.utils.logging import logger
+
+try:
+    import quickjs
+except ImportError:  # optional dependency: the "js" extra
+    quickjs = None
+
+JS_SCRIPT_TYPES = {"", "text/javascript", "application/javascript"}
+MEMORY_LIMIT = 64 * 1024 * 1024
+MAX_TIMERS = 100
+
+# Runs before the page scripts. Every object the page can reach is a strict
+# proxy: reading or setting an unmodelled property throws "unsupported: ...".
+DOM_SHIM = r"""
+(function () {
+  var init = JSON.parse(__init);
+  var mutations = {}, writes = [], logs = [], timers = [], listeners = [];
+  var elements = {}, timerSeq = 0;
+
+  function unsupported(what) { throw new Error("unsupported: " + what); }
+  function strict(target, name) {
+    return new Proxy(target, {
+      get: function (t, p) {
+        if (typeof p !== "string" || p in t) return t[p];
+        if (p === "then" || p === "toJSON") return undefined;
+        unsupported(name + "." + p);
+      },
+      set: function (t, p, v) {
+        if (!(p in t)) unsupported("set " + name + "." + p);
+        t[p] = v;
+        return true;
+      }
+    });
+  }
+  function record(id) {
+    return mutations[id] || (mutations[id] = { attrs: {} });
+  }
+  function escapeHtml(s) {
+    return s.replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;");
+  }
+  function stripTags(s) {
+    return s.replace(/<[^>]*>/g, "").replace(/&lt;/g, "<").replace(/&gt;/g, ">")
+      .replace(/&quot;/g, '"').replace(/&#39;/g, "'").replace(/&amp;/g, "&");
+  }
+
+  function makeElement(id, info) {
+    var state = { html: info.html, text: info.text }, attrs = info.attrs;
+    function setHtml(html, text) {
+      state.html = html; state.text = text; record(id).html = html;
+    }
+    var textProp = {
+      get: function () { return state.text; },
+      set: function (v) { v = String(v); setHtml(escapeHtml(v), v); }
+    };
+    var el = {
+      id: info.attrs.id || "", tagName: info.tag.toUpperCase(),
+      style: new Proxy({}, { get: function () { return ""; }, set: function () { return true; } }),
+      getAttribute: function (n) { return n in attrs ? attrs[n] : null; },
+      setAttribute: function (n, v) { attrs[n] = String(v); record(id).attrs[n] = String(v); },
+      hasAttribute: function (n) { return n in attrs; },
+      addEventListener: function () {}
+    };
+    Object.defineProperty(el, "innerHTML", {
+      get: function () { return state.html; },
+      set: function (v) { v = String(v); setHtml(v, stripTags(v)); }
+    });
+    Object.defineProperty(el, "textContent", textProp);
+    Object.defineProperty(el, "innerText", textProp);
+    Object.defineProperty(el, "value", {
+      get: function () { return "value" in attrs ? attrs.value : ""; },
+      set: function (v) { el.setAttribute("value", v); }
+    });
+    return strict(el, "<" + info.tag + (info.attrs.id ? "#" + info.attrs.id : "") + ">");
+  }
+  function lookup(id) {
+    if (!(id in init.elements)) return null;
+    return elements[id] || (elements[id] = makeElement(id, init.elements[id]));
+  }
+
+  var B64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/";
+  globalThis.atob = function (s) {
+    s = String(s).replace(/[\s=]/g, "");
+    var out = "", bits = 0, value = 0;
+    for (var i = 0; i < s.length; i++) {
+      var idx = B64.indexOf(s.charAt(i));
+      if (idx < 0) throw new Error("InvalidCharacterError");
+      value = (value << 6) | idx; bits += 6;
+      if (bits >= 8) { bits -= 8; out += String.fromCharCode((value >> bits) & 255); }
+    }
+    return out;
+  };
+  globalThis.btoa = function (s) {
+    s = String(s);
+    var out = "";
+    for (var i = 0; i < s.length; i += 3) {
+      var a = s.charCodeAt(i), b = s.charCodeAt(i + 1), c = s.charCodeAt(i + 2);
+      if (a > 255 || b > 255 || c > 255) throw new Error("InvalidCharacterError");
+      var n = (a << 16) | ((b || 0) << 8) | (c || 0);
+      out += B64.charAt(n >> 18) + B64.charAt((n >> 12) & 63) +
+        (i + 1 < s.length ? B64.charAt((n >> 6) & 63) : "=") +
+        (i + 2 < s.length ? B64.charAt(n & 63) : "=");
+    }
+    return out;
+  };
+
+  function logger(type) {
+    return function () {
+      for (var i = 0; i < arguments.length; i++) {
+        var v = arguments[i];
+        logs.push("[" + type + "] " + (v === undefined ? "undefined" : JSON.stringify(v, null, 2)));
+      }
+    };
+  }
+  globalThis.console = strict({
+    log: logger("log"), info: logger("info"), warn: logger("warning"),
+    error: logger("error"), debug: logger("debug")
+  }, "console");
+
+  globalThis.setTimeout = function (fn, ms) {
+    if (typeof fn !== "function") unsupported("setTimeout(string)");
+    timers.push({ fn: fn, ms: ms || 0, seq: ++timerSeq });
+    return timerSeq;
+  };
+  globalThis.clearTimeout = function (id) {
+    timers = timers.filter(function (t) { return t.seq !== id; });
+  };
+
+  var loc = init.location;
+  loc.toString = function () { return loc.href; };
+  globalThis.location = strict(loc, "location");
+  globalThis.window = globalThis;
+  globalThis.self = globalThis;
+  globalThis.document = strict({
+    title: init.title,
+    readyState: "loading",
+    body: lookup("__body__"),
+    getElementById: function (id) { return lookup(String(id)); },
+    querySelector: function (sel) {
+      var m = /^\s*#([\w-]+)\s*$/.exec(sel);
+      if (!m) unsupported("querySelector(" + sel + ")");
+      return lookup(m[1]);
+    },
+    write: function () {
+      writes.push([__script, Array.prototype.join.call(arguments, "")]);
+    },
+    writeln: function () {
+      writes.push([__script, Array.prototype.join.call(arguments, "") + "\n"]);
+    },
+    addEventListener: function (type, fn) {
+      if (type !== "DOMContentLoaded" && type !== "load") {
+        unsupported("document.addEventListener(" + type + ")");
+      }
+      listeners.push(fn);
+    }
+  }, "document");
+
+  globalThis.__finish = function () {
+    document.readyState = "complete";
+    listeners.forEach(function (fn) { fn({ type: "DOMContentLoaded" }); });
+    if (typeof globalThis.onload === "function") globalThis.onload({ type: "load" });
+    for (var n = 0; timers.length; n++) {
+      if (n >= __maxTimers) unsupported("too many timers");
+      timers.sort(function (a, b) { return a.ms - b.ms || a.seq - b.seq; });
+      timers.shift().fn();
+    }
+    return JSON.stringify({ mutations: mutations, writes: writes, logs: logs });
+  };
+})();
+"""
+
+
+def _init_state(soup: BeautifulSoup, url: str) -> dict:
+    """Elements addressable by id (plus body) and location for the shim."""
+    parsed = urlparse(url)
+    elements = {
+        tag["id"]: {
+            "tag": tag.name,
+            "html": tag.decode_contents(),
+            "text": tag.get_text(),
+            "attrs": {
+                k: " ".join(v) if isinstance(v, list) else v
+                for k, v in tag.attrs.items()
+            },
+        }
+        for tag in soup.find_all(id=True)
+    }
+    if soup.body:
+        elements["__body__"] = {
+            "tag": "body",
+            "html": soup.body.decode_contents(),
+            "text": soup.body.get_text(),
+            "attrs": {},
+        }
+    return {
+        "elements": elements,
+        "title": soup.title.get_text() if soup.title else "",
+        "location": {
+            "href": url,
+            "protocol": f"{parsed.scheme}:",
+            "host": parsed.netloc,
+            "hostname": parsed.hostname or "",
+            "port": str(parsed.port or ""),
+            "pathname": parsed.path or "/",
+            "search": f"?{parsed.query}" if parsed.query else "",
+            "hash": f"#{parsed.fragment}" if parsed.fragment else "",
+            "origin": f"{parsed.scheme}://{parsed.netloc}",
+        },
+    }
+
+
+def _apply(soup: BeautifulSoup, scripts: list, result: dict) -> None:
+    """Write the shim's DOM changes back into the parsed page."""
+    for index, html in reversed(result["writes"]):
+        scripts[index].insert_after(BeautifulSoup(html, "html.parser"))
+    for element_id, change in result["mutations"].items():
+        element = soup.body if element_id == "__body__" else soup.find(id=element_id)
+        if element is None:
+            continue
+        if "html" in change:
+            element.clear()
+            element.append(BeautifulSoup(change["html"], "html.parser"))
+        for name, value in change["attrs"].items():
+            element[name] = value
+
+
+def render_inline_scripts(
+    html: str, url: str, timeout: float = 1.0
+) -> Optional[Tuple[str, List[str]]]:
+    """Render a page whose only scripts are simple inline ones.
+
+    Returns:
+        Tuple of (rendered HTML, console logs), or None if the engine is not
+        installed, the page uses something the shim does not model, or the
+        rendered page still looks incomplete.
+    """
+    if quickjs is None:
+        return None
+    soup = BeautifulSoup(html, "html.parser")
+    scripts = []
+    for script in soup.find_all("script"):
+        script_type = (script.get("type") or "").lower()
+        if script_type in DATA_SCRIPT_TYPES:
+            continue
+        if script.get("src") or script_type not in JS_SCRIPT_TYPES:
+            return None
+        scripts.append(script)
+
+    try:
+        context = quickjs.Context()
+        context.set_time_limit(timeout)
+        context.set_memory_limit(MEMORY_LIMIT)
+        init = json.dumps(_init_state(soup, url))
+        context.eval(f"var __init = {json.dumps(init)}, __script = 0;")
+        context.eval(f"var __maxTimers = {MAX_TIMERS};")
+        context.eval(DOM_SHIM)
+        for index, script in enumerate(scripts):
+            context.eval(f"__script = {index};")
+            context.eval(script.string or "")
+        result = json.loads(context.eval("__finish()"))
+    except Exception as e:
+        logger.debug(f"JS engine could not render {url}: {e}")
+        return None
+
+    _apply(soup, scripts, result)
+    rendered = str(soup)
+
+    # Complete if the page no longer needs a browser once scripts have run
+    check = BeautifulSoup(rendered, "html.parser")
+    for tag in check.find_all(["script", "noscript"]):
+        tag.decompose()
+    if needs_browser(str(check)):
+        return None
+    return rendered, result["logs"]
@@ -0,0 +1,279 @@
+"""Local audio splitting and video keyframe sampling for chunked media analysis."""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import wave
+from pathlib import Path
+from typing import List, Optional, Tuple
+import cv2
+from app.config.settings import settings
+from app.utils.gemini import get_mime_type
+from app.utils.logging import logger
+
+# (start_seconds, end_seconds, file paths belonging to the segment)
+Segment = Tuple[float, float, List[str]]
+
+FRAME_MAX_WIDTH = 768
+# A final segment shorter than this fraction of a segment joins the one before
+MIN_TAIL_FRACTION = 0.25
+MIN_SEGMENT_SECONDS = 5  # shorter pieces are not worth a separate call
+SEGMENT_SIZE_MARGIN = 0.95  # share of MAX_FILE_SIZE_MB a segment may fill
+
+
+def get_media_kind(file_path: str) -> Optional[str]:
+    """Return 'audio' or 'video' based on MIME type, else None."""
+    kind = get_mime_type(file_path).split("/")[0]
+    return kind if kind in ("audio", "video") else None
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as MM:SS."""
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def _segment_bounds(
+    duration: float, segment_seconds: float, overlap_seconds: float
+) -> List[Tuple[float, float]]:
+    """Compute (start, end) windows covering duration, each overlapping the previous.
+
+    A short remainder is folded into the last window rather than becoming a
+    near-empty segment of its own.
+    """
+    bounds = []
+    start = 0.0
+    while duration - (start + segment_seconds) >= segment_seconds * MIN_TAIL_FRACTION:
+        bounds.append((start, start + segment_seconds + overlap_seconds))
+        start += segment_seconds
+    bounds.append((start, duration))
+    return bounds
+
+
+def _temp_path(file_path: str, label: str, suffix: str) -> str:
+    """Create a uniquely named empty file in TEMP_DIR for a piece of file_path."""
+    out_dir = Path(settings.TEMP_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(
+        prefix=f"{Path(file_path).stem}_{label}_", suffix=suffix, dir=out_dir
+    )
+    os.close(fd)
+    return path
+
+
+def get_audio_duration(file_path: str) -> Optional[float]:
+    """Get audio duration in seconds (WAV natively, other formats via ffprobe)."""
+    if Path(file_path).suffix.lower() == ".wav":
+        try:
+            with wave.open(file_path, "rb") as wav:
+                return wav.getnframes() / wav.getframerate()
+        except (wave.Error, EOFError) as e:
+            logger.warning(f"Could not read WAV header: {e}")
+    if not shutil.which("ffprobe"):
+        return None
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration"]
+            + ["-of", "json", file_path],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        return float(json.loads(result.stdout)["format"]["duration"])
+    except Exception as e:
+        logger.warning(f"ffprobe failed for {file_path}: {e}")
+        return None
+
+
+def _split_wav(file_path: str, bounds: List[Tuple[float, float]]) -> List[Segment]:
+    """Split a WAV file into segments using the standard library."""
+    segments = []
+    with wave.open(file_path, "rb") as wav:
+        params = wav.getparams()
+        for i, (start, end) in enumerate(bounds):
+            wav.setpos(int(start * params.framerate))
+            frames = wav.readframes(int((end - start) * params.framerate))
+            out_path = _temp_path(file_path, f"seg{i:03d}", ".wav")
+            with wave.open(out_path, "wb") as out:
+                out.setparams(params)
+                out.writeframes(frames)
+            segments.append((start, end, [out_path]))
+    return segments
+
+
+def _split_ffmpeg(file_path: str, bounds: List[Tuple[float, float]]) -> List[Segment]:
+    """Split any audio format with ffmpeg stream copy (no re-encoding)."""
+    segments = []
+    suffix = Path(file_path).suffix
+    for i, (start, end) in enumerate(bounds):
+        out_path = _temp_path(file_path, f"seg{i:03d}", suffix)
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-y", "-ss", f"{start:.3f}"]
+            + ["-t", f"{end - start:.3f}", "-i", file_path, "-c", "copy", out_path],
+            check=True,
+            capture_output=True,
+            timeout=120,
+        )
+        segments.append((start, end, [out_path]))
+    return segments
+
+
+def _extract_audio(file_path: str, start: float, end: float) -> Optional[str]:
+    """Cut the audio track of a video span to a small mono MP3 with ffmpeg.
+
+    Returns None if ffmpeg is missing or the video has no audio track.
+    """
+    if not shutil.which("ffmpeg"):
+        return None
+    out_path = _temp_path(file_path, f"audio{int(start * 1000):08d}", ".mp3")
+    try:
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-y", "-ss", f"{start:.3f}"]
+            + ["-t", f"{end - start:.3f}", "-i", file_path, "-vn"]
+            + ["-ac", "1", "-b:a", "32k", out_path],
+            check=True,
+            capture_output=True,
+            timeout=120,
+        )
+    except Exception as e:
+        logger.debug(f"No audio extracted from {file_path}: {e}")
+        Path(out_path).unlink(missing_ok=True)
+        return None
+    return out_path
+
+
+def _segment_seconds(file_path: str, duration: float) -> float:
+    """Segment length that keeps every segment within MAX_FILE_SIZE_MB.
+
+    Segments are cut without re-encoding, so they keep the source's byte
+    rate; high sample rates or stereo can need segments shorter than
+    MEDIA_SEGMENT_SECONDS. Leaves room for the overlap, for a merged short
+    tail, and for headers.
+    """
+    byte_rate = os.path.getsize(file_path) / duration
+    fits = SEGMENT_SIZE_MARGIN * settings.MAX_FILE_SIZE_MB * 1024 * 1024 / byte_rate
+    return min(
+        settings.MEDIA_SEGMENT_SECONDS,
+        fits - settings.MEDIA_SEGMENT_OVERLAP_SECONDS,
+        fits / (1 + MIN_TAIL_FRACTION),
+    )
+
+
+def split_audio(file_path: str) -> Optional[List[Segment]]:
+    """Split audio into overlapping segments, each within MAX_FILE_SIZE_MB.
+
+    Returns:
+        Ordered list of segments, or None if the file cannot be split locally
+        (unknown duration, no ffmpeg for non-WAV input, or too short to split).
+    """
+    duration = get_audio_duration(file_path)
+    if not duration:
+        return None
+    segment_seconds = _segment_seconds(file_path, duration)
+    if duration <= segment_seconds:
+        return None
+    if segment_seconds < min(MIN_SEGMENT_SECONDS, settings.MEDIA_SEGMENT_SECONDS):
+        logger.warning(f"Audio byte rate too high to split within limits: {file_path}")
+        return None
+
+    bounds = _segment_bounds(
+        duration, segment_seconds, settings.MEDIA_SEGMENT_OVERLAP_SECONDS
+    )
+    if len(bounds) < 2:
+        return None
+    try:
+        if Path(file_path).suffix.lower() == ".wav":
+            segments = _split_wav(file_path, bounds)
+        elif shutil.which("ffmpeg"):
+            segments = _split_ffmpeg(file_path, bounds)
+        else:
+            return None
+    except Exception as e:
+        logger.warning(f"Audio split failed for {file_path}: {e}")
+        return None
+
+    logger.info(f"Split audio ({duration:.0f}s) into {len(segments)} segment(s)")
+    return segments
+
+
+def get_video_duration(file_path: str) -> Optional[float]:
+    """Get video duration in seconds from container metadata."""
+    capture = cv2.VideoCapture(file_path)
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) if capture.isOpened() else 0
+        frame_count = capture.get(cv2.CAP_PROP_FRAME_COUNT) if fps else 0
+        return frame_count / fps if fps > 0 and frame_count > 0 else None
+    finally:
+        capture.release()
+
+
+def sample_video_keyframes(file_path: str) -> Optional[List[Segment]]:
+    """Sample JPEG keyframes at a fixed interval and group them into segments.
+
+    Each segment also gets the video's audio for the same span (an MP3 after
+    its frames) when ffmpeg is available and the video has sound.
+
+    Returns:
+        Ordered list of segments (each a batch of frame paths), or None if the
+        video cannot be read.
+    """
+    capture = cv2.VideoCapture(file_path)
+    try:
+        if not capture.isOpened():
+            return None
+        fps = capture.get(cv2.CAP_PROP_FPS) or 0
+        frame_count = capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+        if fps <= 0 or frame_count <= 0:
+            return None
+        duration = frame_count / fps
+
+        interval = max(
+            settings.VIDEO_KEYFRAME_INTERVAL_SECONDS,
+            duration / settings.VIDEO_MAX_FRAMES,
+        )
+        frames: List[Tuple[float, str]] = []
+        timestamp = 0.0
+        while timestamp < duration:
+            capture.set(cv2.CAP_PROP_POS_MSEC, timestamp * 1000)
+            ok, frame = capture.read()
+            if not ok:
+                break
+            height, width = frame.shape[:2]
+            if width > FRAME_MAX_WIDTH:
+                scale = FRAME_MAX_WIDTH / width
+                frame = cv2.resize(frame, (FRAME_MAX_WIDTH, int(height * scale)))
+            out_path = _temp_path(file_path, f"t{int(timestamp * 1000):08d}", ".jpg")
+            cv2.imwrite(out_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+            frames.append((timestamp, out_path))
+            timestamp += interval
+    finally:
+        capture.release()
+
+    if not frames:
+        return None
+
+    size = settings.VIDEO_FRAMES_PER_SEGMENT
+    starts = list(range(0, len(frames), size))
+    if len(starts) > 1 and len(frames) - starts[-1] < size * MIN_TAIL_FRACTION:
+        starts.pop()  # fold a short final batch into the one before
+    segments = []
+    has_audio = True  # until extraction fails (no ffmpeg or no audio track)
+    for n, i in enumerate(starts):
+        stop = starts[n + 1] if n + 1 < len(starts) else len(frames)
+        start = frames[i][0]
+        end = frames[stop][0] if stop < len(frames) else duration
+        paths = [path for _, path in frames[i:stop]]
+        if has_audio:
+            audio = _extract_audio(file_path, start, end)
+            has_audio = audio is not None
+            if audio:
+                paths.append(audio)
+        segments.append((start, end, paths))
+
+    logger.info(
+        f"Sampled {len(frames)} keyframe(s) from video ({duration:.0f}s) "
+        f"into {len(segments)} segment(s)" + (" with audio" if has_audio else "")
+    )
+    return segments
@@ -0,0 +1,80 @@
+"""PDF page text and simple table extraction (kept light for worker processes)."""
+
+import csv
+import io
+import re
+from typing import Any, Dict, List
+from pypdf import PdfReader
+
+# Cells in layout-mode text are separated by runs of 2+ spaces or tabs
+CELL_SPLIT = re.compile(r"\s{2,}|\t")
+MIN_TABLE_ROWS = 3
+
+
+def parse_page_ranges(spec: str, page_count: int) -> List[int]:
+    """Parse a 1-based page spec like '1-3,5' into sorted 0-based indices.
+
+    An empty spec selects every page. Out-of-range pages are ignored.
+    """
+    if not spec or not spec.strip():
+        return list(range(page_count))
+    indices = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+            indices.update(range(start - 1, end))
+        else:
+            indices.add(int(part) - 1)
+    return sorted(i for i in indices if 0 <= i < page_count)
+
+
+def detect_tables(layout_text: str) -> List[List[List[str]]]:
+    """Find runs of consecutive lines that split into the same number of columns.
+
+    Blank lines (layout mode's line spacing) do not break a run.
+    """
+    tables, run = [], []
+    lines = [line.strip() for line in layout_text.splitlines() if line.strip()]
+    for line in lines + [""]:
+        cells = [c for c in CELL_SPLIT.split(line) if c]
+        if len(cells) >= 2 and (not run or len(cells) == len(run[0])):
+            run.append(cells)
+            continue
+        if len(run) >= MIN_TABLE_ROWS:
+            tables.append(run)
+        run = [cells] if len(cells) >= 2 else []
+    return tables
+
+
+def table_to_csv(rows: List[List[str]]) -> str:
+    """Render table rows as CSV text."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+def _extract_page(page) -> Dict[str, Any]:
+    """Extract compact text and tables from a single page."""
+    try:
+        layout = page.extract_text(extraction_mode="layout")
+    except Exception:
+        layout = page.extract_text() or ""
+    lines = (" ".join(line.split()) for line in layout.splitlines())
+    return {
+        "text": "\n".join(line for line in lines if line),
+        "tables": [table_to_csv(rows) for rows in detect_tables(layout)],
+    }
+
+
+def extract_pages(file_path: str, indices: List[int]) -> List[Dict[str, Any]]:
+    """Extract the given 0-based pages. Safe to run in a worker process."""
+    reader = PdfReader(file_path)
+    return [_extract_page(reader.pages[i]) for i in indices]
+
+
+def get_page_count(file_path: str) -> int:
+    """Return the number of pages in a PDF."""
+    return len(PdfReader(file_path).pages)
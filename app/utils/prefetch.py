@@ -0,0 +1,54 @@
+"""Background prefetch of data files linked from the quiz page."""
+
+import asyncio
+from typing import Iterable, List, Set
+from app.config.settings import settings
+from app.tools.download import download_file
+from app.utils.html import extract_data_links
+from app.utils.logging import logger
+
+# Keep references so running prefetch tasks are not garbage collected
+_tasks: Set[asyncio.Task] = set()
+
+
+async def _prefetch(urls: List[str]) -> None:
+    semaphore = asyncio.Semaphore(max(1, settings.PREFETCH_CONCURRENCY))
+    max_bytes = settings.PREFETCH_MAX_FILE_MB * 1024 * 1024
+
+    async def fetch_one(url: str) -> None:
+        async with semaphore:
+            result = await asyncio.to_thread(
+                download_file, url, max_bytes=max_bytes, data_only=True
+            )
+            logger.debug(f"Prefetch {url}: {result}")
+
+    await asyncio.gather(*(fetch_one(url) for url in urls), return_exceptions=True)
+
+
+def start_prefetch(html: str, base_url: str, skip: Iterable[str] = ()) -> List[str]:
+    """Start background downloads of data links found in html.
+
+    Files land in the download cache, so later download_file_tool calls for
+    the same URLs return immediately (or wait for the in-flight download).
+
+    Args:
+        html: Page HTML.
+        base_url: URL the page was loaded from, for resolving relative links.
+        skip: URLs that are already available locally.
+
+    Returns:
+        The URLs being prefetched.
+    """
+    if not settings.PREFETCH_ENABLED:
+        return []
+    skip = set(skip)
+    links = extract_data_links(
+        html, base_url, settings.PREFETCH_EXTENSIONS, settings.RESPONSE_CAPTURE_TYPES
+    )
+    urls = [url for url in links if url not in skip][: settings.PREFETCH_MAX_FILES]
+    if urls:
+        logger.info(f"Prefetching {len(urls)} linked file(s)")
+        task = asyncio.create_task(_prefetch(urls))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+    return urls
@@ -0,0 +1,160 @@
+"""Token counting and context budgeting for agent messages."""
+
+import json
+import math
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+from app.config.settings import settings
+from app.utils.logging import logger
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+CHARS_PER_TOKEN = 4  # estimate when no tokenizer is available
+MESSAGE_OVERHEAD_TOKENS = 4  # role and separators per message
+IMAGE_TOKENS = 1000  # rough cost of one downscaled inline image
+# Non-OpenAI models have no tiktoken mapping; their tokenizers are similar
+FALLBACK_ENCODING = "o200k_base"
+TRUNCATION_MARKER = "\n... [truncated to fit the context budget]"
+ENCODER_RETRY_SECONDS = 300  # wait before retrying a tokenizer that failed to load
+
+# Model -> loaded tokenizer. Failures are not cached, only retried later.
+_encoders: Dict[str, Any] = {}
+_encoder_failed_at: Dict[str, float] = {}
+
+
+def get_encoder(model: str):
+    """Tokenizer for a model, or None to estimate tokens from characters.
+
+    Encoding files are downloaded on first use, so a failed load (e.g. the
+    network was down) is retried after ENCODER_RETRY_SECONDS.
+    """
+    if tiktoken is None:
+        return None
+    if model in _encoders:
+        return _encoders[model]
+    if (
+        time.monotonic() - _encoder_failed_at.get(model, -math.inf)
+        < ENCODER_RETRY_SECONDS
+    ):
+        return None
+    try:
+        try:
+            encoder = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoder = tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, estimating from characters: {e}")
+        _encoder_failed_at[model] = time.monotonic()
+        return None
+    _encoders[model] = encoder
+    _encoder_failed_at.pop(model, None)
+    return encoder
+
+
+def _encode(text: str, model: Optional[str]):
+    encoder = get_encoder(model or settings.LLM_MODEL)
+    return encoder, encoder.encode(text, disallowed_special=()) if encoder else None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Number of tokens in text for the model (LLM_MODEL by default)."""
+    _, tokens = _encode(text, model)
+    return len(tokens) if tokens is not None else math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Cut text to at most max_tokens, marking the cut."""
+    encoder, tokens = _encode(text, model)
+    size = len(tokens) if tokens is not None else math.ceil(len(text) / CHARS_PER_TOKEN)
+    if size <= max_tokens:
+        return text
+    keep = max(0, max_tokens - count_tokens(TRUNCATION_MARKER, model))
+    head = encoder.decode(tokens[:keep]) if encoder else text[: keep * CHARS_PER_TOKEN]
+    return head + TRUNCATION_MARKER
+
+
+def _content_tokens(content: Any, model: Optional[str]) -> int:
+    if isinstance(content, str):
+        return count_tokens(content, model)
+    if isinstance(content, list):
+        total = 0
+        for part in content:
+            if isinstance(part, str):
+                total += count_tokens(part, model)
+            elif isinstance(part, dict) and part.get("type") == "text":
+                total += count_tokens(part.get("text", ""), model)
+            elif isinstance(part, dict):
+                total += IMAGE_TOKENS
+        return total
+    return 0
+
+
+def count_message_tokens(messages: Sequence[Any], model: Optional[str] = None) -> int:
+    """Tokens used by a conversation's message contents and tool calls."""
+    total = 0
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS
+        total += _content_tokens(getattr(message, "content", ""), model)
+        tool_calls = getattr(message, "tool_calls", None)
+        if isinstance(tool_calls, list) and tool_calls:
+            total += count_tokens(json.dumps(tool_calls, default=str), model)
+    return total
+
+
+def available_tokens(messages: Sequence[Any]) -> int:
+    """Tokens left for new content after the conversation so far."""
+    limit = settings.LLM_CONTEXT_TOKENS - settings.LLM_RESPONSE_RESERVE_TOKENS
+    return max(0, limit - count_message_tokens(messages))
+
+
+def allocate(
+    budget: int, needs: Dict[str, int], weights: Dict[str, int]
+) -> Dict[str, int]:
+    """Split a token budget among sections in proportion to their weights.
+
+    A section needing less than its share keeps only what it needs, and the
+    rest is shared among the others.
+    """
+    allocation, remaining, open_sections = {}, budget, set(needs)
+    while open_sections:
+        total_weight = sum(weights[name] for name in open_sections) or 1
+        shares = {
+            name: remaining * weights[name] / total_weight for name in open_sections
+        }
+        satisfied = [name for name in open_sections if needs[name] <= shares[name]]
+        if not satisfied:
+            allocation.update({name: int(shares[name]) for name in open_sections})
+            break
+        for name in satisfied:
+            allocation[name] = needs[name]
+            remaining -= needs[name]
+            open_sections.remove(name)
+    return allocation
+
+
+def fit_sections(
+    sections: Dict[str, Tuple[str, int]], budget: int
+) -> Tuple[Dict[str, str], Dict[str, Dict[str, int]]]:
+    """Truncate weighted text sections so together they fit the budget.
+
+    Args:
+        sections: Name -> (text, priority weight).
+        budget: Total tokens available for all sections.
+
+    Returns:
+        Tuple of (name -> fitted text, name -> {'tokens', 'needed'} usage).
+    """
+    needs = {name: count_tokens(text) for name, (text, _) in sections.items()}
+    weights = {name: weight for name, (_, weight) in sections.items()}
+    allocation = allocate(max(0, budget), needs, weights)
+    fitted, usage = {}, {}
+    for name, (text, _) in sections.items():
+        fitted[name] = truncate_to_tokens(text, allocation[name])
+        usage[name] = {
+            "tokens": min(needs[name], allocation[name]),
+            "needed": needs[name],
+        }
+    return fitted, usage
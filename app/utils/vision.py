@@ -0,0 +1,114 @@
+"""Local image processing: QR/barcode decoding and compact image encoding."""
+
+import base64
+import io
+from typing import Dict, List, Optional
+import cv2
+import numpy as np
+from PIL import Image
+from app.utils.logging import logger
+
+try:
+    from pyzbar import pyzbar
+except ImportError:  # zbar shared library is not installed
+    pyzbar = None
+
+TALL_ASPECT = 4  # tall images keep at most this many widths of height
+MIN_WIDTH = 400  # pixels; narrower images are cropped, not shrunk
+
+
+def _decode_pyzbar(image: np.ndarray) -> List[Dict[str, str]]:
+    """Decode QR codes and 1D/2D barcodes with zbar."""
+    if pyzbar is None:
+        return []
+    return [
+        {"type": symbol.type, "data": symbol.data.decode("utf-8", errors="replace")}
+        for symbol in pyzbar.decode(image)
+    ]
+
+
+def _decode_cv2(image: np.ndarray) -> List[Dict[str, str]]:
+    """Decode QR codes and barcodes with OpenCV's built-in detectors."""
+    results = []
+    ok, decoded, *_ = cv2.QRCodeDetector().detectAndDecodeMulti(image)
+    if ok:
+        results += [{"type": "QRCODE", "data": d} for d in decoded if d]
+    if hasattr(cv2, "barcode"):
+        ok, decoded, *_ = cv2.barcode.BarcodeDetector().detectAndDecodeMulti(image)
+        if ok:
+            results += [{"type": "BARCODE", "data": d} for d in decoded if d]
+    return results
+
+
+def decode_codes(file_path: str) -> List[Dict[str, str]]:
+    """Decode all QR codes and barcodes in an image.
+
+    Tries zbar first and falls back to OpenCV, also retrying on a grayscale,
+    upscaled copy for small or low-contrast codes.
+
+    Returns:
+        List of dicts with 'type' and 'data', empty if nothing was found.
+    """
+    image = cv2.imread(file_path)
+    if image is None:
+        return []
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    upscaled = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+    for candidate in (image, upscaled):
+        for decoder in (_decode_pyzbar, _decode_cv2):
+            try:
+                if results := decoder(candidate):
+                    logger.info(f"Decoded {len(results)} code(s) locally")
+                    return results
+            except Exception as e:
+                logger.debug(f"{decoder.__name__} failed: {e}")
+    return []
+
+
+def format_decoded_codes(codes: List[Dict[str, str]]) -> str:
+    """Format decoded codes as a tool response."""
+    lines = [f"- {c['type']}: {c['data']}" for c in codes]
+    return "Decoded locally from the image:\n" + "\n".join(lines)
+
+
+def image_to_data_uri(file_path: str, max_width: int, max_bytes: int) -> Optional[str]:
+    """Downscale an image and encode it as a JPEG data URI within a byte budget.
+
+    The image is scaled to max_width, and tall images (full-page screenshots)
+    are cropped to the top TALL_ASPECT widths of the page, so text stays
+    readable. To fit the budget, JPEG quality is lowered first, then more of
+    the bottom is cropped, and only then is the image shrunk (not below
+    MIN_WIDTH).
+
+    Returns:
+        Data URI string, or None if the image cannot fit the budget.
+    """
+    try:
+        image = Image.open(file_path).convert("RGB")
+    except Exception as e:
+        logger.warning(f"Could not open image {file_path}: {e}")
+        return None
+
+    if image.height > image.width * TALL_ASPECT:
+        logger.debug(f"Cropping tall image ({image.height}px) to its top")
+        image = image.crop((0, 0, image.width, image.width * TALL_ASPECT))
+    if image.width > max_width:
+        image = image.resize(
+            (max_width, max(1, round(image.height * max_width / image.width)))
+        )
+    min_width = min(MIN_WIDTH, image.width)
+    while True:
+        for quality in (85, 70, 55, 40):
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality, optimize=True)
+            if buffer.tell() <= max_bytes:
+                encoded = base64.b64encode(buffer.getvalue()).decode("utf-8")
+                return f"data:image/jpeg;base64,{encoded}"
+        if image.height > image.width:
+            height = max(image.width, int(image.height * 0.75))
+            image = image.crop((0, 0, image.width, height))
+        elif int(image.width * 0.75) >= min_width:
+            image = image.resize((int(image.width * 0.75), int(image.height * 0.75)))
+        else:
+            return None
@@ -3,6 +3,7 @@
 import asyncio
 import hmac
 import time
+import uuid
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
@@ -16,9 +17,12 @@ from app.graph.graph import create_quiz_graph
 from app.graph.resources import GlobalResources
 from app.graph.state import QuizState
 from app.tools.call_llm import call_llm_tool, call_llm_with_multiple_files_tool
+from app.tools.capture import create_capture_tool
+from app.tools.crawl import create_crawl_tool
 from app.tools.download import download_file_tool
 from app.tools.javascript import create_javascript_tool
-from app.tools.python import python_tool
+from app.tools.pdf import extract_pdf_tool
+from app.tools.python import create_python_tool
 from app.tools.submit_answer import submit_answer_tool
 from app.utils.helpers import cleanup_temp_files, setup_temp_directory
 from app.utils.logging import logger
@@ -95,6 +99,12 @@ async def health_check():
     return HealthResponse(status="ok", message="Quiz Solver is running")
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for shared resources (browser pool, etc.)."""
+    return app.state.resources.stats()
+
+
 @app.post("/quiz")
 async def receive_quiz(request: QuizRequest, background_tasks: BackgroundTasks):
     """
@@ -136,11 +146,13 @@ async def _solve_quiz_task(
     email: str, secret: str, url: str, resources: GlobalResources
 ):
     """Background task to solve quiz using LangGraph workflow."""
+    session_id = uuid.uuid4().hex
     try:
         initial_state: QuizState = {
             "email": email,
             "secret": secret,
             "current_url": url,
+            "session_id": session_id,
             "answer_payload": None,
             "attempt_count": 0,
             "resources": resources,
@@ -155,10 +167,13 @@ async def _solve_quiz_task(
             "submission_result": {},
             "submitted_answers": [],
             "tools": [
-                python_tool,
+                create_python_tool(resources.kernels, session_id),
                 submit_answer_tool,
-                create_javascript_tool(resources.browser),
+                create_javascript_tool(resources.browser, session_id),
+                create_capture_tool(resources.browser, session_id),
+                create_crawl_tool(resources.browser),
                 download_file_tool,
+                extract_pdf_tool,
                 call_llm_tool,
                 call_llm_with_multiple_files_tool,
             ],
@@ -178,6 +193,14 @@ async def _solve_quiz_task(
     except Exception as e:
         logger.error(f"Quiz error: {e}")
     finally:
+        try:
+            await resources.browser.release_session(session_id)
+        except Exception as e:
+            logger.error(f"Failed to release browser session: {e}")
+        try:
+            await resources.kernels.release(session_id)
+        except Exception as e:
+            logger.error(f"Failed to release Python session: {e}")
         cleanup_temp_files()
         logger.info(f"Background task finished for {email}")
 
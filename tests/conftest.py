@@ -142,6 +142,7 @@ def sample_quiz_state(mock_global_resources):
         "email": "test@example.com",
         "secret": "test-secret",
         "current_url": "http://example.com/quiz",
+        "session_id": "test-session",
         "answer_payload": None,
         "start_time": time.time(),
         "is_complete": False,
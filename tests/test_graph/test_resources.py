@@ -28,9 +28,14 @@ class TestGlobalResources:
 
         mock_llm_client = MagicMock()
 
+        mock_kernels = MagicMock()
+        mock_kernels.initialize = AsyncMock()
+        mock_kernels.close = AsyncMock()
+
         mocker.patch("app.graph.resources.APIClient", return_value=mock_api_client)
-        mocker.patch("app.graph.resources.BrowserClient", return_value=mock_browser)
+        mocker.patch("app.graph.resources.BrowserManager", return_value=mock_browser)
         mocker.patch("app.graph.resources.LLMClient", return_value=mock_llm_client)
+        mocker.patch("app.graph.resources.KernelPool", return_value=mock_kernels)
 
         resources = GlobalResources()
         await resources.initialize()
@@ -41,6 +46,7 @@ class TestGlobalResources:
 
         mock_api_client.initialize.assert_called_once()
         mock_browser.initialize.assert_called_once()
+        mock_kernels.initialize.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_initialize_concurrent_initialization(self, mocker):
@@ -63,9 +69,14 @@ class TestGlobalResources:
 
         mock_llm_client = MagicMock()
 
+        mock_kernels = MagicMock()
+        mock_kernels.initialize = AsyncMock()
+        mock_kernels.close = AsyncMock()
+
         mocker.patch("app.graph.resources.APIClient", return_value=mock_api_client)
-        mocker.patch("app.graph.resources.BrowserClient", return_value=mock_browser)
+        mocker.patch("app.graph.resources.BrowserManager", return_value=mock_browser)
         mocker.patch("app.graph.resources.LLMClient", return_value=mock_llm_client)
+        mocker.patch("app.graph.resources.KernelPool", return_value=mock_kernels)
 
         resources = GlobalResources()
         await resources.initialize()
@@ -87,9 +98,14 @@ class TestGlobalResources:
 
         mock_llm_client = MagicMock()
 
+        mock_kernels = MagicMock()
+        mock_kernels.initialize = AsyncMock()
+        mock_kernels.close = AsyncMock()
+
         mocker.patch("app.graph.resources.APIClient", return_value=mock_api_client)
-        mocker.patch("app.graph.resources.BrowserClient", return_value=mock_browser)
+        mocker.patch("app.graph.resources.BrowserManager", return_value=mock_browser)
         mocker.patch("app.graph.resources.LLMClient", return_value=mock_llm_client)
+        mocker.patch("app.graph.resources.KernelPool", return_value=mock_kernels)
 
         resources = GlobalResources()
         await resources.initialize()
@@ -97,6 +113,7 @@ class TestGlobalResources:
 
         mock_api_client.close.assert_called_once()
         mock_browser.close.assert_called_once()
+        mock_kernels.close.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_close_handles_none_clients(self):
@@ -119,9 +136,14 @@ class TestGlobalResources:
 
         mock_llm_client = MagicMock()
 
+        mock_kernels = MagicMock()
+        mock_kernels.initialize = AsyncMock()
+        mock_kernels.close = AsyncMock()
+
         mocker.patch("app.graph.resources.APIClient", return_value=mock_api_client)
-        mocker.patch("app.graph.resources.BrowserClient", return_value=mock_browser)
+        mocker.patch("app.graph.resources.BrowserManager", return_value=mock_browser)
         mocker.patch("app.graph.resources.LLMClient", return_value=mock_llm_client)
+        mocker.patch("app.graph.resources.KernelPool", return_value=mock_kernels)
 
         resources = GlobalResources()
 
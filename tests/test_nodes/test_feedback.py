@@ -1,7 +1,7 @@
 """Tests for app/nodes/feedback.py"""
 
 import time
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from langchain_core.messages import HumanMessage
@@ -17,6 +17,8 @@ class TestFeedbackNode:
         """Create a base state for testing."""
         mock_message = MagicMock()
         mock_message.id = "msg-1"
+        mock_resources = MagicMock()
+        mock_resources.kernels.reset = AsyncMock()
 
         return {
             "current_url": "http://example.com/quiz",
@@ -26,13 +28,13 @@ class TestFeedbackNode:
             "messages": [mock_message],
             "submission_result": {},
             "submitted_answers": [],
+            "session_id": "session-1",
+            "resources": mock_resources,
         }
 
     @pytest.mark.asyncio
     async def test_correct_answer_with_next_url(self, base_state, mocker):
         """Test handling of correct answer with next URL."""
-        mocker.patch("app.nodes.feedback.reset_python_session")
-
         base_state["submission_result"] = {
             "correct": True,
             "url": "http://example.com/next-quiz",
@@ -45,6 +47,7 @@ class TestFeedbackNode:
         assert result["is_complete"] is False
         assert len(result["completed_quizzes"]) == 1
         assert result["submitted_answers"] == []
+        base_state["resources"].kernels.reset.assert_awaited_once_with("session-1")
 
     @pytest.mark.asyncio
     async def test_correct_answer_without_next_url(self, base_state):
@@ -85,8 +88,6 @@ class TestFeedbackNode:
     async def test_incorrect_answer_timeout_with_next_url(self, base_state, mocker):
         """Test handling of incorrect answer on timeout with next URL."""
         mocker.patch("app.nodes.feedback.settings.QUIZ_TIMEOUT_SECONDS", 1)
-        mocker.patch("app.nodes.feedback.reset_python_session")
-
         base_state["start_time"] = time.time() - 100  # Started 100 seconds ago
         base_state["submission_result"] = {
             "correct": False,
@@ -153,8 +154,6 @@ class TestFeedbackNode:
     @pytest.mark.asyncio
     async def test_completed_quizzes_updated(self, base_state, mocker):
         """Test that completed_quizzes is updated on correct answer."""
-        mocker.patch("app.nodes.feedback.reset_python_session")
-
         base_state["submission_result"] = {
             "correct": True,
             "url": "http://example.com/next",
@@ -170,8 +169,6 @@ class TestFeedbackNode:
     @pytest.mark.asyncio
     async def test_context_reset_on_correct_answer(self, base_state, mocker):
         """Test that context is reset when moving to next quiz."""
-        mocker.patch("app.nodes.feedback.reset_python_session")
-
         base_state["submission_result"] = {
             "correct": True,
             "url": "http://example.com/next",
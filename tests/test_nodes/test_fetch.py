@@ -5,7 +5,26 @@ from unittest.mock import AsyncMock, MagicMock
 
 from langchain_core.messages import HumanMessage
 
-from app.nodes.fetch import fetch_context_node
+from app.nodes.fetch import _fetch_static, fetch_context_node
+
+
+@pytest.fixture(autouse=True)
+def no_fast_path(mocker):
+    """Send every fetch through the (mocked) browser unless a test opts in."""
+    return mocker.patch("app.nodes.fetch._fetch_static", AsyncMock(return_value=None))
+
+
+@pytest.fixture(autouse=True)
+def temp_dir(tmp_path, mocker):
+    """Write the raw page HTML to a per-test directory."""
+    mocker.patch("app.nodes.fetch.settings.TEMP_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def prefetch(mocker):
+    """Never start background downloads from node tests."""
+    return mocker.patch("app.nodes.fetch.start_prefetch")
 
 
 class TestFetchContextNode:
@@ -113,10 +132,34 @@ class TestFetchContextNode:
 
         assert "Quiz Question" in content
 
+    @pytest.mark.asyncio
+    async def test_fetch_context_condenses_html(self, mock_browser_data, temp_dir):
+        """Test that styles are dropped, scripts listed, and the raw HTML saved."""
+        mock_browser_data["html"] = (
+            "<html><head><style>.x{}</style></head><body><h1>Quiz Question</h1>"
+            "<script>var tracking = 1;</script></body></html>"
+        )
+        mock_resources = MagicMock()
+        mock_resources.browser.fetch_page_content = AsyncMock(
+            return_value=mock_browser_data
+        )
+
+        result = await fetch_context_node(
+            {"current_url": "http://example.com/quiz", "resources": mock_resources}
+        )
+
+        text = result["messages"][0].content[0]["text"]
+        assert "# Quiz Question" in text
+        assert ".x{}" not in text
+        assert "Inline scripts:\nvar tracking = 1;" in text
+        saved = list(temp_dir.glob("page_*.html"))
+        assert saved[0].read_text() == mock_browser_data["html"]
+        assert str(saved[0]) in text
+
     @pytest.mark.asyncio
     async def test_fetch_context_truncates_long_html(self):
-        """Test that long HTML content is truncated."""
-        long_html = "x" * 40000
+        """Test that HTML beyond the token budget is truncated."""
+        long_html = "x " * 100000
         mock_browser_data = {
             "html": long_html,
             "text": "Text",
@@ -144,8 +187,40 @@ class TestFetchContextNode:
             else message.content
         )
 
-        # Content should be truncated (check for "...")
-        assert "..." in content
+        assert "[truncated to fit the context budget]" in content
+        budget = message.response_metadata["token_budget"]
+        assert budget["page"]["tokens"] < budget["page"]["needed"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_context_budget_shrinks_with_conversation(self, mocker):
+        """Test that tokens already used in the conversation reduce the budget."""
+        mocker.patch("app.utils.tokens.settings.LLM_CONTEXT_TOKENS", 20000)
+        mocker.patch("app.utils.tokens.settings.LLM_RESPONSE_RESERVE_TOKENS", 0)
+        mock_browser = AsyncMock()
+        mock_browser.fetch_page_content.return_value = {
+            "html": "<p>" + "word " * 20000 + "</p>",
+            "text": "",
+            "console_logs": ["[log] hi"],
+            "screenshot_path": None,
+        }
+        mock_resources = MagicMock()
+        mock_resources.browser = mock_browser
+
+        budgets = []
+        for history in ([], [HumanMessage(content="y " * 20000)]):
+            result = await fetch_context_node(
+                {
+                    "current_url": "http://example.com/quiz",
+                    "resources": mock_resources,
+                    "messages": history,
+                }
+            )
+            budgets.append(result["messages"][0].response_metadata["token_budget"])
+
+        assert budgets[1]["page"]["tokens"] < budgets[0]["page"]["tokens"]
+        assert (
+            budgets[0]["console_logs"]["tokens"] == budgets[0]["console_logs"]["needed"]
+        )
 
     @pytest.mark.asyncio
     async def test_fetch_context_handles_empty_console_logs(self):
@@ -222,5 +297,226 @@ class TestFetchContextNode:
         await fetch_context_node(state)
 
         mock_browser.fetch_page_content.assert_called_once_with(
-            "http://example.com/quiz/123"
+            "http://example.com/quiz/123", session_id=None
         )
+
+
+class TestInlineScreenshot:
+    """Test cases for attaching the screenshot to the first message."""
+
+    @pytest.fixture
+    def state(self):
+        """Create state with a browser returning a screenshot path."""
+        mock_browser = AsyncMock()
+        mock_browser.fetch_page_content.return_value = {
+            "html": "<html></html>",
+            "text": "",
+            "console_logs": [],
+            "screenshot_path": "/tmp/screenshot.png",
+        }
+        mock_resources = MagicMock()
+        mock_resources.browser = mock_browser
+        return {"current_url": "http://example.com/quiz", "resources": mock_resources}
+
+    @pytest.mark.asyncio
+    async def test_attaches_image_when_enabled(self, state, mocker):
+        """Test that an image part is added when inlining is enabled."""
+        mock_settings = mocker.patch("app.nodes.fetch.settings")
+        mock_settings.FETCH_MESSAGE_MAX_TOKENS = 12000
+        mock_settings.INLINE_SCREENSHOT = True
+        mock_settings.LLM_SUPPORTS_VISION = True
+        mocker.patch(
+            "app.nodes.fetch.image_to_data_uri", return_value="data:image/jpeg;base64,x"
+        )
+
+        result = await fetch_context_node(state)
+
+        content = result["messages"][0].content
+        assert content[1] == {
+            "type": "image_url",
+            "image_url": {"url": "data:image/jpeg;base64,x"},
+        }
+        assert "attached below" in content[0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_no_image_without_vision(self, state, mocker):
+        """Test that no image is attached when the model lacks vision."""
+        mock_settings = mocker.patch("app.nodes.fetch.settings")
+        mock_settings.FETCH_MESSAGE_MAX_TOKENS = 12000
+        mock_settings.INLINE_SCREENSHOT = True
+        mock_settings.LLM_SUPPORTS_VISION = False
+        encode = mocker.patch("app.nodes.fetch.image_to_data_uri")
+
+        result = await fetch_context_node(state)
+
+        assert len(result["messages"][0].content) == 1
+        encode.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_image_when_over_budget(self, state, mocker):
+        """Test that the text-only message is used when encoding fails."""
+        mock_settings = mocker.patch("app.nodes.fetch.settings")
+        mock_settings.FETCH_MESSAGE_MAX_TOKENS = 12000
+        mock_settings.INLINE_SCREENSHOT = True
+        mock_settings.LLM_SUPPORTS_VISION = True
+        mocker.patch("app.nodes.fetch.image_to_data_uri", return_value=None)
+
+        result = await fetch_context_node(state)
+
+        assert len(result["messages"][0].content) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_screenshot_captured(self, state, mocker):
+        """Test the message points at capture_page_tool when no screenshot exists."""
+        state["resources"].browser.fetch_page_content.return_value[
+            "screenshot_path"
+        ] = None
+        encode = mocker.patch("app.nodes.fetch.image_to_data_uri")
+
+        result = await fetch_context_node(state)
+
+        assert "capture_page_tool" in result["messages"][0].content[0]["text"]
+        encode.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_lists_captured_responses(self, state, mocker):
+        """Test that data responses saved by the browser are listed for the agent."""
+        state["resources"].browser.fetch_page_content.return_value["responses"] = [
+            {
+                "url": "http://example.com/api/data.json",
+                "path": "/tmp/quiz_files/net_1234_data.json",
+                "content_type": "application/json",
+                "size": 42,
+            }
+        ]
+
+        result = await fetch_context_node(state)
+
+        text = result["messages"][0].content[0]["text"]
+        assert (
+            "http://example.com/api/data.json -> /tmp/quiz_files/net_1234_data.json"
+            in text
+        )
+
+    @pytest.mark.asyncio
+    async def test_starts_prefetch_skipping_captured(self, state, prefetch):
+        """Test that linked files are prefetched, except ones already captured."""
+        data = state["resources"].browser.fetch_page_content.return_value
+        data["responses"] = [
+            {
+                "url": "http://example.com/a.json",
+                "path": "/tmp/a.json",
+                "content_type": "application/json",
+                "size": 2,
+            }
+        ]
+
+        await fetch_context_node(state)
+
+        prefetch.assert_called_once_with(
+            "<html></html>",
+            "http://example.com/quiz",
+            skip=["http://example.com/a.json"],
+        )
+
+
+class TestHttpFastPath:
+    """Test cases for fetching static pages without the browser."""
+
+    STATIC_HTML = (
+        "<html><body><h1>Q1</h1><p>What is the sum of the column?</p></body></html>"
+    )
+
+    @pytest.fixture
+    def resources(self):
+        resources = MagicMock()
+        resources.api_client.get_html = AsyncMock(return_value=self.STATIC_HTML)
+        return resources
+
+    @pytest.fixture
+    def cache(self, mocker):
+        mock_settings = mocker.patch("app.nodes.fetch.settings")
+        mock_settings.FETCH_MESSAGE_MAX_TOKENS = 12000
+        mock_settings.HTTP_FAST_PATH = True
+        mock_settings.INLINE_SCREENSHOT = False
+        mock_settings.JS_ENGINE_ENABLED = False
+        store = {}
+        mocker.patch(
+            "app.nodes.fetch.cache_get",
+            side_effect=lambda key, ttl_seconds: (key in store, store.get(key)),
+        )
+        mocker.patch(
+            "app.nodes.fetch.cache_set", side_effect=lambda k, v: store.update({k: v})
+        )
+        return store
+
+    @pytest.mark.asyncio
+    async def test_static_page_skips_browser(self, resources, cache):
+        data = await _fetch_static(resources, "http://example.com/q1")
+
+        assert data["html"] == self.STATIC_HTML
+        assert "What is the sum" in data["text"]
+        assert data["screenshot_path"] is None
+        assert list(cache.values()) == ["static"]
+
+    @pytest.mark.asyncio
+    async def test_dynamic_page_learned_per_domain(self, resources, cache):
+        resources.api_client.get_html.return_value = (
+            "<html><body><div id='q'></div>"
+            "<script>document.getElementById('q').innerHTML = atob('...')</script>"
+            "</body></html>"
+        )
+
+        assert await _fetch_static(resources, "http://example.com/q1") is None
+        assert await _fetch_static(resources, "http://example.com/q2") is None
+        resources.api_client.get_html.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_inline_scripts_rendered_by_js_engine(self, resources, cache, mocker):
+        from app.nodes import fetch
+
+        fetch.settings.JS_ENGINE_ENABLED = True
+        rendered = "<html><body><div id='q'>The secret code is 4242</div></body></html>"
+        render = mocker.patch(
+            "app.nodes.fetch.render_inline_scripts",
+            return_value=(rendered, ['[log] "hi"']),
+        )
+        resources.api_client.get_html.return_value = (
+            "<html><body><div id='q'></div>"
+            "<script>document.getElementById('q').innerHTML = 'x'</script>"
+            "</body></html>"
+        )
+
+        data = await _fetch_static(resources, "http://example.com/q1")
+
+        render.assert_called_once()
+        assert data["html"] == rendered
+        assert "secret code" in data["text"]
+        assert data["console_logs"] == ['[log] "hi"']
+        assert list(cache.values()) == ["static"]
+
+    @pytest.mark.asyncio
+    async def test_http_failure_falls_back(self, resources, cache):
+        resources.api_client.get_html.return_value = None
+
+        assert await _fetch_static(resources, "http://example.com/q1") is None
+        assert cache == {}
+
+    @pytest.mark.asyncio
+    async def test_node_uses_static_data(self, no_fast_path):
+        no_fast_path.return_value = {
+            "html": self.STATIC_HTML,
+            "text": "Q1",
+            "screenshot_path": None,
+            "aria_snapshot": None,
+            "console_logs": [],
+        }
+        resources = MagicMock()
+        resources.browser.fetch_page_content = AsyncMock()
+
+        result = await fetch_context_node(
+            {"current_url": "http://example.com/q1", "resources": resources}
+        )
+
+        assert result["html"] == self.STATIC_HTML
+        resources.browser.fetch_page_content.assert_not_called()
@@ -198,3 +198,20 @@ class TestToolExecutionNode:
         assert len(result["messages"]) == 2
         assert "Result: 42" in result["messages"][0].content
         assert "Error" in result["messages"][1].content
+
+    @pytest.mark.asyncio
+    async def test_long_output_cut_to_token_budget(self, mock_python_tool, mocker):
+        """Test that tool output beyond the per-call token budget is truncated."""
+        mocker.patch("app.nodes.tools.settings.TOOL_OUTPUT_MAX_TOKENS", 100)
+        mock_python_tool.ainvoke.return_value = "row " * 5000
+
+        mock_message = MagicMock()
+        mock_message.tool_calls = [{"name": "python_tool", "id": "call-1", "args": {}}]
+        state = {"messages": [mock_message], "tools": [mock_python_tool]}
+
+        result = await tool_execution_node(state)
+
+        message = result["messages"][0]
+        assert message.content.endswith("[truncated to fit the context budget]")
+        assert message.response_metadata["token_budget"]["tokens"] == 100
+        assert message.response_metadata["token_budget"]["needed"] > 100
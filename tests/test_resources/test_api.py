@@ -181,3 +181,36 @@ class TestAPIClient:
             assert client.client == mock_httpx_client
 
         mock_httpx_client.aclose.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_html_success(self, mocker):
+        """Test that HTML pages are returned from a single GET."""
+        client = APIClient()
+        mock_response = Mock(status_code=200, text="<html></html>")
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
+        mock_httpx_client = AsyncMock()
+        mock_httpx_client.get.return_value = mock_response
+        mocker.patch("httpx.AsyncClient", return_value=mock_httpx_client)
+
+        await client.initialize()
+        result = await client.get_html("http://example.com", timeout=5)
+
+        assert result == "<html></html>"
+        assert mock_httpx_client.get.call_args.kwargs["follow_redirects"] is True
+
+    @pytest.mark.asyncio
+    async def test_get_html_non_html_or_error(self, mocker):
+        """Test that non-HTML responses and transport errors return None."""
+        client = APIClient()
+        mock_response = Mock(status_code=200, text="{}")
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_httpx_client = AsyncMock()
+        mock_httpx_client.get.side_effect = [
+            mock_response,
+            httpx.ConnectError("refused"),
+        ]
+        mocker.patch("httpx.AsyncClient", return_value=mock_httpx_client)
+
+        await client.initialize()
+        assert await client.get_html("http://example.com", timeout=5) is None
+        assert await client.get_html("http://example.com", timeout=5) is None
@@ -0,0 +1,92 @@
+"""Tests for app/resources/asset_cache.py"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.resources.asset_cache import AssetCache, freshness_seconds
+
+URL = "https://cdn.example.com/lib.js"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AssetCache(tmp_path, ["script"], max_bytes=1000, max_file_bytes=500)
+
+
+class TestFreshness:
+    def test_max_age(self):
+        assert freshness_seconds({"Cache-Control": "public, max-age=600"}) == 600
+
+    @pytest.mark.parametrize("directive", ["no-store", "no-cache", "private"])
+    def test_uncacheable_directives(self, directive):
+        headers = {"cache-control": f"max-age=600, {directive}"}
+        assert freshness_seconds(headers) == 0
+
+    def test_expires(self):
+        headers = {"expires": "Thu, 01 Jan 2037 00:00:00 GMT"}
+        assert freshness_seconds(headers, now=2114380800 - 60) == 60
+
+    def test_no_headers_or_bad_expires(self):
+        assert freshness_seconds({}) == 0
+        assert freshness_seconds({"expires": "0"}) == 0
+
+    def test_vary_on_more_than_encoding(self):
+        assert freshness_seconds({"cache-control": "max-age=60", "vary": "Cookie"}) == 0
+        headers = {"cache-control": "max-age=60", "vary": "Accept-Encoding"}
+        assert freshness_seconds(headers) == 60
+
+
+class TestAssetCache:
+    def test_round_trip_drops_wire_headers(self, cache):
+        headers = {
+            "content-type": "application/javascript",
+            "content-encoding": "gzip",
+            "cache-control": "max-age=60",
+        }
+        assert cache.put(URL, 200, headers, b"var a = 1;")
+
+        status, cached_headers, body = cache.get(URL)
+        assert (status, body) == (200, b"var a = 1;")
+        assert "content-encoding" not in cached_headers
+        assert cached_headers["content-type"] == "application/javascript"
+        assert cache.stats()["hit_ratio"] == 1.0
+
+    def test_miss_and_expiry(self, cache, mocker):
+        assert cache.get(URL) is None
+        cache.put(URL, 200, {"cache-control": "max-age=60"}, b"x")
+        mocker.patch("app.resources.asset_cache.time.time", return_value=4e9)
+
+        assert cache.get(URL) is None
+        assert cache.stats()["misses"] == 2
+
+    def test_rejects_uncacheable(self, cache):
+        assert not cache.put(URL, 200, {}, b"x")
+        assert not cache.put(URL, 404, {"cache-control": "max-age=60"}, b"x")
+        assert not cache.put(URL, 200, {"cache-control": "max-age=60"}, b"x" * 501)
+
+    def test_evicts_oldest_beyond_size_limit(self, cache):
+        headers = {"cache-control": "max-age=60"}
+        for i in range(3):
+            cache.put(f"{URL}?v={i}", 200, headers, b"x" * 400)
+
+        assert cache.get(f"{URL}?v=0") is None
+        assert cache.get(f"{URL}?v=2") is not None
+
+    def test_concurrent_puts_never_mix_entries(self, tmp_path):
+        cache = AssetCache(tmp_path, ["script"], max_bytes=10**6, max_file_bytes=500)
+
+        def put(i):
+            headers = {"cache-control": "max-age=60", "x-version": str(i)}
+            cache.put(URL, 200, headers, f"body-{i}".encode())
+            entry = cache.get(URL)
+            if entry is not None:
+                _, headers, body = entry
+                assert body == f"body-{headers['x-version']}".encode()
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(put, range(400)))
+
+        _, headers, body = cache.get(URL)
+        assert body == f"body-{headers['x-version']}".encode()
+        assert not list(tmp_path.glob("*.tmp"))
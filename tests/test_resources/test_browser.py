@@ -1,7 +1,10 @@
+import asyncio
 import pytest
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock
 
 from app.resources.browser import BrowserClient
+from app.resources.page_pool import PooledPage
 
 
 class TestBrowserClient:
@@ -21,6 +24,7 @@ class TestBrowserClient:
         # Mock playwright
         mock_playwright = AsyncMock()
         mock_browser = AsyncMock()
+        mock_browser.on = MagicMock()
         mock_playwright.chromium.launch.return_value = mock_browser
 
         mock_async_playwright_instance = MagicMock()
@@ -30,17 +34,29 @@ class TestBrowserClient:
         mock_async_playwright = MagicMock(return_value=mock_async_playwright_instance)
 
         mocker.patch("app.resources.browser.async_playwright", mock_async_playwright)
+        mock_pool = MagicMock()
+        mock_pool.start = AsyncMock()
+        mocker.patch("app.resources.browser.PagePool", return_value=mock_pool)
+        mocker.patch.object(client.supervisor, "start")
 
         await client.initialize()
 
         assert client.playwright == mock_playwright
         assert client.browser == mock_browser
+        assert client.pool == mock_pool
         assert client._initialized is True
+        mock_pool.start.assert_called_once()
+        client.supervisor.start.assert_called_once()
+        mock_browser.on.assert_called_once_with("disconnected", client._on_disconnected)
 
         mock_async_playwright.assert_called_once()
         mock_start.assert_called_once()
         mock_playwright.chromium.launch.assert_called_once_with(
-            headless=True, args=["--disable-blink-features=AutomationControlled"]
+            headless=True,
+            args=[
+                "--disable-blink-features=AutomationControlled",
+                client.process_marker,
+            ],
         )
 
     @pytest.mark.asyncio
@@ -113,6 +129,7 @@ class TestBrowserClient:
 
         mock_playwright = AsyncMock()
         mock_browser = AsyncMock()
+        mock_browser.on = MagicMock()
         mock_playwright.chromium.launch.return_value = mock_browser
 
         mock_async_playwright_instance = MagicMock()
@@ -122,6 +139,10 @@ class TestBrowserClient:
         mock_async_playwright = MagicMock(return_value=mock_async_playwright_instance)
 
         mocker.patch("app.resources.browser.async_playwright", mock_async_playwright)
+        mock_pool = MagicMock()
+        mock_pool.start = AsyncMock()
+        mock_pool.close = AsyncMock()
+        mocker.patch("app.resources.browser.PagePool", return_value=mock_pool)
 
         async with client as ctx_client:
             assert ctx_client == client
@@ -130,3 +151,327 @@ class TestBrowserClient:
         assert client._initialized is False
         mock_browser.close.assert_called_once()
         mock_playwright.stop.assert_called_once()
+
+
+class TestFetchPageContent:
+    """Test cases for BrowserClient.fetch_page_content."""
+
+    @pytest.fixture
+    def client(self, tmp_path, mocker):
+        """Create a client whose pool yields a single mock page."""
+        mock_settings = MagicMock()
+        mock_settings.TEMP_DIR = tmp_path
+        mock_settings.CAPTURE_OUTPUTS = ["html", "text", "screenshot"]
+        mock_settings.SCREENSHOT_FULL_PAGE = False
+        mocker.patch("app.resources.browser.settings", mock_settings)
+        mocker.patch("app.resources.capture.settings", mock_settings)
+        mocker.patch("app.resources.browser.cache_get", return_value=(False, None))
+        mocker.patch("app.resources.browser.cache_set")
+
+        async def load_page(page, url):
+            return await page.goto(url)
+
+        mocker.patch("app.resources.browser.load_page", load_page)
+
+        page = MagicMock()
+        page.is_closed.return_value = False
+        page.content = AsyncMock(return_value="<html><body>Q1</body></html>")
+        page.inner_text = AsyncMock(return_value="Q1")
+        page.screenshot = AsyncMock()
+        pooled = PooledPage(page=page, context=MagicMock(), console_logs=["[log] old"])
+
+        async def goto(url, **kwargs):
+            pooled.console_logs.append("[log] hi")
+            return 250.0
+
+        page.goto = AsyncMock(side_effect=goto)
+
+        client = BrowserClient()
+        client.pool = MagicMock()
+        client.released = 0
+
+        async def close_session(p):
+            client.released += 1
+
+        client.pool.open_session = AsyncMock(return_value=pooled)
+        client.pool.close_session = AsyncMock(side_effect=close_session)
+
+        @asynccontextmanager
+        async def acquire():
+            try:
+                yield pooled
+            finally:
+                client.released += 1
+
+        client.pool.acquire = acquire
+        client.page = page
+        return client
+
+    @pytest.mark.asyncio
+    async def test_uses_pooled_page(self, client):
+        """Test that content is captured from a pooled page, which is released."""
+        data = await client.fetch_page_content("http://example.com/q1")
+
+        assert data["html"] == "<html><body>Q1</body></html>"
+        assert data["text"] == "Q1"
+        assert data["console_logs"] == ["[log] hi"]
+        assert data["screenshot_path"].endswith("_view.jpg")
+        assert client.released == 1
+        client.page.goto.assert_called_once()
+        assert client.page.screenshot.call_args.kwargs["full_page"] is False
+
+    @pytest.mark.asyncio
+    async def test_includes_captured_responses(self, client, mocker):
+        """Test that data responses recorded during the load are returned."""
+        recorder = MagicMock()
+        recorder.save = AsyncMock(return_value=[{"url": "http://example.com/d.csv"}])
+        mocker.patch("app.resources.browser.ResponseRecorder", return_value=recorder)
+
+        data = await client.fetch_page_content("http://example.com/q1")
+
+        assert data["responses"] == [{"url": "http://example.com/d.csv"}]
+        recorder.attach.assert_called_once_with(client.page)
+        recorder.detach.assert_called_once_with(client.page)
+
+    @pytest.mark.asyncio
+    async def test_selected_outputs_only(self, client):
+        """Test that unselected outputs are skipped and images stay blocked."""
+        data = await client.fetch_page_content(
+            "http://example.com/q1", session_id="s1", outputs=["text"]
+        )
+
+        assert data["text"] == "Q1"
+        assert data["html"] == ""
+        assert data["screenshot_path"] is None
+        client.page.content.assert_not_called()
+        client.page.screenshot.assert_not_called()
+        assert client.sessions["s1"].allow_images is False
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_outputs(self, client):
+        """Test that unknown capture outputs raise."""
+        with pytest.raises(ValueError, match="Unknown capture output"):
+            await client.fetch_page_content("http://example.com/q1", outputs=["pdf"])
+
+    @pytest.mark.asyncio
+    async def test_capture_reuses_session_page(self, client):
+        """Test on-demand capture without reloading when images were loaded."""
+        await client.fetch_page_content("http://example.com/q1", session_id="s1")
+
+        data = await client.capture(
+            "http://example.com/q1", ["screenshot"], session_id="s1"
+        )
+
+        client.page.goto.assert_called_once()
+        assert data["screenshot_path"].endswith("_full.jpg")
+
+    @pytest.mark.asyncio
+    async def test_capture_reloads_when_images_were_blocked(self, client):
+        """Test that a screenshot reloads a page that was loaded without images."""
+        client.router = MagicMock()
+        await client.fetch_page_content(
+            "http://example.com/q1", session_id="s1", outputs=["text"]
+        )
+
+        await client.capture("http://example.com/q1", ["screenshot"], session_id="s1")
+
+        assert client.page.goto.call_count == 2
+        assert client.sessions["s1"].allow_images is True
+
+    @pytest.mark.asyncio
+    async def test_page_released_on_error(self, client):
+        """Test that the page is returned to the pool when loading fails."""
+        client.page.goto.side_effect = Exception("net::ERR")
+
+        with pytest.raises(Exception, match="net::ERR"):
+            await client.fetch_page_content("http://example.com/q1")
+        assert client.released == 1
+
+    def test_stats(self, client):
+        """Test that stats expose pool metrics."""
+        client.pool.stats.return_value = {"acquired": 3}
+
+        stats = client.stats()
+        assert stats["pool"] == {"acquired": 3}
+        assert stats["sessions"] == 0
+        assert stats["readiness"]["loads"] == 0
+
+    @pytest.mark.asyncio
+    async def test_records_ready_time(self, client):
+        """Test that readiness time is tracked per load."""
+        await client.fetch_page_content("http://example.com/q1")
+
+        readiness = client.stats()["readiness"]
+        assert readiness["loads"] == 1
+        assert readiness["ready_max_ms"] == 250.0
+        assert readiness["ready_avg_ms"] == 250.0
+
+    @pytest.mark.asyncio
+    async def test_session_page_kept_until_released(self, client):
+        """Test that a session keeps its page open across fetches."""
+        await client.fetch_page_content("http://example.com/q1", session_id="s1")
+        await client.fetch_page_content("http://example.com/q2", session_id="s1")
+
+        client.pool.open_session.assert_called_once()
+        assert client.released == 0
+        assert client.sessions["s1"].loaded_url == "http://example.com/q2"
+        assert client.stats()["sessions"] == 1
+
+        await client.release_session("s1")
+        assert client.released == 1
+        assert "s1" not in client.sessions
+
+    @pytest.mark.asyncio
+    async def test_session_page_replaced_when_closed(self, client):
+        """Test that a crashed session page is closed and a fresh one opened."""
+        await client.fetch_page_content("http://example.com/q1", session_id="s1")
+        client.page.is_closed.return_value = True
+
+        async with client.session_page("s1"):
+            pass
+
+        assert client.pool.open_session.call_count == 2
+        assert client.released == 1
+
+    @pytest.mark.asyncio
+    async def test_release_unknown_session(self, client):
+        """Test that releasing an unknown session is a no-op."""
+        await client.release_session("missing")
+        assert client.released == 0
+
+
+class TestBrowserRestart:
+    """Test cases for draining and restarting the browser."""
+
+    @pytest.fixture
+    def client(self, mocker):
+        mock_settings = MagicMock()
+        mock_settings.BROWSER_DRAIN_TIMEOUT = 1
+        mocker.patch("app.resources.browser.settings", mock_settings)
+        client = BrowserClient()
+        client.playwright = MagicMock()
+        client._initialized = True
+        client.browser = MagicMock()
+        client.browser.close = AsyncMock()
+        client.pool = MagicMock()
+        client.pool.close = AsyncMock()
+        mocker.patch.object(client, "_launch", AsyncMock())
+        return client
+
+    @pytest.mark.asyncio
+    async def test_restart_waits_for_in_flight_pages(self, client):
+        """Test that restart drains active page users before relaunching."""
+        events = []
+        client._launch.side_effect = lambda: events.append("launch")
+
+        async def page_user():
+            async with client._in_flight():
+                await asyncio.sleep(0.2)
+                events.append("page done")
+
+        user = asyncio.create_task(page_user())
+        await asyncio.sleep(0)
+        await client.restart("pages")
+        await user
+
+        assert events == ["page done", "launch"]
+        assert client.health["restarts"] == 1
+        assert client.stats()["health"]["restart_reasons"] == {"pages": 1}
+
+    @pytest.mark.asyncio
+    async def test_new_page_users_wait_for_restart(self, client):
+        """Test that page requests made during a restart wait for it to finish."""
+        launched = asyncio.Event()
+
+        async def slow_launch():
+            await asyncio.sleep(0.1)
+            launched.set()
+
+        client._launch.side_effect = slow_launch
+        restart = asyncio.create_task(client.restart("memory"))
+        await asyncio.sleep(0)
+
+        async with client._in_flight():
+            assert launched.is_set()
+        await restart
+
+    @pytest.mark.asyncio
+    async def test_restart_drops_sessions(self, client):
+        """Test that session pages from the old browser are forgotten."""
+        client.sessions["s1"] = MagicMock()
+
+        await client.restart("crash")
+
+        assert client.sessions == {}
+        client._launch.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_unexpected_disconnect_triggers_restart(self, client, mocker):
+        """Test that a crash of the current browser schedules a restart."""
+        restart = mocker.patch.object(client, "restart", AsyncMock())
+
+        client._on_disconnected(MagicMock())  # a previous browser: ignored
+        client._on_disconnected(client.browser)
+        await client._restart_task
+
+        restart.assert_called_once_with("crash")
+
+
+class TestRemoteBrowser:
+    """Test cases for attaching to Chromium over CDP."""
+
+    @pytest.fixture
+    def playwright(self, mocker):
+        mock_playwright = MagicMock()
+        mock_playwright.chromium.connect_over_cdp = AsyncMock()
+        mock_playwright.chromium.launch = AsyncMock()
+        instance = MagicMock(start=AsyncMock(return_value=mock_playwright))
+        mocker.patch("app.resources.browser.async_playwright", return_value=instance)
+        mock_pool = MagicMock(start=AsyncMock())
+        mocker.patch("app.resources.browser.PagePool", return_value=mock_pool)
+        return mock_playwright
+
+    @pytest.mark.asyncio
+    async def test_connects_instead_of_launching(self, playwright, mocker):
+        remote = MagicMock()
+        playwright.chromium.connect_over_cdp.return_value = remote
+        client = BrowserClient(cdp_endpoint="http://browser:9222")
+        mocker.patch.object(client.supervisor, "start")
+
+        await client.initialize()
+
+        assert client.browser is remote
+        assert client.ready
+        playwright.chromium.connect_over_cdp.assert_called_once()
+        assert playwright.chromium.connect_over_cdp.call_args.args == (
+            "http://browser:9222",
+        )
+        playwright.chromium.launch.assert_not_called()
+        remote.on.assert_called_once_with("disconnected", client._on_disconnected)
+
+    @pytest.mark.asyncio
+    async def test_unreachable_endpoint_does_not_fail_startup(self, playwright, mocker):
+        playwright.chromium.connect_over_cdp.side_effect = Exception("refused")
+        client = BrowserClient(cdp_endpoint="http://browser:9222")
+        mocker.patch.object(client.supervisor, "start")
+
+        await client.initialize()
+
+        assert client._initialized is True
+        assert client.ready is False
+        client.supervisor.start.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_on_restart(self, playwright, mocker):
+        playwright.chromium.connect_over_cdp.side_effect = [
+            Exception("refused"),
+            MagicMock(),
+        ]
+        client = BrowserClient(cdp_endpoint="http://browser:9222")
+        mocker.patch.object(client.supervisor, "start")
+        await client.initialize()
+
+        await client.restart("crash")
+
+        assert client.ready
+        assert client.health["restart_reasons"]["crash"] == 1
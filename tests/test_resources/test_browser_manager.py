@@ -0,0 +1,163 @@
+"""Tests for app/resources/browser_manager.py"""
+
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from app.resources.browser_manager import BrowserManager, shard_count
+from app.resources.page_pool import PagePool, PooledPage
+
+
+@pytest.fixture
+def manager():
+    manager = BrowserManager(shards=2)
+    for shard in manager.shards:
+        shard.browser = MagicMock()
+        shard.initialize = AsyncMock()
+        shard.close = AsyncMock()
+        shard.fetch_page_content = AsyncMock(return_value={"html": shard.name})
+        shard.release_session = AsyncMock()
+        shard.load = AsyncMock()
+    return manager
+
+
+class TestShardCount:
+    def test_configured(self, mocker):
+        mocker.patch("app.resources.browser_manager.settings.BROWSER_SHARDS", 3)
+        assert shard_count() == 3
+
+    def test_auto_uses_cores(self, mocker):
+        mocker.patch("app.resources.browser_manager.settings.BROWSER_SHARDS", 0)
+        mocker.patch("app.resources.browser_manager.os.cpu_count", return_value=6)
+        assert shard_count() == 3
+
+    def test_auto_is_capped_and_at_least_one(self, mocker):
+        mocker.patch("app.resources.browser_manager.settings.BROWSER_SHARDS", 0)
+        mocker.patch("app.resources.browser_manager.os.cpu_count", return_value=64)
+        assert shard_count() == 4
+        mocker.patch("app.resources.browser_manager.os.cpu_count", return_value=1)
+        assert shard_count() == 1
+
+
+class TestBrowserManager:
+    def test_shards_get_distinct_markers(self, manager):
+        markers = {s.process_marker for s in manager.shards}
+        assert len(markers) == 2
+
+    @pytest.mark.asyncio
+    async def test_initialize_and_close_all_shards(self, manager):
+        await manager.initialize()
+        await manager.close()
+
+        for shard in manager.shards:
+            shard.initialize.assert_called_once()
+            shard.close.assert_called_once()
+
+    def test_routes_to_least_loaded(self, manager):
+        manager.shards[0]._active = 3
+        assert manager.shard_for() is manager.shards[1]
+
+        manager.shards[1].sessions["a"] = MagicMock()
+        manager.shards[1].sessions["b"] = MagicMock()
+        manager.shards[1].sessions["c"] = MagicMock()
+        manager.shards[1].sessions["d"] = MagicMock()
+        assert manager.shard_for() is manager.shards[0]
+
+    def test_avoids_restarting_shard(self, manager):
+        manager.shards[0]._active = 5
+        manager.shards[1]._ready.clear()
+        assert manager.shard_for() is manager.shards[0]
+
+    @pytest.mark.asyncio
+    async def test_session_sticks_to_one_shard(self, manager):
+        first = await manager.fetch_page_content("https://a.com", "s1")
+        manager.shards[int(first["html"])]._active = 10  # now the busier shard
+        second = await manager.fetch_page_content("https://a.com/next", "s1")
+
+        assert first == second
+        assert manager.shard_for("s2") is not manager.shard_for("s1")
+
+    @pytest.mark.asyncio
+    async def test_release_session_unpins(self, manager):
+        shard = manager.shard_for("s1")
+        await manager.release_session("s1")
+
+        shard.release_session.assert_called_once_with("s1")
+        assert "s1" not in manager._session_shards
+        await manager.release_session("unknown")  # no-op
+
+    @pytest.mark.asyncio
+    async def test_session_page_uses_pinned_shard(self, manager):
+        pooled = MagicMock()
+        shard = manager.shards[1]
+
+        @asynccontextmanager
+        async def session_page(session_id):
+            yield pooled
+
+        shard.session_page = MagicMock(side_effect=session_page)
+        manager._session_shards["s1"] = shard
+
+        async with manager.session_page("s1") as page:
+            assert page is pooled
+        shard.session_page.assert_called_once_with("s1")
+
+    @pytest.mark.asyncio
+    async def test_load_goes_to_owning_shard(self, manager):
+        context = MagicMock()
+        for shard in manager.shards:
+            shard.pool = PagePool(MagicMock(), contexts=1, max_pages=1)
+        manager.shards[1].pool.contexts = [context]
+        pooled = PooledPage(page=MagicMock(), context=context)
+
+        await manager.load(pooled, "https://a.com")
+
+        manager.shards[1].load.assert_called_once_with(pooled, "https://a.com")
+        manager.shards[0].load.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_load_session_page_goes_to_owning_shard(self, manager):
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=MagicMock(route=AsyncMock()))
+        browser = MagicMock(new_context=AsyncMock(return_value=context))
+        for shard in manager.shards:
+            shard.pool = PagePool(browser, contexts=1, max_pages=1)
+        pooled = await manager.shards[1].pool.open_session()
+
+        await manager.load(pooled, "https://a.com")
+
+        manager.shards[1].load.assert_called_once_with(pooled, "https://a.com")
+        manager.shards[0].load.assert_not_called()
+
+    def test_session_moves_off_dead_shard(self, manager):
+        first = manager.shard_for("s1")
+        first.browser.is_connected.return_value = False
+
+        second = manager.shard_for("s1")
+        assert second is not first
+        assert manager.shard_for("s1") is second
+
+    @pytest.mark.asyncio
+    async def test_initialize_fails_without_any_shard(self, manager):
+        for shard in manager.shards:
+            shard.browser = None
+        with pytest.raises(RuntimeError, match="No browser shard"):
+            await manager.initialize()
+
+    def test_cdp_endpoints_become_shards(self, mocker):
+        mocker.patch(
+            "app.resources.browser_manager.settings.BROWSER_CDP_ENDPOINTS",
+            ["http://a:9222", "http://b:9222"],
+        )
+        manager = BrowserManager(shards=4)
+        assert [s.cdp_endpoint for s in manager.shards] == [
+            "http://a:9222",
+            "http://b:9222",
+        ]
+
+    def test_stats_per_shard(self, manager):
+        manager.shard_for("s1")
+        stats = manager.stats()
+
+        assert [s["name"] for s in stats["shards"]] == ["0", "1"]
+        assert stats["sessions"] == 1
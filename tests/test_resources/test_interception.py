@@ -0,0 +1,140 @@
+"""Tests for app/resources/interception.py"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.resources.asset_cache import AssetCache
+from app.resources.interception import RequestRouter
+
+
+def _route(resource_type, url="http://example.com/a", navigation=False):
+    route = MagicMock()
+    route.request.resource_type = resource_type
+    route.request.url = url
+    route.request.is_navigation_request.return_value = navigation
+    route.continue_ = AsyncMock()
+    route.fulfill = AsyncMock()
+    route.abort = AsyncMock()
+    return route
+
+
+def _response(resource_type, length):
+    response = MagicMock()
+    response.headers = {"content-length": str(length)}
+    response.request.resource_type = resource_type
+    return response
+
+
+@pytest.fixture
+def router():
+    return RequestRouter(["image", "font"], ["tracker.com"])
+
+
+class TestRequestRouter:
+    @pytest.mark.asyncio
+    async def test_allows_documents_and_scripts(self, router):
+        route = _route("script")
+        await router.handle(route)
+
+        route.continue_.assert_called_once()
+        assert router.stats()["allowed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_aborts_blocked_types(self, router):
+        route = _route("font")
+        await router.handle(route)
+
+        route.abort.assert_called_once()
+        assert router.stats()["blocked_by_type"] == {"font": 1}
+
+    @pytest.mark.asyncio
+    async def test_allows_images_for_screenshots(self, router):
+        route = _route("image")
+        await router.handle(route, allow_images=True)
+
+        route.continue_.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stubs_scripts_from_blocked_domains(self, router):
+        route = _route("script", "https://cdn.tracker.com/t.js")
+        await router.handle(route)
+
+        route.fulfill.assert_called_once()
+        assert route.fulfill.call_args.kwargs["content_type"] == (
+            "application/javascript"
+        )
+
+    def test_never_blocks_navigation(self, router):
+        route = _route("document", "https://tracker.com/", navigation=True)
+        assert router.should_block(route.request) is False
+
+    @pytest.mark.asyncio
+    async def test_estimates_bytes_avoided(self, router):
+        router.observe(_response("image", 1000))
+        router.observe(_response("image", 3000))
+
+        await router.handle(_route("image"))
+
+        stats = router.stats()
+        assert stats["blocked"] == 1
+        assert stats["bytes_avoided_est"] == 2000
+
+    @pytest.mark.asyncio
+    async def test_route_errors_are_swallowed(self, router):
+        route = _route("script")
+        route.continue_.side_effect = Exception("Target closed")
+
+        await router.handle(route)
+
+
+class TestAssetCaching:
+    @pytest.fixture
+    def cached_router(self, tmp_path):
+        cache = AssetCache(tmp_path, ["script"], max_bytes=10**6, max_file_bytes=10**6)
+        return RequestRouter([], [], asset_cache=cache)
+
+    def _fetched(self, route, body=b"js"):
+        response = MagicMock()
+        response.status = 200
+        response.headers = {"cache-control": "max-age=60"}
+        response.body = AsyncMock(return_value=body)
+        route.fetch = AsyncMock(return_value=response)
+        route.request.method = "GET"
+        return response
+
+    @pytest.mark.asyncio
+    async def test_second_load_served_from_cache(self, cached_router):
+        first = _route("script", "https://cdn.com/lib.js")
+        response = self._fetched(first)
+        await cached_router.handle(first)
+        first.fulfill.assert_called_once_with(response=response, body=b"js")
+
+        second = _route("script", "https://cdn.com/lib.js")
+        second.request.method = "GET"
+        second.fetch = AsyncMock()
+        await cached_router.handle(second)
+
+        second.fetch.assert_not_called()
+        assert second.fulfill.call_args.kwargs["body"] == b"js"
+        assert cached_router.stats()["asset_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_falls_back_to_network(self, cached_router):
+        route = _route("script", "https://cdn.com/lib.js")
+        route.request.method = "GET"
+        route.fetch = AsyncMock(side_effect=Exception("reset"))
+
+        await cached_router.handle(route)
+
+        route.continue_.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_other_types_bypass_cache(self, cached_router):
+        route = _route("xhr")
+        route.request.method = "GET"
+        route.fetch = AsyncMock()
+
+        await cached_router.handle(route)
+
+        route.fetch.assert_not_called()
+        route.continue_.assert_called_once()
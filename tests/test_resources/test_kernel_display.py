@@ -0,0 +1,118 @@
+"""Tests for app/resources/kernel_display.py"""
+
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.resources import kernel_display
+from app.resources.kernel_display import compact_print, configure, dump, render
+
+
+@pytest.fixture
+def restore_display():
+    """Undo display option changes made by configure()."""
+    printoptions = np.get_printoptions()
+    yield
+    pd.reset_option("display")
+    np.set_printoptions(**printoptions)
+    kernel_display._dump_dir = None
+
+
+class TestRender:
+    """Test cases for render."""
+
+    def test_small_objects_unchanged(self):
+        """Test small frames, series, and arrays print as usual."""
+        df = pd.DataFrame({"a": range(5)})
+        series = pd.Series(range(5))
+        array = np.arange(10)
+        assert render(df) is df
+        assert render(series) is series
+        assert render(array) is array
+        assert render([1] * 1000) == [1] * 1000
+
+    def test_large_frame(self):
+        """Test a large frame shows shape, dtypes, head, tail, and statistics."""
+        df = pd.DataFrame({"x": range(1000), "name": [f"n{i}" for i in range(1000)]})
+        text = render(df)
+        assert text.startswith("DataFrame with 1000 rows x 2 columns")
+        assert "dtypes: x: int64, name: " in text
+        assert "n0" in text and "n999" in text
+        assert "n500" not in text
+        assert "summary:" in text and "499.5" in text
+        assert len(text) < len(df.to_string()) / 10
+
+    def test_wide_frame_columns_capped(self):
+        """Test frames with many columns list only the first dtypes."""
+        df = pd.DataFrame(np.zeros((3, 50)))
+        text = render(df)
+        assert text.startswith("DataFrame with 3 rows x 50 columns")
+        assert "dtypes:" in text and text.split("\n")[1].endswith(", ...")
+
+    def test_large_series(self):
+        """Test a long series shows its length, dtype, ends, and statistics."""
+        text = render(pd.Series(np.arange(100.0), name="v"))
+        assert text.startswith("Series 'v' with 100 values, dtype: float64")
+        assert "mean 49.5" in text and "max 99" in text
+
+    def test_large_array(self):
+        """Test a large array shows shape, dtype, and statistics."""
+        text = render(np.arange(1000).reshape(100, 10))
+        assert text.startswith("ndarray with shape (100, 10), dtype: int64")
+        assert "min 0, max 999" in text
+
+    def test_non_numeric_array(self):
+        """Test arrays without numbers get no statistics."""
+        text = render(np.array(["a"] * 500))
+        assert text.startswith("ndarray with shape (500,)")
+        assert "mean" not in text
+
+
+class TestCompactPrint:
+    """Test cases for compact_print."""
+
+    def test_renders_on_stdout(self, capsys):
+        """Test large objects printed to stdout are summarised."""
+        compact_print("rows:", pd.Series(range(100)))
+        out = capsys.readouterr().out
+        assert out.startswith("rows: Series None with 100 values")
+
+    def test_other_files_untouched(self, capsys):
+        """Test output written to another file is not summarised."""
+        compact_print(pd.Series(range(100)), file=sys.stderr)
+        assert "with 100 values" not in capsys.readouterr().err
+
+
+class TestDump:
+    """Test cases for dump and configure."""
+
+    def test_frame_to_csv(self, tmp_path, restore_display):
+        """Test a frame is saved in full as CSV in the configured directory."""
+        configure(str(tmp_path))
+        df = pd.DataFrame({"x": range(1000)})
+        path = dump(df, "frame")
+        assert path == str(tmp_path / "frame.csv")
+        assert pd.read_csv(path)["x"].tolist() == list(range(1000))
+
+    def test_array_and_other_objects(self, tmp_path, restore_display):
+        """Test arrays and plain objects get matching file formats."""
+        configure(str(tmp_path))
+        assert dump(np.arange(6).reshape(2, 3)).endswith(".csv")
+        assert dump(np.zeros((2, 2, 2))).endswith(".npy")
+        path = dump({"a": [1, 2]}, "data")
+        assert json.loads(open(path).read()) == {"a": [1, 2]}
+        assert dump(object(), "thing").endswith("thing.txt")
+
+    def test_name_cannot_leave_directory(self, tmp_path, restore_display):
+        """Test a name with path parts still writes inside the dump directory."""
+        configure(str(tmp_path))
+        assert dump([1], "../../escape") == str(tmp_path / "escape.json")
+
+    def test_configure_sets_display_options(self, restore_display):
+        """Test configure limits pandas rows and numpy array items."""
+        configure()
+        assert pd.get_option("display.max_rows") == kernel_display.MAX_ROWS
+        assert np.get_printoptions()["threshold"] == kernel_display.MAX_ARRAY_ITEMS
@@ -0,0 +1,358 @@
+"""Tests for app/resources/kernels.py"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from app.config.settings import settings
+from app.resources.kernels import (
+    BUSY_MESSAGE,
+    RESTART_NOTICE,
+    KernelPool,
+    _context,
+    kernel_count,
+)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def kernels():
+    """Two kernel processes shared by the tests in this module, with small limits."""
+    with patch.multiple(
+        settings,
+        PYTHON_CPU_SECONDS=2,
+        PYTHON_MAX_MEMORY_MB=256,
+        PYTHON_MAX_OUTPUT_BYTES=1000,
+    ):
+        async with KernelPool(kernels=2) as pool:
+            yield pool
+
+
+def _neighbour(kernels, session_id):
+    """A new session id that lands on the same kernel as session_id."""
+    kernel = kernels.kernel_for(session_id)
+    return next(
+        f"{session_id}-neighbour-{i}"
+        for i in range(10)
+        if kernels.kernel_for(f"{session_id}-neighbour-{i}") is kernel
+    )
+
+
+class TestKernelCount:
+    """Test cases for kernel_count."""
+
+    @pytest.mark.parametrize("cpus,expected", [(1, 1), (2, 2), (16, 4), (None, 1)])
+    def test_auto(self, mocker, cpus, expected):
+        """Test one kernel per core, capped, when PYTHON_KERNELS is 0."""
+        mock_settings = MagicMock()
+        mock_settings.PYTHON_KERNELS = 0
+        mocker.patch("app.resources.kernels.settings", mock_settings)
+        mocker.patch("app.resources.kernels.os.cpu_count", return_value=cpus)
+        assert kernel_count() == expected
+
+    def test_configured(self, mocker):
+        """Test an explicit PYTHON_KERNELS wins."""
+        mock_settings = MagicMock()
+        mock_settings.PYTHON_KERNELS = 6
+        mocker.patch("app.resources.kernels.settings", mock_settings)
+        assert kernel_count() == 6
+
+
+class TestContext:
+    """Test cases for the kernel process context."""
+
+    def test_fork_server_preloads_modules(self, mocker):
+        """Test the fork server imports the worker and configured modules."""
+        mock_settings = MagicMock()
+        mock_settings.PYTHON_PRELOAD_MODULES = ["pandas", "sklearn"]
+        mocker.patch("app.resources.kernels.settings", mock_settings)
+        get_context = mocker.patch("app.resources.kernels.multiprocessing.get_context")
+
+        context = _context()
+
+        get_context.assert_called_once_with("forkserver")
+        context.set_forkserver_preload.assert_called_once_with(
+            ["app.resources.kernel_worker", "pandas", "sklearn"]
+        )
+
+    def test_spawn_without_fork_server(self, mocker):
+        """Test platforms without fork servers spawn fresh interpreters."""
+        mocker.patch(
+            "app.resources.kernels.multiprocessing.get_all_start_methods",
+            return_value=["spawn"],
+        )
+        get_context = mocker.patch("app.resources.kernels.multiprocessing.get_context")
+        _context()
+        get_context.assert_called_once_with("spawn")
+
+
+@pytest.mark.asyncio(loop_scope="module")
+class TestKernelPool:
+    """Test cases for KernelPool."""
+
+    async def test_execute_returns_output(self, kernels):
+        """Test code runs in a worker process, not the server."""
+        ok, output, _ = await kernels.execute("out", "import os; print(os.getpid())")
+        assert ok
+        assert int(output) == kernels.kernel_for("out").process.pid
+
+    async def test_preloaded_modules_already_imported(self, kernels):
+        """Test a new session finds the preload modules imported."""
+        pytest.importorskip("networkx")
+        ok, output, _ = await kernels.execute(
+            "warm", "import sys; print('networkx' in sys.modules)"
+        )
+        assert (ok, output) == (True, "True\n")
+
+    async def test_error_returns_traceback(self, kernels):
+        """Test a failing run reports output printed so far and the traceback."""
+        ok, output, _ = await kernels.execute("err", "print('before'); 1 / 0")
+        assert not ok
+        assert output.startswith("before\n")
+        assert "ZeroDivisionError" in output
+
+    async def test_exit_does_not_end_worker(self, kernels):
+        """Test exit() in user code is reported instead of stopping the worker."""
+        ok, output, _ = await kernels.execute("exit", "exit(3)")
+        assert not ok
+        assert "SystemExit" in output
+        assert (await kernels.execute("exit", "print('alive')"))[:2] == (
+            True,
+            "alive\n",
+        )
+
+    async def test_sessions_spread_over_kernels(self, kernels):
+        """Test new sessions go to the kernel with the fewest sessions."""
+        first = kernels.kernel_for("spread-1")
+        second = kernels.kernel_for("spread-2")
+        assert first is not second
+        assert kernels.kernel_for("spread-1") is first
+
+    async def test_loop_stays_responsive(self, kernels):
+        """Test CPU-bound code does not block the event loop."""
+        job = asyncio.create_task(
+            kernels.execute(
+                "busy",
+                "import time\nend = time.time() + 1\nwhile time.time() < end: pass",
+            )
+        )
+        started = time.perf_counter()
+        await asyncio.sleep(0.05)
+        assert time.perf_counter() - started < 0.5
+        assert (await job)[0]
+
+    async def test_timeout_kills_and_restarts(self, kernels):
+        """Test a runaway run is killed and the kernel replaced."""
+        await kernels.execute("slow", "x = 1")
+        neighbour = next(
+            f"neighbour-{i}"
+            for i in range(10)
+            if kernels.kernel_for(f"neighbour-{i}") is kernels.kernel_for("slow")
+        )
+        await kernels.execute(neighbour, "y = 2")
+        kernel = kernels.kernel_for("slow")
+        old_pid, restarts = kernel.process.pid, kernel.restarts
+
+        ok, output, _ = await kernels.execute("slow", "while True: pass", timeout=0.5)
+
+        assert not ok
+        assert "timed out" in output
+        assert kernel.restarts == restarts + 1
+        assert kernel.process.pid != old_pid
+        ok, output, _ = await kernels.execute("slow", "print(x)")
+        assert "NameError" in output
+        assert RESTART_NOTICE not in output
+        ok, output, _ = await kernels.execute(neighbour, "print(y)")
+        assert output.startswith(RESTART_NOTICE)
+        assert "NameError" in output
+
+    async def test_restart_does_not_block_loop(self, kernels):
+        """Test killing and replacing a worker runs off the event loop."""
+        kernel = kernels.kernel_for("blocker")
+        await kernels.execute("blocker", "pass")
+        kill = kernel.kill
+
+        def slow_kill():
+            time.sleep(0.5)
+            kill()
+
+        with patch.object(kernel, "kill", slow_kill):
+            job = asyncio.create_task(
+                kernels.execute("blocker", "import os; os._exit(1)")
+            )
+            started = time.perf_counter()
+            await asyncio.sleep(0.2)
+            assert time.perf_counter() - started < 0.4
+            assert "crashed" in (await job)[1]
+            assert time.perf_counter() - started >= 0.5
+
+    async def test_cancel_during_restart_keeps_kernel_locked(self, kernels):
+        """Test a caller cancelled mid-restart leaves the kernel usable."""
+        kernel = kernels.kernel_for("twice")
+        await kernels.execute("twice", "pass")
+        kill = kernel.kill
+
+        def slow_kill():
+            time.sleep(0.3)
+            kill()
+
+        with patch.object(kernel, "kill", slow_kill):
+            job = asyncio.create_task(
+                kernels.execute("twice", "while True: pass", timeout=0.1)
+            )
+            await asyncio.sleep(0.2)
+            job.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await job
+            assert kernel.lock.locked()
+            ok, output, _ = await kernels.execute("twice", "print(1)")
+            assert ok and output.endswith("1\n")
+
+    async def test_cancel_kills_worker(self, kernels):
+        """Test cancelling a run (e.g. the tool timeout) kills the worker."""
+        kernel = kernels.kernel_for("cancel")
+        await kernels.execute("cancel", "pass")
+        old_pid = kernel.process.pid
+        job = asyncio.create_task(kernels.execute("cancel", "while True: pass"))
+        await asyncio.sleep(0.3)
+        job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+        assert kernel.process.pid != old_pid
+        assert (await kernels.execute("cancel", "print(1)"))[:2] == (True, "1\n")
+
+    async def test_cancel_while_queued_keeps_worker(self, kernels):
+        """Test cancelling a call still waiting for the kernel kills nothing."""
+        await kernels.execute("owner", "kept = 1")
+        queued = _neighbour(kernels, "owner")
+        kernel = kernels.kernel_for("owner")
+        pid, restarts = kernel.process.pid, kernel.restarts
+        running = asyncio.create_task(
+            kernels.execute("owner", "import time; time.sleep(0.5); print(kept)")
+        )
+        await asyncio.sleep(0.1)
+        waiting = asyncio.create_task(kernels.execute(queued, "print(2)"))
+        await asyncio.sleep(0.1)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert (await running)[:2] == (True, "1\n")
+        assert (kernel.process.pid, kernel.restarts) == (pid, restarts)
+        assert (await kernels.execute(queued, "print(2)"))[:2] == (True, "2\n")
+
+    async def test_run_timeout_starts_when_kernel_is_free(self, kernels):
+        """Test time spent queued does not count toward the run timeout."""
+        queued = _neighbour(kernels, "first")
+        first = asyncio.create_task(
+            kernels.execute("first", "import time; time.sleep(0.6)")
+        )
+        await asyncio.sleep(0.1)
+        ok, output, _ = await kernels.execute(queued, "print(3)", timeout=0.4)
+        assert (ok, output) == (True, "3\n")
+        assert (await first)[0]
+
+    async def test_busy_kernel_reported(self, kernels):
+        """Test a call queued past PYTHON_QUEUE_TIMEOUT returns without running."""
+        queued = _neighbour(kernels, "hog")
+        kernel = kernels.kernel_for("hog")
+        pid = kernel.process.pid
+        hog = asyncio.create_task(
+            kernels.execute("hog", "import time; time.sleep(0.5)")
+        )
+        await asyncio.sleep(0.1)
+        with patch.object(settings, "PYTHON_QUEUE_TIMEOUT", 0.1):
+            ok, output, usage = await kernels.execute(queued, "ran = True")
+
+        assert (ok, output, usage["limit"]) == (False, BUSY_MESSAGE, "busy")
+        assert (await hog)[0]
+        assert kernel.process.pid == pid
+        assert "NameError" in (await kernels.execute(queued, "print(ran)"))[1]
+
+    async def test_crash_restarts(self, kernels):
+        """Test a worker that dies is replaced."""
+        ok, output, _ = await kernels.execute("crash", "import os; os._exit(1)")
+        assert not ok
+        assert "crashed" in output
+        assert (await kernels.execute("crash", "print(2)"))[:2] == (True, "2\n")
+
+    async def test_release_unpins_session(self, kernels):
+        """Test release drops the session from its kernel."""
+        await kernels.execute("gone", "z = 1")
+        kernel = kernels.kernel_for("gone")
+        await kernels.release("gone")
+        assert "gone" not in kernel.sessions
+        assert "gone" not in kernels._session_kernels
+
+    async def test_reset_unknown_session(self, kernels):
+        """Test resetting a session that never ran code is a no-op."""
+        await kernels.reset("never-used")
+        assert "never-used" not in kernels._session_kernels
+
+    async def test_usage_reported(self, kernels):
+        """Test each run reports the CPU, memory, and output it used."""
+        ok, _, usage = await kernels.execute(
+            "usage",
+            "import time\nend = time.process_time() + 0.3\n"
+            "while time.process_time() < end: pass\nprint('x' * 99)",
+        )
+        assert ok
+        assert usage["cpu_seconds"] >= 0.3
+        assert usage["peak_rss_mb"] > 0
+        assert usage["output_bytes"] == 100
+        assert usage["wall_seconds"] >= usage["cpu_seconds"] * 0.9
+        assert usage["limit"] is None
+
+    async def test_cpu_limit(self, kernels):
+        """Test a run past its CPU time is stopped without losing the session."""
+        await kernels.execute("cpu", "kept = 1")
+        pid = kernels.kernel_for("cpu").process.pid
+        ok, output, usage = await kernels.execute("cpu", "while True: pass")
+        assert not ok
+        assert "CPULimitExceeded" in output
+        assert usage["limit"] == "cpu"
+        assert kernels.kernel_for("cpu").process.pid == pid
+        assert (await kernels.execute("cpu", "print(kept)"))[:2] == (True, "1\n")
+
+    async def test_memory_limit(self, kernels):
+        """Test a run allocating past the memory limit gets a clear MemoryError."""
+        ok, output, usage = await kernels.execute(
+            "memory", "data = bytearray(512 * 1024 * 1024)"
+        )
+        assert not ok
+        assert "MemoryError" in output
+        assert "at most 256 MB" in output
+        assert usage["limit"] == "memory"
+        ok, _, _ = await kernels.execute("memory", "data = bytearray(10 * 1024 * 1024)")
+        assert ok
+
+    async def test_output_limit(self, kernels):
+        """Test runaway printing is cut at the output limit and stopped."""
+        ok, output, usage = await kernels.execute(
+            "output", "for i in range(10**7): print(i)"
+        )
+        assert not ok
+        assert output.startswith("0\n1\n2\n")
+        assert "OutputLimitExceeded" in output
+        assert len(output.split("OutputLimitExceeded")[0]) <= 1001
+        assert usage["limit"] == "output"
+        assert usage["output_bytes"] > 1000
+
+    async def test_stderr_captured(self, kernels):
+        """Test warnings and stderr output are returned with stdout."""
+        ok, output, _ = await kernels.execute(
+            "stderr", "import sys; print('err', file=sys.stderr)"
+        )
+        assert (ok, output) == (True, "err\n")
+
+    async def test_stats(self, kernels):
+        """Test stats report per-kernel process metrics."""
+        stats = kernels.stats()
+        assert len(stats["kernels"]) == 2
+        assert all(k["alive"] for k in stats["kernels"])
+        assert sum(k["executions"] for k in stats["kernels"]) > 0
+        assert sum(k["cpu_seconds"] for k in stats["kernels"]) > 0
+        hits = [k["limit_hits"] for k in stats["kernels"]]
+        assert sum(h.get("wall", 0) for h in hits) == 1
@@ -0,0 +1,215 @@
+"""Tests for app/resources/page_pool.py"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.resources.page_pool import CLEAR_STORAGE_JS, PagePool
+
+
+def _make_browser():
+    """Create a fake browser whose contexts hand out fresh mock pages."""
+
+    async def new_context():
+        context = MagicMock()
+        context.close = AsyncMock()
+        context.clear_cookies = AsyncMock()
+
+        async def new_page():
+            page = MagicMock()
+            page.goto = AsyncMock()
+            page.evaluate = AsyncMock()
+            page.close = AsyncMock()
+            page.route = AsyncMock()
+            page.is_closed.return_value = False
+            return page
+
+        context.new_page = AsyncMock(side_effect=new_page)
+        return context
+
+    browser = MagicMock()
+    browser.new_context = AsyncMock(side_effect=new_context)
+    return browser
+
+
+class TestPagePool:
+    """Test cases for PagePool class."""
+
+    @pytest.mark.asyncio
+    async def test_start_creates_contexts_and_warm_pages(self):
+        """Test that start pre-creates contexts and idle pages."""
+        pool = PagePool(_make_browser(), contexts=2, max_pages=4)
+        await pool.start(warm_pages=3)
+
+        stats = pool.stats()
+        assert stats["contexts"] == 2
+        assert stats["idle"] == 3
+        assert stats["created"] == 3
+
+    @pytest.mark.asyncio
+    async def test_pages_have_console_listener(self):
+        """Test that pages are created with a console handler attached."""
+        pool = PagePool(_make_browser(), contexts=1, max_pages=2)
+        await pool.start(warm_pages=1)
+
+        async with pool.acquire() as pooled:
+            event, handler = pooled.page.on.call_args.args
+            assert event == "console"
+
+            arg = MagicMock()
+            arg.json_value = AsyncMock(return_value={"answer": 42})
+            await handler(MagicMock(type="log", args=[arg]))
+            assert '"answer": 42' in pooled.console_logs[0]
+
+    @pytest.mark.asyncio
+    async def test_page_reused_and_reset(self):
+        """Test that released pages are reset and handed out again."""
+        pool = PagePool(_make_browser(), contexts=1, max_pages=2)
+        await pool.start(warm_pages=1)
+
+        async with pool.acquire() as first:
+            first.console_logs.append("[log] old")
+        async with pool.acquire() as second:
+            assert second is first
+            assert second.console_logs == []
+
+        first.page.goto.assert_called_with("about:blank")
+        assert pool.stats()["created"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reset_clears_cookies_and_storage(self):
+        """Test that a released page does not carry cookies or storage forward."""
+        pool = PagePool(_make_browser(), contexts=1, max_pages=1)
+        await pool.start()
+
+        async with pool.acquire() as pooled:
+            pass
+
+        pooled.page.evaluate.assert_called_once_with(CLEAR_STORAGE_JS)
+        pooled.context.clear_cookies.assert_called_once()
+        assert pool.stats()["idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hung_page_recycled_on_reset(self, mocker):
+        """Test that a page that cannot clear its storage is closed, not reused."""
+        mocker.patch("app.resources.page_pool.settings.BROWSER_PAGE_TIMEOUT", 50)
+        pool = PagePool(_make_browser(), contexts=1, max_pages=1)
+        await pool.start()
+
+        async def hang(js):
+            await asyncio.sleep(10)
+
+        async with pool.acquire() as pooled:
+            pooled.page.evaluate.side_effect = hang
+
+        pooled.page.close.assert_called_once()
+        assert pool.stats()["recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_waits(self):
+        """Test that acquisitions beyond max_pages wait for a release."""
+        pool = PagePool(_make_browser(), contexts=1, max_pages=1)
+        await pool.start()
+        order = []
+
+        async def worker(name):
+            async with pool.acquire():
+                order.append(f"{name}-start")
+                await asyncio.sleep(0.05)
+                order.append(f"{name}-end")
+
+        await asyncio.gather(worker("a"), worker("b"))
+
+        assert order == ["a-start", "a-end", "b-start", "b-end"]
+        assert pool.stats()["wait_max_ms"] >= 40
+        assert pool.stats()["acquired"] == 2
+
+    @pytest.mark.asyncio
+    async def test_closed_page_is_recycled(self):
+        """Test that a page closed during use is dropped from the pool."""
+        pool = PagePool(_make_browser(), contexts=1, max_pages=2)
+        await pool.start()
+
+        async with pool.acquire() as pooled:
+            pooled.page.is_closed.return_value = True
+
+        assert pool.stats()["idle"] == 0
+        assert pool.stats()["recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_page_released_on_error(self):
+        """Test that the slot and page are released when the caller raises."""
+        pool = PagePool(_make_browser(), contexts=1, max_pages=1)
+        await pool.start()
+
+        with pytest.raises(ValueError):
+            async with pool.acquire():
+                raise ValueError("boom")
+
+        assert pool.stats()["in_use"] == 0
+        assert pool.stats()["idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_close_closes_contexts(self):
+        """Test that close closes every context."""
+        pool = PagePool(_make_browser(), contexts=2, max_pages=2)
+        await pool.start()
+        contexts = list(pool.contexts)
+
+        await pool.close()
+
+        for context in contexts:
+            context.close.assert_called_once()
+        assert pool.stats()["contexts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_router_attached_and_image_flag_reset(self):
+        """Test that pages route through the router and images are re-blocked on release."""
+        router = MagicMock()
+        router.handle = AsyncMock()
+        pool = PagePool(_make_browser(), contexts=1, max_pages=1, router=router)
+        await pool.start()
+
+        async with pool.acquire() as pooled:
+            pooled.allow_images = True
+            pattern, handler = pooled.page.route.call_args[0]
+            assert pattern == "**/*"
+            await handler("route")
+            router.handle.assert_called_once_with("route", True)
+            pooled.page.on.assert_any_call("response", router.observe)
+
+        assert pooled.allow_images is False
+
+    @pytest.mark.asyncio
+    async def test_session_pages_do_not_take_slots(self):
+        """Test that open session pages leave the one-off page slots free."""
+        pool = PagePool(_make_browser(), contexts=1, max_pages=1)
+        await pool.start()
+
+        sessions = [await pool.open_session() for _ in range(3)]
+        async with asyncio.timeout(1):
+            async with pool.acquire():
+                pass
+
+        assert pool.stats()["sessions"] == 3
+        assert pool.stats()["in_use"] == 0
+        for pooled in sessions:
+            await pool.close_session(pooled)
+        assert pool.stats()["sessions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_session_pages_get_own_context(self):
+        """Test that each session has its own context, closed with the session."""
+        pool = PagePool(_make_browser(), contexts=1, max_pages=2)
+        await pool.start()
+
+        first = await pool.open_session()
+        second = await pool.open_session()
+        assert first.context is not second.context
+        assert first.context not in pool.contexts
+
+        await pool.close_session(first)
+        first.context.close.assert_called_once()
+        await pool.close()
+        second.context.close.assert_called_once()
@@ -0,0 +1,107 @@
+"""Tests for app/resources/readiness.py"""
+
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from playwright.async_api import Error as PlaywrightError
+
+from app.resources.readiness import RequestTracker, load_page
+
+
+@pytest.fixture
+def mock_settings(mocker):
+    settings = MagicMock()
+    settings.READINESS_QUIET_MS = 300
+    settings.READINESS_TIMEOUT_MS = 500
+    settings.READINESS_LONG_REQUEST_MS = 2000
+    settings.READINESS_SELECTORS = {}
+    mocker.patch("app.resources.readiness.settings", settings)
+    return settings
+
+
+def _request(resource_type):
+    request = MagicMock()
+    request.resource_type = resource_type
+    return request
+
+
+def _page(quiet_ms):
+    page = MagicMock()
+    page.goto = AsyncMock()
+    page.wait_for_selector = AsyncMock()
+    page.evaluate = AsyncMock(side_effect=quiet_ms)
+    return page
+
+
+class TestRequestTracker:
+    def test_tracks_scripts_and_xhr_only(self, mock_settings):
+        tracker = RequestTracker()
+        xhr, image = _request("xhr"), _request("image")
+        tracker._on_request(xhr)
+        tracker._on_request(image)
+
+        assert tracker.busy() is True
+        tracker._on_done(xhr)
+        assert tracker.busy() is False
+
+    def test_ignores_long_polls(self, mock_settings):
+        tracker = RequestTracker()
+        request = _request("fetch")
+        tracker._on_request(request)
+        tracker.pending[request] = time.perf_counter() - 5
+
+        assert tracker.busy() is False
+
+
+class TestLoadPage:
+    @pytest.mark.asyncio
+    async def test_returns_once_dom_is_quiet(self, mock_settings):
+        page = _page([0, 100, 350])
+
+        ready_ms = await load_page(page, "http://example.com/q1")
+
+        page.goto.assert_called_once_with(
+            "http://example.com/q1", wait_until="domcontentloaded"
+        )
+        assert page.evaluate.call_count == 3
+        assert ready_ms < mock_settings.READINESS_TIMEOUT_MS
+        page.remove_listener.assert_called()
+
+    @pytest.mark.asyncio
+    async def test_waits_for_domain_selector(self, mock_settings):
+        mock_settings.READINESS_SELECTORS = {"example.com": "#question"}
+        page = _page([400])
+
+        await load_page(page, "http://example.com/q1")
+
+        assert page.wait_for_selector.call_args[0][0] == "#question"
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_timeout(self, mock_settings):
+        mock_settings.READINESS_TIMEOUT_MS = 100
+        page = _page(lambda script: 0)
+
+        ready_ms = await load_page(page, "http://example.com/q1")
+
+        assert ready_ms >= 100
+
+    @pytest.mark.asyncio
+    async def test_navigation_during_poll_restarts_quiet_wait(self, mock_settings):
+        destroyed = PlaywrightError(
+            "Execution context was destroyed, most likely because of a navigation"
+        )
+        page = _page([100, destroyed, 350])
+
+        ready_ms = await load_page(page, "http://example.com/q1")
+
+        assert page.evaluate.call_count == 3
+        assert ready_ms < mock_settings.READINESS_TIMEOUT_MS
+
+    @pytest.mark.asyncio
+    async def test_other_evaluate_errors_propagate(self, mock_settings):
+        page = _page(
+            [PlaywrightError("Target page, context or browser has been closed")]
+        )
+
+        with pytest.raises(PlaywrightError):
+            await load_page(page, "http://example.com/q1")
@@ -0,0 +1,112 @@
+"""Tests for app/resources/responses.py"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.resources.responses import ResponseRecorder
+
+
+@pytest.fixture(autouse=True)
+def mock_settings(tmp_path, mocker):
+    settings = MagicMock()
+    settings.TEMP_DIR = tmp_path
+    settings.RESPONSE_CAPTURE_TYPES = ["application/json", "text/csv"]
+    settings.RESPONSE_CAPTURE_MAX_BYTES = 100
+    settings.MAX_FILE_SIZE_MB = 1
+    mocker.patch("app.resources.responses.settings", settings)
+    return settings
+
+
+def _response(url, content_type, body, status=200, navigation=False):
+    response = MagicMock()
+    response.url = url
+    response.status = status
+    response.headers = {"content-type": content_type}
+    response.request.is_navigation_request.return_value = navigation
+    response.request.sizes = AsyncMock(return_value={"responseBodySize": len(body)})
+    response.body = AsyncMock(return_value=body)
+    return response
+
+
+class TestResponseRecorder:
+    @pytest.mark.asyncio
+    async def test_saves_data_responses(self, tmp_path):
+        recorder = ResponseRecorder()
+        recorder._on_response(
+            _response("http://x.com/api/data", "application/json; charset=utf-8", b"{}")
+        )
+        recorder._on_response(_response("http://x.com/files/a.csv", "text/csv", b"a,b"))
+
+        saved = await recorder.save()
+
+        assert [r["url"] for r in saved] == [
+            "http://x.com/api/data",
+            "http://x.com/files/a.csv",
+        ]
+        assert saved[0]["path"].endswith("_data.json")
+        assert saved[1]["path"].endswith("_a.csv")
+        assert (tmp_path / saved[1]["path"].split("/")[-1]).read_bytes() == b"a,b"
+
+    @pytest.mark.asyncio
+    async def test_ignores_other_responses(self):
+        recorder = ResponseRecorder()
+        recorder._on_response(_response("http://x.com/app.js", "text/javascript", b""))
+        recorder._on_response(
+            _response("http://x.com/", "application/json", b"", navigation=True)
+        )
+        recorder._on_response(
+            _response("http://x.com/e", "application/json", b"", status=404)
+        )
+
+        assert await recorder.save() == []
+
+    @pytest.mark.asyncio
+    async def test_respects_byte_budget(self):
+        recorder = ResponseRecorder()
+        recorder._on_response(
+            _response("http://x.com/a.json", "application/json", b"1" * 80)
+        )
+        recorder._on_response(
+            _response("http://x.com/b.json", "application/json", b"2" * 80)
+        )
+        recorder._on_response(
+            _response("http://x.com/c.json", "application/json", b"3" * 10)
+        )
+
+        saved = await recorder.save()
+
+        assert [r["size"] for r in saved] == [80, 10]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_urls_recorded_once(self):
+        recorder = ResponseRecorder()
+        for _ in range(2):
+            recorder._on_response(
+                _response("http://x.com/a.json", "application/json", b"{}")
+            )
+
+        assert len(await recorder.save()) == 1
+
+    @pytest.mark.asyncio
+    async def test_large_body_without_length_not_read(self, mock_settings):
+        mock_settings.RESPONSE_CAPTURE_MAX_BYTES = 10 * 1024 * 1024
+        recorder = ResponseRecorder()
+        big = _response("http://x.com/big.json", "application/json", b"1" * 2**21)
+        small = _response("http://x.com/small.json", "application/json", b"{}")
+        recorder._on_response(big)
+        recorder._on_response(small)
+
+        saved = await recorder.save()
+
+        assert [r["url"] for r in saved] == ["http://x.com/small.json"]
+        big.body.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unknown_size_not_read(self):
+        recorder = ResponseRecorder()
+        response = _response("http://x.com/a.json", "application/json", b"{}")
+        response.request.sizes.side_effect = Exception("request was cancelled")
+        recorder._on_response(response)
+
+        assert await recorder.save() == []
+        response.body.assert_not_called()
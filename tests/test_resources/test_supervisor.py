@@ -0,0 +1,128 @@
+"""Tests for app/resources/supervisor.py"""
+
+import asyncio
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.resources.supervisor import BrowserSupervisor, chromium_rss_mb
+
+
+@pytest.fixture
+def mock_settings(mocker):
+    settings = MagicMock()
+    settings.BROWSER_PROBE_TIMEOUT = 0.1
+    settings.BROWSER_RECYCLE_PAGES = 100
+    settings.BROWSER_MAX_MEMORY_MB = 1000
+    mocker.patch("app.resources.supervisor.settings", settings)
+    return settings
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.cdp_endpoint = None
+    client.browser.is_connected.return_value = True
+    context = MagicMock()
+    context.close = AsyncMock()
+    client.browser.new_context = AsyncMock(return_value=context)
+    client.restart = AsyncMock()
+    client.health = {"pages_since_restart": 0, "memory_mb": None}
+    return client
+
+
+class TestBrowserSupervisor:
+    @pytest.mark.asyncio
+    async def test_healthy_browser_is_left_alone(self, client, mock_settings, mocker):
+        mocker.patch("app.resources.supervisor.chromium_rss_mb", return_value=200.0)
+
+        await BrowserSupervisor(client).check()
+
+        client.restart.assert_not_called()
+        assert client.health["memory_mb"] == 200.0
+        assert client.health["last_probe_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_disconnected_browser_restarts(self, client, mock_settings):
+        client.browser.is_connected.return_value = False
+
+        await BrowserSupervisor(client).check()
+
+        client.restart.assert_called_once_with("crash")
+
+    @pytest.mark.asyncio
+    async def test_hung_browser_restarts(self, client, mock_settings):
+        async def hang():
+            await asyncio.sleep(1)
+
+        client.browser.new_context = AsyncMock(side_effect=hang)
+
+        await BrowserSupervisor(client).check()
+
+        client.restart.assert_called_once_with("hang")
+
+    @pytest.mark.asyncio
+    async def test_recycles_after_page_limit(self, client, mock_settings, mocker):
+        mocker.patch("app.resources.supervisor.chromium_rss_mb", return_value=None)
+        client.health["pages_since_restart"] = 100
+
+        await BrowserSupervisor(client).check()
+
+        client.restart.assert_called_once_with("pages")
+
+    @pytest.mark.asyncio
+    async def test_recycles_above_memory_limit(self, client, mock_settings, mocker):
+        mocker.patch("app.resources.supervisor.chromium_rss_mb", return_value=1200.0)
+
+        await BrowserSupervisor(client).check()
+
+        client.restart.assert_called_once_with("memory")
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, client, mock_settings):
+        mock_settings.BROWSER_HEALTH_INTERVAL = 60
+        supervisor = BrowserSupervisor(client)
+
+        supervisor.start()
+        assert supervisor._task is not None
+        await supervisor.stop()
+        assert supervisor._task is None
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs /proc")
+def test_chromium_rss_without_browser():
+    assert chromium_rss_mb() == 0.0
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs /proc")
+def test_chromium_rss_counts_only_marked_shard(mocker):
+    mib = 1024 * 1024
+    me = __import__("os").getpid()
+    mocker.patch(
+        "app.resources.supervisor._process_table",
+        return_value={
+            10: (me, "node", 50 * mib),
+            11: (10, "chrome", 100 * mib),  # shard a
+            12: (11, "chrome", 30 * mib),  # shard a renderer
+            21: (10, "chrome", 200 * mib),  # shard b
+            22: (21, "chrome", 70 * mib),
+        },
+    )
+    mocker.patch(
+        "app.resources.supervisor._cmdline",
+        side_effect=lambda pid: {11: "chrome --shard=a", 21: "chrome --shard=b"}.get(
+            pid, "chrome --type=renderer"
+        ),
+    )
+
+    assert chromium_rss_mb("--shard=a") == 130.0
+    assert chromium_rss_mb() == 400.0
+
+
+def test_remote_browser_memory_is_not_measured(client, mock_settings, mocker):
+    client.cdp_endpoint = "http://browser:9222"
+    rss = mocker.patch("app.resources.supervisor.chromium_rss_mb", return_value=5000.0)
+
+    assert BrowserSupervisor(client)._recycle_reason() is None
+    rss.assert_not_called()
+    assert client.health["memory_mb"] is None
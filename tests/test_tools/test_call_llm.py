@@ -1,5 +1,6 @@
 """Tests for app/tools/call_llm.py"""
 
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 
@@ -9,6 +10,10 @@ from app.tools.call_llm import (
     _build_file_content,
     _validate_files,
     _call_gemini,
+    _call_with_retry,
+    _map_reduce_gemini,
+    _analyze_media,
+    _split_media,
 )
 
 
@@ -256,3 +261,295 @@ class TestCallLLMWithMultipleFilesTool:
         )
 
         assert "Error" in result
+
+
+class TestMapReduce:
+    """Test cases for map-reduce multi-file analysis."""
+
+    @staticmethod
+    def _mock_client(mocker, responder):
+        """Patch the Gemini client so each call returns responder(messages)."""
+
+        def create(**kwargs):
+            completion = MagicMock()
+            completion.choices = [MagicMock()]
+            completion.choices[0].message.content = responder(kwargs["messages"])
+            return completion
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.side_effect = create
+        mocker.patch("app.tools.call_llm.get_gemini_client", return_value=mock_client)
+
+        manager = MagicMock()
+        manager.get_next_key.return_value = "key"
+        manager.healthy_count.return_value = 2
+        mocker.patch("app.tools.call_llm.gemini_key_manager", manager)
+        return mock_client
+
+    def test_maps_each_file_then_reduces(self, tmp_path, mocker):
+        """Test one map call per file followed by a single reduce call."""
+        files = []
+        for i in range(3):
+            f = tmp_path / f"file{i}.txt"
+            f.write_text(f"value {i}")
+            files.append(str(f))
+
+        def responder(messages):
+            content = messages[1]["content"]
+            if len(content) == 1:
+                return "REDUCED"
+            return "partial:" + content[1]["text"].split("---\n")[1].split("\n")[0]
+
+        mock_client = self._mock_client(mocker, responder)
+        mocker.patch("app.tools.call_llm.is_text_file", return_value=True)
+
+        result = _map_reduce_gemini("Sum the values", files)
+
+        assert result == "REDUCED"
+        assert mock_client.chat.completions.create.call_count == 4
+        reduce_text = mock_client.chat.completions.create.call_args.kwargs["messages"][
+            1
+        ]["content"][0]["text"]
+        for i in range(3):
+            assert f"partial:value {i}" in reduce_text
+        assert reduce_text.index("file0.txt") < reduce_text.index("file2.txt")
+
+    def test_size_limit_applies_per_file(self, tmp_path, mocker):
+        """Test that combined size above the limit still works per file."""
+        file1 = tmp_path / "file1.bin"
+        file2 = tmp_path / "file2.bin"
+        file1.write_bytes(b"x" * (3 * 1024 * 1024))
+        file2.write_bytes(b"x" * (3 * 1024 * 1024))
+
+        self._mock_client(mocker, lambda messages: "ok")
+        mocker.patch("app.tools.call_llm.is_text_file", return_value=False)
+        mocker.patch(
+            "app.tools.call_llm.create_data_uri", return_value="data:x;base64,"
+        )
+
+        assert "too large" in _call_gemini("Analyze", [str(file1), str(file2)])
+        assert _map_reduce_gemini("Analyze", [str(file1), str(file2)]) == "ok"
+
+    def test_failed_parts_marked_in_reduce(self, tmp_path, mocker):
+        """Test that a failed map result is not passed off as file content."""
+        files = [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+        for f in files:
+            Path(f).write_text("x")
+        mocker.patch(
+            "app.tools.call_llm._run_parallel",
+            return_value=["Error: quota exceeded", "found 42"],
+        )
+        call_gemini = mocker.patch(
+            "app.tools.call_llm._call_gemini", return_value="merged"
+        )
+
+        assert _map_reduce_gemini("Find the number", files) == "merged"
+        reduce_prompt = call_gemini.call_args.args[0]
+        assert "quota exceeded" not in reduce_prompt
+        assert "failed" in reduce_prompt
+        assert "found 42" in reduce_prompt
+
+    def test_all_parts_failed_skips_reduce(self, tmp_path, mocker):
+        """Test that no reduce call is made when every part failed."""
+        files = [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+        for f in files:
+            Path(f).write_text("x")
+        mocker.patch(
+            "app.tools.call_llm._run_parallel",
+            return_value=["Error: quota exceeded", "Error: timed out"],
+        )
+        call_gemini = mocker.patch("app.tools.call_llm._call_gemini")
+
+        result = _map_reduce_gemini("Find the number", files)
+
+        assert result.startswith("Error:")
+        assert "a.txt" in result and "timed out" in result
+        call_gemini.assert_not_called()
+
+    def test_missing_file(self, tmp_path):
+        """Test error when a file is missing."""
+        result = _map_reduce_gemini("Analyze", [str(tmp_path / "missing.txt")])
+
+        assert "not found" in result.lower()
+
+    def test_map_retries_on_another_key(self, tmp_path, mocker):
+        """Test that a failing key is marked unhealthy and the call retried."""
+        text_file = tmp_path / "test.txt"
+        text_file.write_text("content")
+
+        manager = MagicMock()
+        manager.get_next_key.side_effect = ["bad", "good"]
+        mocker.patch("app.tools.call_llm.gemini_key_manager", manager)
+        mocker.patch(
+            "app.tools.call_llm._call_gemini",
+            side_effect=[Exception("quota"), "extracted"],
+        )
+
+        assert _call_with_retry("Analyze", [str(text_file)]) == "extracted"
+        manager.mark_unhealthy.assert_called_once_with("bad")
+
+    def test_tool_uses_map_reduce_flag(self, tmp_path, mocker):
+        """Test that the tool only fans out when map_reduce is set."""
+        file1 = tmp_path / "file1.txt"
+        file2 = tmp_path / "file2.txt"
+        file1.write_text("a")
+        file2.write_text("b")
+
+        map_reduce = mocker.patch(
+            "app.tools.call_llm._map_reduce_gemini", return_value="mapped"
+        )
+        mocker.patch("app.tools.call_llm._call_gemini", return_value="single")
+
+        args = {"file_paths": [str(file1), str(file2)], "prompt": "Compare"}
+        assert call_llm_with_multiple_files_tool.invoke(args) == "single"
+        assert (
+            call_llm_with_multiple_files_tool.invoke({**args, "map_reduce": True})
+            == "mapped"
+        )
+        map_reduce.assert_called_once()
+
+
+class TestAnalyzeMedia:
+    """Test cases for chunked audio/video analysis."""
+
+    def test_non_chunkable_returns_none(self, tmp_path, mocker):
+        """Test that short media is left for the whole-file path."""
+        audio = tmp_path / "short.wav"
+        audio.write_bytes(b"")
+        mocker.patch("app.tools.call_llm.split_audio", return_value=None)
+
+        assert _analyze_media("Transcribe", str(audio)) is None
+
+    def test_audio_segments_merged_in_order(self, tmp_path, mocker):
+        """Test that segment results are reduced in chronological order."""
+        audio = tmp_path / "long.wav"
+        audio.write_bytes(b"")
+        segments = [
+            (0.0, 62.0, ["/tmp/seg0.wav"]),
+            (60.0, 122.0, ["/tmp/seg1.wav"]),
+        ]
+        mocker.patch("app.tools.call_llm.split_audio", return_value=segments)
+        run_parallel = mocker.patch(
+            "app.tools.call_llm._run_parallel", return_value=["first", "second"]
+        )
+        call_gemini = mocker.patch(
+            "app.tools.call_llm._call_gemini", return_value="merged"
+        )
+
+        result = _analyze_media("Transcribe", str(audio))
+
+        assert result == "merged"
+        jobs = run_parallel.call_args.args[0]
+        assert [paths for _, paths in jobs] == [["/tmp/seg0.wav"], ["/tmp/seg1.wav"]]
+        assert "part 1 of 2" in jobs[0][0]
+        reduce_prompt = call_gemini.call_args.args[0]
+        assert reduce_prompt.index("first") < reduce_prompt.index("second")
+        assert "[01:00-02:02]" in reduce_prompt
+
+    def test_all_segments_failed_returns_error(self, tmp_path, mocker):
+        """Test that media analysis reports failure instead of reducing errors."""
+        audio = tmp_path / "long.wav"
+        audio.write_bytes(b"")
+        segments = [(0.0, 62.0, ["/tmp/seg0.wav"]), (60.0, 122.0, ["/tmp/seg1.wav"])]
+        mocker.patch("app.tools.call_llm.split_audio", return_value=segments)
+        mocker.patch(
+            "app.tools.call_llm._run_parallel", return_value=["Error: a", "Error: b"]
+        )
+        call_gemini = mocker.patch("app.tools.call_llm._call_gemini")
+
+        assert _analyze_media("Transcribe", str(audio)).startswith("Error:")
+        call_gemini.assert_not_called()
+
+    def test_video_within_limits_sent_whole(self, tmp_path, mocker):
+        """Test that a video under the size and duration limits is not split."""
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b"x" * 1024)
+        mock_settings = MagicMock()
+        mock_settings.MAX_FILE_SIZE_MB = 5
+        mock_settings.VIDEO_MAX_INLINE_SECONDS = 600
+        mocker.patch("app.tools.call_llm.settings", mock_settings)
+        mocker.patch("app.tools.call_llm.get_video_duration", return_value=300.0)
+        sample = mocker.patch("app.tools.call_llm.sample_video_keyframes")
+
+        assert _split_media(str(video)) is None
+        sample.assert_not_called()
+
+        mock_settings.VIDEO_MAX_INLINE_SECONDS = 120
+        _split_media(str(video))
+        sample.assert_called_once_with(str(video))
+
+    def test_video_segment_prompt_mentions_audio(self, tmp_path, mocker):
+        """Test that keyframe segments with an audio chunk ask for a transcript."""
+        video = tmp_path / "long.mp4"
+        video.write_bytes(b"")
+        segments = [
+            (0.0, 20.0, ["/tmp/f0.jpg", "/tmp/f1.jpg", "/tmp/a0.mp3"]),
+            (20.0, 40.0, ["/tmp/f2.jpg", "/tmp/f3.jpg"]),
+        ]
+        mocker.patch("app.tools.call_llm._split_media", return_value=segments)
+        run_parallel = mocker.patch(
+            "app.tools.call_llm._run_parallel", return_value=["a", "b"]
+        )
+        mocker.patch("app.tools.call_llm._call_gemini", return_value="merged")
+
+        _analyze_media("Describe", str(video))
+
+        (with_audio, _), (frames_only, _) = run_parallel.call_args.args[0]
+        assert "These 2 frames" in with_audio and "audio" in with_audio
+        assert "These 2 frames" in frames_only and "audio" not in frames_only
+
+    def test_call_llm_tool_uses_media_pipeline(self, tmp_path, mocker):
+        """Test that call_llm_tool returns the chunked result when available."""
+        audio = tmp_path / "long.mp3"
+        audio.write_bytes(b"ID3")
+        mocker.patch("app.tools.call_llm._analyze_media", return_value="chunked")
+        call_gemini = mocker.patch("app.tools.call_llm._call_gemini")
+
+        result = call_llm_tool.invoke({"file_path": str(audio), "prompt": "Listen"})
+
+        assert result == "chunked"
+        call_gemini.assert_not_called()
+
+
+class TestLocalDecode:
+    """Test cases for the local QR/barcode fast path in call_llm_tool."""
+
+    def test_returns_decoded_codes_without_gemini(self, tmp_path, mocker):
+        """Test that decoded codes are returned without a network call."""
+        image = tmp_path / "qr.png"
+        image.write_bytes(b"\x89PNG")
+        mocker.patch(
+            "app.tools.call_llm.decode_codes",
+            return_value=[{"type": "QRCODE", "data": "hello"}],
+        )
+        call_gemini = mocker.patch("app.tools.call_llm._call_gemini")
+
+        result = call_llm_tool.invoke({"file_path": str(image), "prompt": "Read it"})
+
+        assert "hello" in result
+        call_gemini.assert_not_called()
+
+    def test_falls_back_to_gemini_when_nothing_found(self, tmp_path, mocker):
+        """Test that Gemini is used when no code is found."""
+        image = tmp_path / "photo.png"
+        image.write_bytes(b"\x89PNG")
+        mocker.patch("app.tools.call_llm.decode_codes", return_value=[])
+        mocker.patch("app.tools.call_llm._call_gemini", return_value="a cat")
+
+        result = call_llm_tool.invoke({"file_path": str(image), "prompt": "Describe"})
+
+        assert result == "a cat"
+
+    def test_local_decode_disabled(self, tmp_path, mocker):
+        """Test that local_decode=False skips the fast path."""
+        image = tmp_path / "qr.png"
+        image.write_bytes(b"\x89PNG")
+        decode = mocker.patch("app.tools.call_llm.decode_codes")
+        mocker.patch("app.tools.call_llm._call_gemini", return_value="llm")
+
+        result = call_llm_tool.invoke(
+            {"file_path": str(image), "prompt": "Describe", "local_decode": False}
+        )
+
+        assert result == "llm"
+        decode.assert_not_called()
@@ -0,0 +1,67 @@
+"""Tests for app/tools/capture.py"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.tools.capture import create_capture_tool
+
+
+def _capture_result(**overrides):
+    data = {"html": "", "text": "", "screenshot_path": None, "aria_snapshot": None}
+    data.update(overrides)
+    return data
+
+
+@pytest.fixture
+def browser_client():
+    client = MagicMock()
+    client.capture = AsyncMock()
+    return client
+
+
+@pytest.fixture(autouse=True)
+def temp_dir(tmp_path, mocker):
+    mock_settings = MagicMock()
+    mock_settings.TEMP_DIR = tmp_path
+    mocker.patch("app.tools.capture.settings", mock_settings)
+    return tmp_path
+
+
+class TestCapturePageTool:
+    @pytest.mark.asyncio
+    async def test_full_page_screenshot_on_session(self, browser_client):
+        browser_client.capture.return_value = _capture_result(
+            screenshot_path="/tmp/x_full.jpg"
+        )
+        tool = create_capture_tool(browser_client, "s1")
+
+        result = await tool.ainvoke({"url": "http://example.com/q1"})
+
+        assert "/tmp/x_full.jpg" in result
+        browser_client.capture.assert_called_once_with(
+            "http://example.com/q1", ["screenshot"], session_id="s1", full_page=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_saves_html_and_inlines_aria(self, browser_client, temp_dir):
+        browser_client.capture.return_value = _capture_result(
+            html="<p>hi</p>", aria_snapshot='- paragraph: "hi"'
+        )
+        tool = create_capture_tool(browser_client)
+
+        result = await tool.ainvoke(
+            {"url": "http://example.com/q1", "outputs": "html, aria"}
+        )
+
+        assert '- paragraph: "hi"' in result
+        saved = list(temp_dir.glob("*_capture.html"))
+        assert saved and saved[0].read_text() == "<p>hi</p>"
+
+    @pytest.mark.asyncio
+    async def test_reports_errors(self, browser_client):
+        browser_client.capture.side_effect = ValueError("Unknown capture output")
+        tool = create_capture_tool(browser_client)
+
+        result = await tool.ainvoke({"url": "http://example.com", "outputs": "pdf"})
+
+        assert result.startswith("Capture Error")
@@ -0,0 +1,116 @@
+"""Tests for app/tools/crawl.py"""
+
+import asyncio
+import csv
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.tools.crawl import create_crawl_tool, crawl, merge_tables
+
+BASE = "http://example.com"
+
+
+def _listing(page, last=3):
+    next_link = f'<a href="/list?page={page + 1}">next</a>' if page < last else ""
+    return (
+        f"<html><head><title>Page {page}</title></head><body>"
+        f"<table><tr><th>id</th><th>value</th></tr>"
+        f"<tr><td>{page}</td><td>{page * 10}</td></tr></table>"
+        f'<a href="/about">about</a>{next_link}</body></html>'
+    )
+
+
+@pytest.fixture
+def browser_client():
+    client = MagicMock()
+    client.active = 0
+    client.peak = 0
+
+    async def fetch(url, outputs=None):
+        client.active += 1
+        client.peak = max(client.peak, client.active)
+        await asyncio.sleep(0.01)
+        client.active -= 1
+        if "missing" in url:
+            raise RuntimeError("404")
+        page = int(url.split("page=")[1]) if "page=" in url else 1
+        return {"html": _listing(page), "text": f"Page {page} text"}
+
+    client.fetch_page_content = AsyncMock(side_effect=fetch)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def mock_settings(tmp_path, mocker):
+    settings = MagicMock()
+    settings.TEMP_DIR = tmp_path
+    settings.CRAWL_CONCURRENCY = 2
+    settings.CRAWL_MAX_PAGES = 50
+    mocker.patch("app.tools.crawl.settings", settings)
+    return settings
+
+
+class TestCrawl:
+    @pytest.mark.asyncio
+    async def test_follows_matching_links(self, browser_client):
+        pages = await crawl(browser_client, [f"{BASE}/list?page=1"], r"page=\d+")
+
+        assert [p["title"] for p in pages] == ["Page 1", "Page 2", "Page 3"]
+        assert all("/about" not in p["url"] for p in pages)
+
+    @pytest.mark.asyncio
+    async def test_respects_max_pages_and_concurrency(self, browser_client):
+        urls = [f"{BASE}/list?page={i}" for i in range(1, 9)]
+        pages = await crawl(browser_client, urls, max_pages=5)
+
+        assert len(pages) == 5
+        assert browser_client.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_pages_reported(self, browser_client):
+        pages = await crawl(browser_client, [f"{BASE}/missing", f"{BASE}/list?page=2"])
+
+        assert pages[0] == {"url": f"{BASE}/missing", "error": "404"}
+        assert pages[1]["title"] == "Page 2"
+
+
+def test_merge_tables_by_header():
+    pages = [
+        {"url": "a", "tables": ["id,value\n1,10"]},
+        {"url": "b", "tables": ["id,value\n2,20", "x\n1"]},
+        {"url": "c", "error": "404"},
+    ]
+    assert merge_tables(pages) == [
+        [["id", "value", "source_url"], ["1", "10", "a"], ["2", "20", "b"]],
+        [["x", "source_url"], ["1", "b"]],
+    ]
+
+
+class TestCrawlPagesTool:
+    @pytest.mark.asyncio
+    async def test_writes_pages_and_merged_table(self, browser_client, tmp_path):
+        tool = create_crawl_tool(browser_client)
+
+        result = await tool.ainvoke(
+            {"seed_url": f"{BASE}/list?page=1", "link_pattern": r"page=\d+"}
+        )
+
+        assert "Crawled 3 page(s)" in result
+        assert "Page 3 text" in result
+        pages = json.loads(next(tmp_path.glob("crawl_*.json")).read_text())
+        assert len(pages) == 3
+        with open(next(tmp_path.glob("crawl_*_table1.csv"))) as f:
+            rows = list(csv.reader(f))
+        assert [r[1] for r in rows] == ["value", "10", "20", "30"]
+
+    @pytest.mark.asyncio
+    async def test_requires_urls(self, browser_client):
+        tool = create_crawl_tool(browser_client)
+        assert "provide seed_url or urls" in await tool.ainvoke({})
+
+    @pytest.mark.asyncio
+    async def test_invalid_pattern(self, browser_client):
+        tool = create_crawl_tool(browser_client)
+        result = await tool.ainvoke({"seed_url": BASE, "link_pattern": "("})
+        assert "invalid link_pattern" in result
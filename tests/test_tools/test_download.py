@@ -1,10 +1,13 @@
 """Tests for app/tools/download.py"""
 
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
 
+from app.tools import download
 from app.tools.download import download_file_tool
 
 
@@ -142,6 +145,34 @@ class TestDownloadFileTool:
 
         assert "myfile.csv" in result
 
+    def test_same_name_from_different_urls_kept_apart(self, mocker, tmp_path):
+        """Test that files with the same name from different URLs do not collide."""
+        mocker.patch("app.tools.download.settings.TEMP_DIR", tmp_path)
+
+        def stream(method, url, follow_redirects):
+            response = MagicMock()
+            response.headers = {"Content-Type": "text/csv"}
+            response.url = url
+            response.iter_bytes = MagicMock(return_value=[url.encode()])
+            mock_stream = MagicMock()
+            mock_stream.__enter__ = MagicMock(return_value=response)
+            mock_stream.__exit__ = MagicMock(return_value=False)
+            return mock_stream
+
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.stream = MagicMock(side_effect=stream)
+        mocker.patch("httpx.Client", return_value=mock_client)
+
+        first = download_file_tool.invoke({"url": "http://a.com/data.csv"})
+        second = download_file_tool.invoke({"url": "http://b.com/data.csv"})
+
+        assert first != second
+        assert Path(first).name.endswith("_data.csv")
+        assert Path(first).read_bytes() == b"http://a.com/data.csv"
+        assert Path(second).read_bytes() == b"http://b.com/data.csv"
+
     def test_http_error(self, mocker, tmp_path):
         """Test handling of HTTP errors."""
         mocker.patch("app.tools.download.settings.TEMP_DIR", tmp_path)
@@ -186,6 +217,7 @@ class TestDownloadFileTool:
         result = download_file_tool.invoke({"url": "http://example.com/file.bin"})
 
         assert "aborted" in result.lower() or "Exceeded" in result
+        assert list(tmp_path.iterdir()) == []
 
     def test_sanitizes_filename(self, mocker, tmp_path):
         """Test that dangerous characters are sanitized from filename."""
@@ -216,3 +248,96 @@ class TestDownloadFileTool:
 
         # Should not contain path traversal
         assert ".." not in Path(result).name if "Error" not in result else True
+
+
+class TestInFlightDedupe:
+    """Test cases for sharing one download between concurrent callers."""
+
+    def test_waits_for_in_flight_download(self, mocker):
+        """Test that a second caller reuses the result of the running download."""
+        cache = {}
+        mocker.patch(
+            "app.tools.download.cache_get",
+            side_effect=lambda key, ttl_seconds: (key in cache, cache.get(key)),
+        )
+        started, release = threading.Event(), threading.Event()
+
+        def slow_download(url, max_bytes, data_only):
+            started.set()
+            release.wait(5)
+            cache[download.get_cache_key("download_file", url)] = "/tmp/data.csv"
+            return "/tmp/data.csv"
+
+        fake = mocker.patch("app.tools.download._download", side_effect=slow_download)
+        results = []
+        first = threading.Thread(
+            target=lambda: results.append(download.download_file("http://x.com/d.csv"))
+        )
+        first.start()
+        started.wait(5)
+        second = threading.Thread(
+            target=lambda: results.append(download.download_file("http://x.com/d.csv"))
+        )
+        second.start()
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        assert results == ["/tmp/data.csv", "/tmp/data.csv"]
+        assert fake.call_count == 1
+        assert download._in_flight == {}
+
+    def test_takes_over_after_failed_download(self, mocker):
+        """Test that one waiter takes over a failed download and the rest reuse it."""
+        cache = {}
+        mocker.patch(
+            "app.tools.download.cache_get",
+            side_effect=lambda key, ttl_seconds: (key in cache, cache.get(key)),
+        )
+        started, release = threading.Event(), threading.Event()
+        running, overlaps = [], []
+
+        def download_once(url, max_bytes, data_only):
+            overlaps.append(len(running))
+            running.append(url)
+            try:
+                if data_only:
+                    started.set()
+                    release.wait(5)
+                    return f"Not a data file: {url} returned text/html"
+                time.sleep(0.1)
+                cache[download.get_cache_key("download_file", url)] = "/tmp/page.html"
+                return "/tmp/page.html"
+            finally:
+                running.remove(url)
+
+        fake = mocker.patch("app.tools.download._download", side_effect=download_once)
+        results = {}
+        prefetch = threading.Thread(
+            target=lambda: results.setdefault(
+                "prefetch", download.download_file("http://x.com/p", data_only=True)
+            )
+        )
+        prefetch.start()
+        started.wait(5)
+        agents = [
+            threading.Thread(
+                target=lambda name=name: results.setdefault(
+                    name, download.download_file("http://x.com/p")
+                )
+            )
+            for name in ("agent-1", "agent-2")
+        ]
+        for agent in agents:
+            agent.start()
+        time.sleep(0.05)
+        release.set()
+        prefetch.join(5)
+        for agent in agents:
+            agent.join(5)
+
+        assert results["prefetch"].startswith("Not a data file")
+        assert results["agent-1"] == results["agent-2"] == "/tmp/page.html"
+        assert fake.call_count == 2
+        assert overlaps == [0, 0]
+        assert download._in_flight == {}
@@ -1,11 +1,47 @@
 """Tests for app/tools/javascript.py"""
 
 import pytest
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock
 
+from app.resources.page_pool import PooledPage
 from app.tools.javascript import create_javascript_tool
 
 
+async def _load(pooled, url):
+    """Stand-in for BrowserClient.load: navigate and record the loaded URL."""
+    await pooled.page.goto(url)
+    pooled.loaded_url = url
+
+
+def _use_page(browser_client, page):
+    """Make browser_client.acquire_page() yield the given page and track releases."""
+    browser_client.released = 0
+
+    @asynccontextmanager
+    async def acquire_page():
+        try:
+            yield PooledPage(page=page, context=MagicMock())
+        finally:
+            browser_client.released += 1
+
+    browser_client.acquire_page = acquire_page
+    browser_client.load = AsyncMock(side_effect=_load)
+
+
+def _use_session_page(browser_client, page, loaded_url=""):
+    """Make browser_client.session_page() yield one persistent pooled page."""
+    pooled = PooledPage(page=page, context=MagicMock(), loaded_url=loaded_url)
+
+    @asynccontextmanager
+    async def session_page(session_id):
+        yield pooled
+
+    browser_client.session_page = session_page
+    browser_client.load = AsyncMock(side_effect=_load)
+    return pooled
+
+
 class TestJavascriptTool:
     """Test cases for javascript_tool function."""
 
@@ -37,7 +73,7 @@ class TestJavascriptTool:
     @pytest.mark.asyncio
     async def test_executes_javascript_code(self, mock_browser_client, mock_page):
         """Test executing JavaScript code."""
-        mock_browser_client.browser.new_page = AsyncMock(return_value=mock_page)
+        _use_page(mock_browser_client, mock_page)
         mock_page.evaluate.return_value = "Hello from JS"
 
         tool = create_javascript_tool(mock_browser_client)
@@ -55,7 +91,7 @@ class TestJavascriptTool:
     @pytest.mark.asyncio
     async def test_returns_json_for_dict(self, mock_browser_client, mock_page):
         """Test that dict results are returned as JSON."""
-        mock_browser_client.browser.new_page = AsyncMock(return_value=mock_page)
+        _use_page(mock_browser_client, mock_page)
         mock_page.evaluate.return_value = {"key": "value", "count": 42}
 
         tool = create_javascript_tool(mock_browser_client)
@@ -72,7 +108,7 @@ class TestJavascriptTool:
     @pytest.mark.asyncio
     async def test_returns_json_for_list(self, mock_browser_client, mock_page):
         """Test that list results are returned as JSON."""
-        mock_browser_client.browser.new_page = AsyncMock(return_value=mock_page)
+        _use_page(mock_browser_client, mock_page)
         mock_page.evaluate.return_value = [1, 2, 3, 4, 5]
 
         tool = create_javascript_tool(mock_browser_client)
@@ -88,7 +124,7 @@ class TestJavascriptTool:
     @pytest.mark.asyncio
     async def test_handles_none_result(self, mock_browser_client, mock_page):
         """Test handling of None/undefined result."""
-        mock_browser_client.browser.new_page = AsyncMock(return_value=mock_page)
+        _use_page(mock_browser_client, mock_page)
         mock_page.evaluate.return_value = None
 
         tool = create_javascript_tool(mock_browser_client)
@@ -104,7 +140,7 @@ class TestJavascriptTool:
     @pytest.mark.asyncio
     async def test_handles_timeout_error(self, mock_browser_client, mock_page):
         """Test handling of timeout error."""
-        mock_browser_client.browser.new_page = AsyncMock(return_value=mock_page)
+        _use_page(mock_browser_client, mock_page)
         mock_page.goto.side_effect = Exception("Timeout exceeded")
 
         tool = create_javascript_tool(mock_browser_client)
@@ -121,7 +157,7 @@ class TestJavascriptTool:
     @pytest.mark.asyncio
     async def test_handles_undefined_error(self, mock_browser_client, mock_page):
         """Test handling of undefined property error."""
-        mock_browser_client.browser.new_page = AsyncMock(return_value=mock_page)
+        _use_page(mock_browser_client, mock_page)
         mock_page.evaluate.side_effect = Exception(
             "Cannot read properties of undefined"
         )
@@ -138,9 +174,9 @@ class TestJavascriptTool:
         assert "Hint" in result
 
     @pytest.mark.asyncio
-    async def test_closes_page_on_success(self, mock_browser_client, mock_page):
-        """Test that page is closed on success."""
-        mock_browser_client.browser.new_page = AsyncMock(return_value=mock_page)
+    async def test_releases_page_on_success(self, mock_browser_client, mock_page):
+        """Test that the page is returned to the pool on success."""
+        _use_page(mock_browser_client, mock_page)
         mock_page.evaluate.return_value = "result"
 
         tool = create_javascript_tool(mock_browser_client)
@@ -151,12 +187,13 @@ class TestJavascriptTool:
             }
         )
 
-        mock_page.close.assert_called_once()
+        assert mock_browser_client.released == 1
+        mock_page.close.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_closes_page_on_error(self, mock_browser_client, mock_page):
-        """Test that page is closed on error."""
-        mock_browser_client.browser.new_page = AsyncMock(return_value=mock_page)
+    async def test_releases_page_on_error(self, mock_browser_client, mock_page):
+        """Test that the page is returned to the pool on error."""
+        _use_page(mock_browser_client, mock_page)
         mock_page.evaluate.side_effect = Exception("Error")
 
         tool = create_javascript_tool(mock_browser_client)
@@ -167,12 +204,13 @@ class TestJavascriptTool:
             }
         )
 
-        mock_page.close.assert_called_once()
+        assert mock_browser_client.released == 1
+        mock_page.close.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_navigates_to_correct_url(self, mock_browser_client, mock_page):
         """Test that navigation goes to the correct URL."""
-        mock_browser_client.browser.new_page = AsyncMock(return_value=mock_page)
+        _use_page(mock_browser_client, mock_page)
         mock_page.evaluate.return_value = "ok"
 
         tool = create_javascript_tool(mock_browser_client)
@@ -186,3 +224,38 @@ class TestJavascriptTool:
         mock_page.goto.assert_called_once()
         call_args = mock_page.goto.call_args
         assert call_args[0][0] == "http://specific-url.com/page"
+
+
+class TestJavascriptSession:
+    """Test cases for javascript_tool bound to a quiz session."""
+
+    @pytest.fixture
+    def mock_page(self):
+        page = AsyncMock()
+        page.evaluate = AsyncMock(return_value=42)
+        return page
+
+    @pytest.mark.asyncio
+    async def test_reuses_loaded_page(self, mock_page, mocker):
+        """Test that code runs on the session page without reloading it."""
+        browser_client = MagicMock()
+        _use_session_page(browser_client, mock_page, "http://example.com/q1")
+
+        tool = create_javascript_tool(browser_client, "s1")
+        result = await tool.ainvoke({"url": "http://example.com/q1", "code": "1"})
+
+        assert result == "42"
+        mock_page.goto.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_navigates_when_url_changes(self, mock_page, mocker):
+        """Test that the session page navigates only when the URL differs."""
+        browser_client = MagicMock()
+        pooled = _use_session_page(browser_client, mock_page, "http://example.com/q1")
+
+        tool = create_javascript_tool(browser_client, "s1")
+        await tool.ainvoke({"url": "http://example.com/q2", "code": "1"})
+        await tool.ainvoke({"url": "http://example.com/q2", "code": "2"})
+
+        mock_page.goto.assert_called_once()
+        assert pooled.loaded_url == "http://example.com/q2"
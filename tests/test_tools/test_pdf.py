@@ -0,0 +1,130 @@
+"""Tests for app/tools/pdf.py"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.tools import pdf
+from app.tools.pdf import extract_pdf, extract_pdf_tool
+
+
+@pytest.fixture
+def pdf_settings(tmp_path, mocker):
+    """Patch settings used by the PDF tool and cache."""
+    mock_settings = MagicMock()
+    mock_settings.TEMP_DIR = tmp_path / "temp"
+    mock_settings.CACHE_DIR = tmp_path / "cache"
+    mock_settings.PDF_PARALLEL_MIN_PAGES = 100
+    mock_settings.PDF_MAX_WORKERS = 2
+    mock_settings.TEMP_DIR.mkdir()
+    mocker.patch("app.tools.pdf.settings", mock_settings)
+    mocker.patch("app.utils.cache.settings", mock_settings)
+    return mock_settings
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Create a three-page PDF with a small table on each page."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    path = tmp_path / "report.pdf"
+    rows = [
+        "name      age      city",
+        "Alice     30       NYC",
+        "Bob       25       LA",
+    ]
+    with PdfPages(path) as pdf:
+        for page in range(3):
+            fig = plt.figure(figsize=(8.5, 11))
+            fig.text(0.1, 0.9, f"Section {page + 1}", family="monospace")
+            for k, row in enumerate(rows):
+                fig.text(0.1, 0.8 - k * 0.03, row, family="monospace")
+            pdf.savefig(fig)
+            plt.close(fig)
+    return path
+
+
+class TestExtractPdf:
+    """Test cases for extract_pdf function."""
+
+    def test_extracts_text_and_tables(self, sample_pdf, pdf_settings):
+        """Test that page text and tables are extracted."""
+        _, pages = extract_pdf(str(sample_pdf))
+
+        assert list(pages) == [0, 1, 2]
+        assert "Section 2" in pages[1]["text"]
+        assert pages[0]["tables"] == ["name,age,city\nAlice,30,NYC\nBob,25,LA\n"]
+
+    def test_page_selection(self, sample_pdf, pdf_settings):
+        """Test that only selected pages are extracted."""
+        _, pages = extract_pdf(str(sample_pdf), "3")
+
+        assert list(pages) == [2]
+
+    def test_pages_are_cached(self, sample_pdf, pdf_settings, mocker):
+        """Test that a second extraction reads every page from the cache."""
+        extract_pdf(str(sample_pdf))
+        spy = mocker.patch("app.tools.pdf.extract_pages")
+
+        _, pages = extract_pdf(str(sample_pdf))
+
+        spy.assert_not_called()
+        assert "Section 1" in pages[0]["text"]
+
+    def test_parallel_extraction(self, sample_pdf, pdf_settings):
+        """Test extraction across worker processes keeps page order."""
+        pdf_settings.PDF_PARALLEL_MIN_PAGES = 2
+
+        _, pages = extract_pdf(str(sample_pdf))
+
+        assert [p["text"].splitlines()[0] for p in pages.values()] == [
+            "Section 1",
+            "Section 2",
+            "Section 3",
+        ]
+
+    def test_worker_pool_is_reused(self, sample_pdf, pdf_settings, mocker):
+        """Test parallel extractions share one worker pool until shut down."""
+        pdf_settings.PDF_PARALLEL_MIN_PAGES = 2
+        mocker.patch("app.tools.pdf.cache_get", return_value=(False, None))
+        pdf.shutdown_workers()
+        try:
+            extract_pdf(str(sample_pdf))
+            pool = pdf._pool
+            extract_pdf(str(sample_pdf), "1-2")
+            assert pdf._pool is pool is not None
+        finally:
+            pdf.shutdown_workers()
+        assert pdf._pool is None
+
+
+class TestExtractPdfTool:
+    """Test cases for extract_pdf_tool function."""
+
+    def test_returns_summary_with_handles(self, sample_pdf, pdf_settings):
+        """Test that the summary points at the full text and table files."""
+        result = extract_pdf_tool.invoke({"file_path": str(sample_pdf)})
+
+        assert "Extracted 3 page(s)" in result
+        text_path = result.split("Full text: ")[1].splitlines()[0]
+        assert "=== Page 3 ===" in open(text_path).read()
+        assert result.count(".csv") == 3
+
+    def test_file_not_found(self, tmp_path, pdf_settings):
+        """Test error for a missing file."""
+        result = extract_pdf_tool.invoke({"file_path": str(tmp_path / "none.pdf")})
+
+        assert "not found" in result.lower()
+
+    def test_invalid_pdf(self, tmp_path, pdf_settings):
+        """Test error for a file that is not a PDF."""
+        path = tmp_path / "bad.pdf"
+        path.write_text("not a pdf")
+
+        result = extract_pdf_tool.invoke({"file_path": str(path)})
+
+        assert "Error" in result
@@ -1,151 +1,195 @@
 """Tests for app/tools/python.py"""
 
 import sys
+import uuid
+from unittest.mock import patch
 
+import pandas as pd
+import pytest
+import pytest_asyncio
 
-from app.tools.python import python_tool, reset_python_session, GLOBAL_SCOPE
+from app.config.settings import settings
+from app.resources.kernels import KernelPool
+from app.tools.python import create_python_tool
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def kernels(tmp_path_factory):
+    """One kernel process shared by the tests in this module."""
+    with patch.object(settings, "TEMP_DIR", tmp_path_factory.mktemp("dumps")):
+        async with KernelPool(kernels=1) as pool:
+            yield pool
+
+
+@pytest.fixture
+def python_tool(kernels):
+    """Python tool bound to a fresh session."""
+    return create_python_tool(kernels, uuid.uuid4().hex)
 
 
 class TestPythonTool:
     """Test cases for python_tool function."""
 
-    def setup_method(self):
-        """Reset Python session before each test."""
-        reset_python_session()
-
-    def test_simple_print(self):
+    async def test_simple_print(self, python_tool):
         """Test simple print statement."""
-        result = python_tool.invoke({"code": "print('Hello, World!')"})
+        result = await python_tool.ainvoke({"code": "print('Hello, World!')"})
         assert result == "Hello, World!"
 
-    def test_arithmetic_calculation(self):
+    async def test_arithmetic_calculation(self, python_tool):
         """Test arithmetic calculations."""
-        result = python_tool.invoke({"code": "print(2 + 2)"})
+        result = await python_tool.ainvoke({"code": "print(2 + 2)"})
         assert result == "4"
 
-    def test_variable_assignment_and_use(self):
+    async def test_variable_assignment_and_use(self, python_tool):
         """Test variable assignment persists across calls."""
-        python_tool.invoke({"code": "x = 10"})
-        result = python_tool.invoke({"code": "print(x * 2)"})
+        await python_tool.ainvoke({"code": "x = 10"})
+        result = await python_tool.ainvoke({"code": "print(x * 2)"})
         assert result == "20"
 
-    def test_pandas_available(self):
+    async def test_pandas_available(self, python_tool):
         """Test that pandas is pre-imported."""
-        result = python_tool.invoke({"code": "print(pd.__name__)"})
+        result = await python_tool.ainvoke({"code": "print(pd.__name__)"})
         assert result == "pandas"
 
-    def test_numpy_available(self):
+    async def test_numpy_available(self, python_tool):
         """Test that numpy is pre-imported."""
-        result = python_tool.invoke({"code": "print(np.__name__)"})
+        result = await python_tool.ainvoke({"code": "print(np.__name__)"})
         assert result == "numpy"
 
-    def test_no_output_warning(self):
+    async def test_no_output_warning(self, python_tool):
         """Test that no output returns a warning message."""
-        result = python_tool.invoke({"code": "x = 5"})
+        result = await python_tool.ainvoke({"code": "x = 5"})
         assert "No output provided" in result or "Did you forget to print" in result
 
-    def test_syntax_error(self):
+    async def test_syntax_error(self, python_tool):
         """Test handling of syntax errors."""
-        result = python_tool.invoke({"code": "if True print('error')"})
+        result = await python_tool.ainvoke({"code": "if True print('error')"})
         assert "Error" in result or "error" in result.lower()
 
-    def test_name_error_with_hint(self):
+    async def test_name_error_with_hint(self, python_tool):
         """Test NameError includes helpful hint."""
-        reset_python_session()
-        result = python_tool.invoke({"code": "print(undefined_variable)"})
+        result = await python_tool.ainvoke({"code": "print(undefined_variable)"})
         assert "NameError" in result
         assert "Hint" in result
 
-    def test_module_not_found_with_hint(self):
+    async def test_module_not_found_with_hint(self, python_tool):
         """Test ModuleNotFoundError includes helpful hint."""
-        result = python_tool.invoke({"code": "import nonexistent_module_xyz"})
+        result = await python_tool.ainvoke({"code": "import nonexistent_module_xyz"})
         assert "ModuleNotFoundError" in result
         assert "Hint" in result
 
-    def test_multiline_code(self):
+    async def test_multiline_code(self, python_tool):
         """Test multiline code execution."""
         code = """
 for i in range(3):
     print(i)
 """
-        result = python_tool.invoke({"code": code})
+        result = await python_tool.ainvoke({"code": code})
         assert "0" in result
         assert "1" in result
         assert "2" in result
 
-    def test_function_definition_and_call(self):
+    async def test_function_definition_and_call(self, python_tool):
         """Test function definition persists."""
-        python_tool.invoke({"code": "def square(n): return n * n"})
-        result = python_tool.invoke({"code": "print(square(5))"})
+        await python_tool.ainvoke({"code": "def square(n): return n * n"})
+        result = await python_tool.ainvoke({"code": "print(square(5))"})
         assert result == "25"
 
-    def test_list_comprehension(self):
+    async def test_list_comprehension(self, python_tool):
         """Test list comprehension."""
-        result = python_tool.invoke({"code": "print([x**2 for x in range(5)])"})
+        result = await python_tool.ainvoke({"code": "print([x**2 for x in range(5)])"})
         assert "[0, 1, 4, 9, 16]" in result
 
-    def test_pandas_operations(self):
+    async def test_pandas_operations(self, python_tool):
         """Test pandas operations work."""
         code = """
 df = pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]})
 print(df['a'].sum())
 """
-        result = python_tool.invoke({"code": code})
+        result = await python_tool.ainvoke({"code": code})
         assert "6" in result
 
-    def test_numpy_operations(self):
+    async def test_numpy_operations(self, python_tool):
         """Test numpy operations work."""
         code = """
 arr = np.array([1, 2, 3, 4, 5])
 print(np.mean(arr))
 """
-        result = python_tool.invoke({"code": code})
+        result = await python_tool.ainvoke({"code": code})
         assert "3.0" in result
 
-    def test_exception_traceback(self):
+    async def test_exception_traceback(self, python_tool):
         """Test that exceptions include traceback."""
-        result = python_tool.invoke({"code": "1 / 0"})
+        result = await python_tool.ainvoke({"code": "1 / 0"})
         assert "ZeroDivisionError" in result
 
-    def test_stdout_captured(self):
+    async def test_stdout_captured(self, python_tool):
         """Test that stdout is properly captured and restored."""
         original_stdout = sys.stdout
-        python_tool.invoke({"code": "print('test')"})
+        await python_tool.ainvoke({"code": "print('test')"})
         assert sys.stdout == original_stdout
 
 
-class TestResetPythonSession:
-    """Test cases for reset_python_session function."""
+class TestSessionReset:
+    """Test cases for resetting a session's namespace."""
 
-    def test_reset_clears_variables(self):
+    async def test_reset_clears_variables(self, kernels):
         """Test that reset clears user-defined variables."""
-        python_tool.invoke({"code": "test_var = 123"})
-        reset_python_session()
-        result = python_tool.invoke({"code": "print(test_var)"})
+        python_tool = create_python_tool(kernels, "reset-session")
+        await python_tool.ainvoke({"code": "test_var = 123"})
+        await kernels.reset("reset-session")
+        result = await python_tool.ainvoke({"code": "print(test_var)"})
         assert "NameError" in result
 
-    def test_reset_preserves_pandas(self):
-        """Test that reset preserves pandas import."""
-        reset_python_session()
-        result = python_tool.invoke({"code": "print(pd.__name__)"})
-        assert result == "pandas"
-
-    def test_reset_preserves_numpy(self):
-        """Test that reset preserves numpy import."""
-        reset_python_session()
-        result = python_tool.invoke({"code": "print(np.__name__)"})
-        assert result == "numpy"
-
-    def test_reset_preserves_builtins(self):
-        """Test that reset preserves builtins."""
-        reset_python_session()
-        result = python_tool.invoke({"code": "print(len([1, 2, 3]))"})
-        assert result == "3"
+    async def test_reset_preserves_imports_and_builtins(self, kernels):
+        """Test that a reset namespace still has pd, np, and builtins."""
+        python_tool = create_python_tool(kernels, "reset-imports")
+        await kernels.reset("reset-imports")
+        result = await python_tool.ainvoke(
+            {"code": "print(pd.__name__, np.__name__, len([1, 2, 3]))"}
+        )
+        assert result == "pandas numpy 3"
+
+    async def test_sessions_are_isolated(self, kernels):
+        """Test that variables do not leak between quiz sessions."""
+        await create_python_tool(kernels, "a").ainvoke({"code": "shared = 1"})
+        result = await create_python_tool(kernels, "b").ainvoke(
+            {"code": "print(shared)"}
+        )
+        assert "NameError" in result
 
-    def test_global_scope_structure(self):
-        """Test GLOBAL_SCOPE has expected structure after reset."""
-        reset_python_session()
 
-        assert "pd" in GLOBAL_SCOPE
-        assert "np" in GLOBAL_SCOPE
-        assert "__builtins__" in GLOBAL_SCOPE
+class TestCompactOutput:
+    """Test cases for compact printing of pandas and numpy objects."""
+
+    async def test_large_frame_summarised(self, python_tool):
+        """Test printing a large DataFrame returns a summary, not every row."""
+        result = await python_tool.ainvoke(
+            {"code": "df = pd.DataFrame({'v': range(5000)})\nprint(df)"}
+        )
+        assert result.startswith("DataFrame with 5000 rows x 1 columns")
+        assert "2500" not in result
+        assert len(result) < 1000
+
+    async def test_dump_writes_full_data(self, python_tool):
+        """Test dump() saves the whole object and returns its path."""
+        result = await python_tool.ainvoke(
+            {"code": "print(dump(pd.DataFrame({'v': range(5000)}), 'full_frame'))"}
+        )
+        assert result.endswith("full_frame.csv")
+        assert len(pd.read_csv(result)) == 5000
+
+
+class TestBusyKernel:
+    """Test cases for a kernel busy with another session."""
+
+    async def test_busy_message_returned_as_is(self, mocker):
+        """Test a busy kernel is reported without the runtime error wrapper."""
+        pool = mocker.MagicMock()
+        pool.execute = mocker.AsyncMock(
+            return_value=(False, "kernel busy", {"limit": "busy"})
+        )
+        result = await create_python_tool(pool, "busy").ainvoke({"code": "x = 1"})
+        assert result == "kernel busy"
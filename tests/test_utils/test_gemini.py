@@ -77,6 +77,45 @@ class TestGeminiKeyManager:
         assert manager.get_next_key() == "only_key"
         assert manager.get_next_key() == "only_key"
 
+    def test_skips_unhealthy_key(self, mocker):
+        """Test that keys in cooldown are skipped during rotation."""
+        mock_settings = MagicMock()
+        mock_settings.GEMINI_API_KEYS = ["key1", "key2", "key3"]
+        mocker.patch("app.utils.gemini.settings", mock_settings)
+
+        manager = GeminiKeyManager()
+        manager.mark_unhealthy("key2", cooldown=60)
+
+        assert manager.get_next_key() == "key1"
+        assert manager.get_next_key() == "key3"
+        assert manager.get_next_key() == "key1"
+        assert manager.healthy_count() == 2
+
+    def test_all_unhealthy_falls_back_to_rotation(self, mocker):
+        """Test that rotation continues when every key is cooling down."""
+        mock_settings = MagicMock()
+        mock_settings.GEMINI_API_KEYS = ["key1", "key2"]
+        mocker.patch("app.utils.gemini.settings", mock_settings)
+
+        manager = GeminiKeyManager()
+        manager.mark_unhealthy("key1", cooldown=60)
+        manager.mark_unhealthy("key2", cooldown=60)
+
+        assert manager.get_next_key() == "key1"
+        assert manager.get_next_key() == "key2"
+        assert manager.healthy_count() == 0
+
+    def test_cooldown_expires(self, mocker):
+        """Test that a key returns to rotation after its cooldown."""
+        mock_settings = MagicMock()
+        mock_settings.GEMINI_API_KEYS = ["key1", "key2"]
+        mocker.patch("app.utils.gemini.settings", mock_settings)
+
+        manager = GeminiKeyManager()
+        manager.mark_unhealthy("key1", cooldown=0)
+
+        assert manager.healthy_count() == 2
+
 
 class TestGetGeminiClient:
     """Test cases for get_gemini_client function."""
@@ -102,6 +141,16 @@ class TestGetGeminiClient:
         assert call_kwargs["base_url"] == GEMINI_BASE_URL
         assert call_kwargs["timeout"] == 30
 
+    def test_uses_explicit_key(self, mocker):
+        """Test that an explicit key bypasses rotation."""
+        mocker.patch("app.utils.gemini.OpenAI")
+
+        get_gemini_client("explicit_key")
+
+        from app.utils.gemini import OpenAI
+
+        assert OpenAI.call_args.kwargs["api_key"] == "explicit_key"
+
 
 class TestGetMimeType:
     """Test cases for get_mime_type function."""
@@ -0,0 +1,165 @@
+"""Tests for app/utils/html.py"""
+
+import pytest
+
+from app.utils.html import (
+    MAX_SCRIPT_CHARS,
+    condense_html,
+    extract_data_links,
+    extract_links,
+    extract_tables,
+    html_to_text,
+    needs_browser,
+)
+
+QUESTION = "<h1>Question 1</h1><p>Download the CSV and sum the values.</p>"
+
+
+class TestNeedsBrowser:
+    def test_static_page(self):
+        assert needs_browser(f"<html><body>{QUESTION}</body></html>") is None
+
+    def test_json_data_scripts_are_ignored(self):
+        html = (
+            f"<html><body>{QUESTION}"
+            '<script type="application/ld+json">{"a": 1}</script></body></html>'
+        )
+        assert needs_browser(html) is None
+
+    def test_inline_dom_writes(self):
+        html = (
+            f"<html><body>{QUESTION}<div id='out'></div>"
+            "<script>document.querySelector('#out').innerHTML = 'x'</script>"
+            "</body></html>"
+        )
+        assert "DOM" in needs_browser(html)
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "document.getElementById('dl').href = '/real.csv'",
+            "document.querySelector('a').setAttribute('href', '/real.csv')",
+            "document.forms[0].answer.value = 42",
+            "var img = document.images[0]; img.src = 'chart2.png'",
+            "$('#dl').attr('href', '/real.csv')",
+        ],
+    )
+    def test_any_dom_access_needs_browser(self, code):
+        html = f"<html><body>{QUESTION}<a id='dl' href='/x'>d</a><script>{code}</script></body></html>"
+        assert needs_browser(html) is not None
+
+    def test_dom_free_script_is_static(self):
+        html = (
+            f"<html><body>{QUESTION}"
+            "<script>var total = [1, 2].reduce((a, b) => a + b, 0);</script>"
+            "</body></html>"
+        )
+        assert needs_browser(html) is None
+
+    def test_console_output_needs_browser(self):
+        html = (
+            f"<html><body>{QUESTION}<script>console.log('hint')</script></body></html>"
+        )
+        assert needs_browser(html) is not None
+
+    def test_external_script(self):
+        html = f"<html><body>{QUESTION}<script src='/app.js'></script></body></html>"
+        assert "external script" in needs_browser(html)
+
+    def test_empty_spa_root(self):
+        assert "#root" in needs_browser(
+            "<html><body><div id='root'></div></body></html>"
+        )
+
+    def test_noscript_notice(self):
+        html = (
+            f"<html><body>{QUESTION}"
+            "<noscript>Please enable JavaScript</noscript></body></html>"
+        )
+        assert "noscript" in needs_browser(html)
+
+    def test_empty_body(self):
+        assert needs_browser("<html><body><p>Hi</p></body></html>") == "empty body"
+
+
+class TestHtmlToText:
+    def test_strips_scripts_and_styles(self):
+        html = (
+            "<html><head><title>T</title></head><body><style>p{}</style>"
+            "<p>Visible</p><script>var x;</script></body></html>"
+        )
+        assert html_to_text(html) == "Visible"
+
+
+class TestExtractDataLinks:
+    def test_matches_extension_and_type(self):
+        html = (
+            '<a href="a.CSV">a</a><a href="/export" type="text/csv">b</a>'
+            '<audio src="clip.mp3"></audio><a href="page.html">c</a>'
+            '<a href="mailto:x@y.z">d</a>'
+        )
+        links = extract_data_links(
+            html, "http://example.com/quiz/", ["csv", "mp3"], ["text/csv"]
+        )
+        assert links == [
+            "http://example.com/quiz/a.CSV",
+            "http://example.com/export",
+            "http://example.com/quiz/clip.mp3",
+        ]
+
+
+class TestCondenseHtml:
+    PAGE = """<html><head><title>Quiz 3</title><style>p{color:red}</style>
+    <script src="/lib.js"></script></head><body>
+    <h1>Question</h1><p>Sum the <b>value</b> column.<br>Download <a href="data.csv">this file</a>.</p>
+    <table><tr><th>name</th><th>value</th></tr><tr><td>b, c</td><td>2</td></tr></table>
+    <ul><li>one</li></ul><img src="chart.png" alt="Chart"><pre>x   y</pre>
+    <form action="/submit" method="post"><input name="answer" placeholder="Your answer">
+    <input type="hidden" name="token" value="xyz"></form>
+    <div id="q"></div><script>document.getElementById("q").innerHTML = atob("SGk=")</script>
+    <script>window.dataLayer = [];</script>
+    </body></html>"""
+
+    def test_keeps_content_structure(self):
+        out = condense_html(self.PAGE, "http://example.com/quiz/")
+
+        assert out.startswith("Title: Quiz 3")
+        assert "# Question\nSum the value column.\nDownload this file." in out
+        assert '[Table 1]\nname,value\n"b, c",2' in out
+        assert "- one" in out
+        assert "```\nx   y\n```" in out
+        assert "[input: Your answer]" in out
+
+    def test_lists_links_media_forms_and_scripts(self):
+        out = condense_html(self.PAGE, "http://example.com/quiz/")
+
+        assert "- this file -> http://example.com/quiz/data.csv" in out
+        assert "- img: http://example.com/quiz/chart.png Chart" in out
+        assert (
+            "- POST http://example.com/submit: answer (input), token (hidden='xyz')"
+            in out
+        )
+        assert 'innerHTML = atob("SGk=")' in out
+        assert "window.dataLayer = [];" in out
+        assert "- http://example.com/lib.js" in out
+        assert "color:red" not in out
+
+    def test_long_scripts_truncated(self):
+        code = "var a = 1;" * 1000
+        out = condense_html(
+            f"<html><body><p>Hi</p><script>{code}</script></body></html>",
+            "http://example.com/",
+        )
+
+        assert code[:MAX_SCRIPT_CHARS] in out
+        assert f"({len(code) - MAX_SCRIPT_CHARS} more characters)" in out
+        assert code not in out
+
+
+def test_extract_links_and_tables():
+    html = (
+        '<a href="/a#top">a</a><a href="mailto:x@y.z">m</a><a href="/a">again</a>'
+        "<table><tr><th>k</th></tr><tr><td>1</td></tr></table><table></table>"
+    )
+    assert extract_links(html, "http://e.com/x/") == ["http://e.com/a"]
+    assert extract_tables(html) == ["k\n1"]
@@ -0,0 +1,82 @@
+"""Tests for app/utils/jsrender.py"""
+
+import pytest
+
+from app.utils import jsrender
+from app.utils.jsrender import render_inline_scripts
+
+URL = "https://quiz.example.com/q1?email=a@b.c"
+
+engine = pytest.mark.skipif(jsrender.quickjs is None, reason="quickjs not installed")
+
+
+def _page(script, body='<div id="result"></div>'):
+    return f"<html><head><title>Q</title></head><body><h1>Quiz</h1>{body}<script>{script}</script></body></html>"
+
+
+def test_returns_none_without_engine(mocker):
+    mocker.patch("app.utils.jsrender.quickjs", None)
+    assert render_inline_scripts(_page("var a = 1;"), URL) is None
+
+
+def test_external_scripts_need_browser():
+    html = '<html><body><script src="/app.js"></script></body></html>'
+    assert render_inline_scripts(html, URL) is None
+
+
+@engine
+class TestRenderInlineScripts:
+    def test_decodes_and_writes_result(self):
+        html = _page(
+            "document.getElementById('result').innerHTML = "
+            "'<b>' + atob('VGhlIHNlY3JldCBjb2RlIGlzIDQyNDI=') + '</b>';"
+        )
+        rendered, logs = render_inline_scripts(html, URL)
+
+        assert '<div id="result"><b>The secret code is 4242</b></div>' in rendered
+        assert logs == []
+
+    def test_document_write_console_and_location(self):
+        html = _page(
+            "console.log({a: 1}, location.hostname);"
+            "document.write('<p>Email: ' + location.search.split('=')[1] + ' ok</p>');",
+            body="",
+        )
+        rendered, logs = render_inline_scripts(html, URL)
+
+        assert "</script><p>Email: a@b.c ok</p>" in rendered
+        assert logs == ['[log] {\n  "a": 1\n}', '[log] "quiz.example.com"']
+
+    def test_runs_load_listeners_and_timers(self):
+        html = _page(
+            "document.addEventListener('DOMContentLoaded', function () {"
+            "  setTimeout(function () {"
+            "    document.querySelector('#result').textContent = 'Your token: ' + btoa('answer') + ' <ok>';"
+            "  }, 50);"
+            "});"
+        )
+        rendered, _ = render_inline_scripts(html, URL)
+
+        assert "Your token: YW5zd2Vy &lt;ok&gt;" in rendered
+
+    @pytest.mark.parametrize(
+        "script",
+        [
+            "fetch('/api')",
+            "document.createElement('div')",
+            "document.getElementById('result').children",
+            "document.querySelectorAll('p')",
+            "setInterval(function () {}, 10)",
+        ],
+    )
+    def test_unsupported_features_fall_back(self, script):
+        assert render_inline_scripts(_page(script), URL) is None
+
+    def test_runaway_script_times_out(self):
+        assert render_inline_scripts(_page("while (true) {}"), URL, timeout=0.1) is None
+
+    def test_incomplete_result_falls_back(self):
+        html = (
+            '<html><body><div id="root"></div><script>var x = 1;</script></body></html>'
+        )
+        assert render_inline_scripts(html, URL) is None
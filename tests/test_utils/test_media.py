@@ -0,0 +1,223 @@
+"""Tests for app/utils/media.py"""
+
+import os
+import subprocess
+import wave
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+import pytest
+
+from app.utils.media import (
+    _segment_bounds,
+    format_timestamp,
+    get_audio_duration,
+    get_media_kind,
+    get_video_duration,
+    sample_video_keyframes,
+    split_audio,
+)
+
+
+@pytest.fixture
+def media_settings(tmp_path, mocker):
+    """Patch media settings with small segment sizes."""
+    mock_settings = MagicMock()
+    mock_settings.TEMP_DIR = tmp_path / "out"
+    mock_settings.MEDIA_SEGMENT_SECONDS = 2
+    mock_settings.MEDIA_SEGMENT_OVERLAP_SECONDS = 0.5
+    mock_settings.VIDEO_KEYFRAME_INTERVAL_SECONDS = 1.0
+    mock_settings.VIDEO_FRAMES_PER_SEGMENT = 2
+    mock_settings.VIDEO_MAX_FRAMES = 100
+    mock_settings.MAX_FILE_SIZE_MB = 5
+    mocker.patch("app.utils.media.settings", mock_settings)
+    return mock_settings
+
+
+def _write_wav(path, seconds: float, rate: int = 8000, channels: int = 1):
+    """Write a silent 16-bit WAV file."""
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\x00\x00" * channels * int(seconds * rate))
+
+
+def _write_video(path, seconds: int, fps: int = 5):
+    """Write a small MJPG video with one distinct color per second."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (64, 48))
+    for i in range(seconds * fps):
+        writer.write(np.full((48, 64, 3), (i // fps) * 25, dtype=np.uint8))
+    writer.release()
+
+
+class TestHelpers:
+    """Test cases for small media helpers."""
+
+    def test_get_media_kind(self):
+        """Test media kind detection from extension."""
+        assert get_media_kind("a.mp3") == "audio"
+        assert get_media_kind("a.wav") == "audio"
+        assert get_media_kind("a.mp4") == "video"
+        assert get_media_kind("a.png") is None
+
+    def test_format_timestamp(self):
+        """Test MM:SS formatting."""
+        assert format_timestamp(0) == "00:00"
+        assert format_timestamp(125.7) == "02:05"
+
+    def test_segment_bounds_overlap(self):
+        """Test segment windows cover the duration with overlap."""
+        bounds = _segment_bounds(160, 60, 2)
+        assert bounds == [(0.0, 62.0), (60.0, 122.0), (120.0, 160)]
+
+    def test_segment_bounds_short_tail_merged(self):
+        """Test a near-empty final segment is folded into the previous one."""
+        assert _segment_bounds(121, 60, 2) == [(0.0, 62.0), (60.0, 121)]
+        assert _segment_bounds(70, 60, 2) == [(0.0, 70)]
+
+
+class TestSplitAudio:
+    """Test cases for audio splitting."""
+
+    def test_wav_duration(self, tmp_path):
+        """Test WAV duration is read natively."""
+        path = tmp_path / "a.wav"
+        _write_wav(path, 3)
+        assert get_audio_duration(str(path)) == pytest.approx(3.0)
+
+    def test_short_audio_not_split(self, tmp_path, media_settings):
+        """Test that audio shorter than one segment is not split."""
+        path = tmp_path / "short.wav"
+        _write_wav(path, 1.5)
+        assert split_audio(str(path)) is None
+
+    def test_long_wav_split_into_overlapping_segments(self, tmp_path, media_settings):
+        """Test WAV files are split into ordered overlapping segments."""
+        path = tmp_path / "long.wav"
+        _write_wav(path, 5)
+
+        segments = split_audio(str(path))
+
+        assert [(s, e) for s, e, _ in segments] == [(0.0, 2.5), (2.0, 4.5), (4.0, 5.0)]
+        for start, end, (segment_path,) in segments:
+            assert get_audio_duration(segment_path) == pytest.approx(end - start)
+
+    def test_segment_files_have_unique_names(self, tmp_path, media_settings):
+        """Test splitting the same file twice never reuses a segment path."""
+        path = tmp_path / "long.wav"
+        _write_wav(path, 5)
+
+        first = [p for _, _, paths in split_audio(str(path)) for p in paths]
+        second = [p for _, _, paths in split_audio(str(path)) for p in paths]
+
+        assert not set(first) & set(second)
+        assert all(os.path.dirname(p) == str(media_settings.TEMP_DIR) for p in first)
+
+    def test_barely_long_audio_not_split(self, tmp_path, media_settings):
+        """Test audio only slightly over one segment is sent whole."""
+        path = tmp_path / "almost.wav"
+        _write_wav(path, 2.2)
+        assert split_audio(str(path)) is None
+
+    def test_high_rate_segments_fit_size_limit(self, tmp_path, media_settings):
+        """Test 44.1 kHz stereo segments are shortened to stay within the limit."""
+        media_settings.MEDIA_SEGMENT_SECONDS = 60
+        media_settings.MAX_FILE_SIZE_MB = 2
+        path = tmp_path / "stereo.wav"
+        _write_wav(path, 20, rate=44100, channels=2)
+
+        segments = split_audio(str(path))
+
+        assert len(segments) > 1
+        assert segments[0][0] == 0.0 and segments[-1][1] == pytest.approx(20.0)
+        for _, _, (segment_path,) in segments:
+            assert os.path.getsize(segment_path) <= 2 * 1024 * 1024
+
+    def test_oversized_short_audio_is_split(self, tmp_path, media_settings):
+        """Test audio shorter than a segment is still split when over the limit."""
+        media_settings.MEDIA_SEGMENT_SECONDS = 60
+        media_settings.MAX_FILE_SIZE_MB = 2
+        path = tmp_path / "short.wav"
+        _write_wav(path, 12, rate=44100, channels=2)
+
+        segments = split_audio(str(path))
+
+        assert segments and len(segments) >= 2
+
+    def test_byte_rate_too_high_not_split(self, tmp_path, media_settings):
+        """Test audio whose segments would be uselessly short is left whole."""
+        media_settings.MEDIA_SEGMENT_SECONDS = 60
+        media_settings.MAX_FILE_SIZE_MB = 0.1
+        path = tmp_path / "dense.wav"
+        _write_wav(path, 10, rate=44100, channels=2)
+        assert split_audio(str(path)) is None
+
+    def test_non_wav_without_ffmpeg(self, tmp_path, media_settings, mocker):
+        """Test non-WAV audio is left whole when ffmpeg is unavailable."""
+        path = tmp_path / "a.mp3"
+        path.write_bytes(b"ID3")
+        mocker.patch("app.utils.media.shutil.which", return_value=None)
+        assert split_audio(str(path)) is None
+
+
+class TestSampleVideoKeyframes:
+    """Test cases for video keyframe sampling."""
+
+    def test_samples_frames_into_segments(self, tmp_path, media_settings, mocker):
+        """Test keyframes are sampled at the interval and batched in order."""
+        mocker.patch("app.utils.media.shutil.which", return_value=None)
+        media_settings.VIDEO_FRAMES_PER_SEGMENT = 5
+        path = tmp_path / "clip.avi"
+        _write_video(path, seconds=11)
+
+        assert get_video_duration(str(path)) == pytest.approx(11.0)
+        segments = sample_video_keyframes(str(path))
+
+        frames = [p for _, _, paths in segments for p in paths]
+        assert len(frames) == 11
+        # The single frame left over joins the last batch
+        assert [len(paths) for _, _, paths in segments] == [5, 6]
+        assert [(s, e) for s, e, _ in segments] == [(0.0, 5.0), (5.0, 11.0)]
+        assert all(p.endswith(".jpg") for p in frames)
+
+    def test_audio_track_attached_to_segments(self, tmp_path, media_settings, mocker):
+        """Test each segment gets the audio of its span after its frames."""
+        mocker.patch("app.utils.media.shutil.which", return_value="/usr/bin/ffmpeg")
+        run = mocker.patch("app.utils.media.subprocess.run")
+        path = tmp_path / "clip.avi"
+        _write_video(path, seconds=4)
+
+        segments = sample_video_keyframes(str(path))
+
+        assert len(segments) == 2
+        for start, end, paths in segments:
+            assert paths[-1].endswith(".mp3")
+            assert all(p.endswith(".jpg") for p in paths[:-1])
+        args = run.call_args_list[1].args[0]
+        assert args[args.index("-ss") + 1] == "2.000"
+        assert "-vn" in args
+
+    def test_silent_video_keeps_frames_only(self, tmp_path, media_settings, mocker):
+        """Test a video without an audio track still yields its keyframes."""
+        mocker.patch("app.utils.media.shutil.which", return_value="/usr/bin/ffmpeg")
+        run = mocker.patch(
+            "app.utils.media.subprocess.run",
+            side_effect=subprocess.CalledProcessError(1, "ffmpeg"),
+        )
+        path = tmp_path / "clip.avi"
+        _write_video(path, seconds=4)
+
+        segments = sample_video_keyframes(str(path))
+
+        assert all(p.endswith(".jpg") for _, _, paths in segments for p in paths)
+        run.assert_called_once()
+        assert not list(media_settings.TEMP_DIR.glob("*.mp3"))
+
+    def test_unreadable_video(self, tmp_path, media_settings):
+        """Test that unreadable files return None."""
+        path = tmp_path / "bad.mp4"
+        path.write_bytes(b"not a video")
+        assert sample_video_keyframes(str(path)) is None
+        assert get_video_duration(str(path)) is None
@@ -0,0 +1,44 @@
+"""Tests for app/utils/pdf.py"""
+
+from app.utils.pdf import detect_tables, parse_page_ranges, table_to_csv
+
+
+class TestParsePageRanges:
+    """Test cases for parse_page_ranges function."""
+
+    def test_empty_selects_all(self):
+        """Test that an empty spec selects every page."""
+        assert parse_page_ranges("", 3) == [0, 1, 2]
+
+    def test_ranges_and_single_pages(self):
+        """Test mixed ranges are converted to sorted 0-based indices."""
+        assert parse_page_ranges("5, 1-3", 10) == [0, 1, 2, 4]
+
+    def test_out_of_range_ignored(self):
+        """Test that pages beyond the document are dropped."""
+        assert parse_page_ranges("2-9", 3) == [1, 2]
+
+
+class TestDetectTables:
+    """Test cases for detect_tables function."""
+
+    def test_detects_aligned_columns(self):
+        """Test that aligned multi-space columns become a table."""
+        text = "Report title\n\nname    age   city\n\nAlice   30    NYC\nBob     25    LA\n"
+        tables = detect_tables(text)
+
+        assert tables == [
+            [["name", "age", "city"], ["Alice", "30", "NYC"], ["Bob", "25", "LA"]]
+        ]
+
+    def test_ignores_short_runs(self):
+        """Test that fewer than three aligned rows are not a table."""
+        assert detect_tables("a    b\nc    d\nplain sentence here") == []
+
+    def test_prose_is_not_a_table(self):
+        """Test that normal single-spaced prose is ignored."""
+        assert detect_tables("This is a line.\nAnother line.\nA third line.") == []
+
+    def test_table_to_csv(self):
+        """Test CSV rendering with quoting."""
+        assert table_to_csv([["a", "b,c"], ["1", "2"]]) == 'a,"b,c"\n1,2\n'
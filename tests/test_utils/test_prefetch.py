@@ -0,0 +1,69 @@
+"""Tests for app/utils/prefetch.py"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from app.utils import prefetch
+from app.utils.prefetch import start_prefetch
+
+PAGE = """<html><body>
+<a href="data.csv">CSV</a>
+<a href="/files/report.pdf">PDF</a>
+<a href="https://cdn.example.org/audio.mp3">Audio</a>
+<a href="/submit">Submit</a>
+<a href="data.csv#top">Again</a>
+</body></html>"""
+
+
+@pytest.fixture
+def mock_settings(mocker):
+    settings = MagicMock()
+    settings.PREFETCH_ENABLED = True
+    settings.PREFETCH_MAX_FILES = 2
+    settings.PREFETCH_MAX_FILE_MB = 1
+    settings.PREFETCH_CONCURRENCY = 2
+    settings.PREFETCH_EXTENSIONS = ["csv", "pdf", "mp3"]
+    settings.RESPONSE_CAPTURE_TYPES = []
+    mocker.patch("app.utils.prefetch.settings", settings)
+    return settings
+
+
+class TestStartPrefetch:
+    @pytest.mark.asyncio
+    async def test_downloads_capped_data_links(self, mock_settings, mocker):
+        download = mocker.patch(
+            "app.utils.prefetch.download_file", return_value="/tmp/x"
+        )
+
+        urls = start_prefetch(
+            PAGE, "http://example.com/quiz/1", skip=["http://example.com/quiz/data.csv"]
+        )
+        await asyncio.gather(*prefetch._tasks)
+
+        assert urls == [
+            "http://example.com/files/report.pdf",
+            "https://cdn.example.org/audio.mp3",
+        ]
+        assert download.call_count == 2
+        assert download.call_args.kwargs == {
+            "max_bytes": 1024 * 1024,
+            "data_only": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, mock_settings, mocker):
+        mock_settings.PREFETCH_ENABLED = False
+        download = mocker.patch("app.utils.prefetch.download_file")
+
+        assert start_prefetch(PAGE, "http://example.com/") == []
+        download.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_download_errors_do_not_escape(self, mock_settings, mocker):
+        mocker.patch(
+            "app.utils.prefetch.download_file", side_effect=OSError("disk full")
+        )
+
+        start_prefetch(PAGE, "http://example.com/")
+        await asyncio.gather(*prefetch._tasks)
@@ -0,0 +1,128 @@
+"""Tests for app/utils/tokens.py"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.utils import tokens
+from app.utils.tokens import (
+    TRUNCATION_MARKER,
+    allocate,
+    available_tokens,
+    count_message_tokens,
+    count_tokens,
+    fit_sections,
+    truncate_to_tokens,
+)
+
+
+@pytest.fixture(params=["estimate", "tokenizer"])
+def encoder(request, mocker):
+    """Run each test with the character estimate and with a word tokenizer."""
+    if request.param == "estimate":
+        mocker.patch("app.utils.tokens.get_encoder", return_value=None)
+        return None
+
+    class WordEncoder:
+        def encode(self, text, disallowed_special=()):
+            return text.split(" ")
+
+        def decode(self, words):
+            return " ".join(words)
+
+    mocker.patch("app.utils.tokens.get_encoder", return_value=WordEncoder())
+    return WordEncoder()
+
+
+def test_count_and_truncate(encoder):
+    text = "alpha " * 400
+    assert count_tokens(text) > 100
+
+    cut = truncate_to_tokens(text, 100)
+    assert cut.endswith(TRUNCATION_MARKER)
+    assert count_tokens(cut) <= 100 + 1
+    assert truncate_to_tokens("short", 100) == "short"
+
+
+def test_tokenizer_unavailable_falls_back(mocker):
+    mocker.patch.object(tokens, "tiktoken", None)
+    assert count_tokens("abcdefgh", model="any-model") == 2
+
+
+def test_failed_tokenizer_load_is_retried(mocker):
+    mocker.patch.dict(tokens._encoders, clear=True)
+    mocker.patch.dict(tokens._encoder_failed_at, clear=True)
+    loaded = object()
+    fake = mocker.patch.object(tokens, "tiktoken")
+    fake.encoding_for_model.side_effect = [OSError("offline"), loaded]
+    clock = mocker.patch("app.utils.tokens.time.monotonic", return_value=1000.0)
+
+    assert tokens.get_encoder("gpt-x") is None
+    assert tokens.get_encoder("gpt-x") is None  # held off, not retried yet
+    assert fake.encoding_for_model.call_count == 1
+
+    clock.return_value += tokens.ENCODER_RETRY_SECONDS
+    assert tokens.get_encoder("gpt-x") is loaded
+    assert tokens.get_encoder("gpt-x") is loaded
+    assert fake.encoding_for_model.call_count == 2
+
+
+def test_message_tokens_include_images_and_tool_calls(encoder):
+    text_only = count_message_tokens([HumanMessage(content="hello there")])
+    with_image = count_message_tokens(
+        [
+            HumanMessage(
+                content=[
+                    {"type": "text", "text": "hello there"},
+                    {"type": "image_url", "image_url": {"url": "data:..."}},
+                ]
+            )
+        ]
+    )
+    assert with_image == text_only + tokens.IMAGE_TOKENS
+
+    call = AIMessage(
+        content="", tool_calls=[{"name": "python_tool", "args": {}, "id": "1"}]
+    )
+    assert count_message_tokens([call]) > tokens.MESSAGE_OVERHEAD_TOKENS
+
+
+def test_available_tokens(encoder, mocker):
+    mocker.patch("app.utils.tokens.settings.LLM_CONTEXT_TOKENS", 1000)
+    mocker.patch("app.utils.tokens.settings.LLM_RESPONSE_RESERVE_TOKENS", 200)
+    assert available_tokens([]) == 800
+    assert available_tokens([HumanMessage(content="x " * 5000)]) == 0
+
+
+class TestAllocate:
+    def test_everything_fits(self):
+        assert allocate(100, {"a": 10, "b": 20}, {"a": 1, "b": 1}) == {
+            "a": 10,
+            "b": 20,
+        }
+
+    def test_small_sections_release_their_share(self):
+        allocation = allocate(
+            100,
+            {"page": 500, "logs": 5, "files": 80},
+            {
+                "page": 6,
+                "logs": 3,
+                "files": 1,
+            },
+        )
+        assert allocation["logs"] == 5
+        assert allocation["files"] == int(95 / 7)
+        assert allocation["page"] == int(95 * 6 / 7)
+
+    def test_zero_budget(self):
+        assert allocate(0, {"a": 10}, {"a": 1}) == {"a": 0}
+
+
+def test_fit_sections_reports_usage(encoder):
+    fitted, usage = fit_sections(
+        {"page": ("word " * 1000, 6), "logs": ("[log] hi", 3)}, budget=200
+    )
+    assert fitted["logs"] == "[log] hi"
+    assert fitted["page"].endswith(TRUNCATION_MARKER)
+    assert usage["page"]["needed"] > usage["page"]["tokens"]
+    assert usage["logs"]["tokens"] == usage["logs"]["needed"]
@@ -0,0 +1,119 @@
+"""Tests for app/utils/vision.py"""
+
+import cv2
+import numpy as np
+import pytest
+
+from app.utils.vision import decode_codes, format_decoded_codes, image_to_data_uri
+
+
+@pytest.fixture
+def qr_image(tmp_path):
+    """Create a PNG containing a QR code."""
+    code = cv2.QRCodeEncoder.create().encode("secret-42")
+    code = cv2.resize(code, None, fx=8, fy=8, interpolation=cv2.INTER_NEAREST)
+    code = cv2.copyMakeBorder(code, 40, 40, 40, 40, cv2.BORDER_CONSTANT, value=255)
+    path = tmp_path / "qr.png"
+    cv2.imwrite(str(path), code)
+    return path
+
+
+class TestDecodeCodes:
+    """Test cases for decode_codes function."""
+
+    def test_decodes_qr_code(self, qr_image):
+        """Test that a QR code is decoded locally."""
+        result = decode_codes(str(qr_image))
+
+        assert [c["data"] for c in result] == ["secret-42"]
+
+    def test_falls_back_to_cv2_without_zbar(self, qr_image, mocker):
+        """Test decoding works when the zbar library is unavailable."""
+        mocker.patch("app.utils.vision.pyzbar", None)
+
+        result = decode_codes(str(qr_image))
+
+        assert result[0]["data"] == "secret-42"
+
+    def test_blank_image_returns_empty(self, tmp_path):
+        """Test that images without codes return an empty list."""
+        path = tmp_path / "blank.png"
+        cv2.imwrite(str(path), np.full((100, 100, 3), 255, dtype=np.uint8))
+
+        assert decode_codes(str(path)) == []
+
+    def test_unreadable_file_returns_empty(self, tmp_path):
+        """Test that non-image files return an empty list."""
+        path = tmp_path / "fake.png"
+        path.write_bytes(b"not an image")
+
+        assert decode_codes(str(path)) == []
+
+    def test_format_decoded_codes(self):
+        """Test formatting of decoded results."""
+        text = format_decoded_codes([{"type": "QRCODE", "data": "abc"}])
+
+        assert "QRCODE: abc" in text
+
+
+class TestImageToDataUri:
+    """Test cases for image_to_data_uri function."""
+
+    @pytest.fixture
+    def screenshot(self, tmp_path):
+        """Create a large, noisy PNG resembling a full-page screenshot."""
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 255, (3000, 1400, 3), dtype=np.uint8)
+        path = tmp_path / "shot.png"
+        cv2.imwrite(str(path), image)
+        return path
+
+    def test_fits_byte_budget_and_width(self, screenshot):
+        """Test that the encoded image respects both limits."""
+        import base64
+        import io
+
+        from PIL import Image
+
+        uri = image_to_data_uri(str(screenshot), max_width=800, max_bytes=100_000)
+
+        assert uri.startswith("data:image/jpeg;base64,")
+        raw = base64.b64decode(uri.split(",", 1)[1])
+        assert len(raw) <= 100_000
+        assert Image.open(io.BytesIO(raw)).width <= 800
+
+    def test_tall_image_keeps_width(self, tmp_path):
+        """Test that a very tall page is cropped rather than scaled to a sliver."""
+        import base64
+        import io
+
+        from PIL import Image
+
+        image = np.full((30000, 1200, 3), 255, dtype=np.uint8)
+        image[::40, :, :] = 0  # a line of "text" every 40px
+        path = tmp_path / "tall.png"
+        cv2.imwrite(str(path), image)
+
+        uri = image_to_data_uri(str(path), max_width=800, max_bytes=150_000)
+
+        decoded = Image.open(io.BytesIO(base64.b64decode(uri.split(",", 1)[1])))
+        assert decoded.width == 800
+        assert decoded.height <= 800 * 4
+
+    def test_small_image_kept(self, tmp_path):
+        """Test that small images are encoded without shrinking below budget."""
+        path = tmp_path / "small.png"
+        cv2.imwrite(str(path), np.full((40, 40, 3), 200, dtype=np.uint8))
+
+        assert image_to_data_uri(str(path), 1024, 50_000) is not None
+
+    def test_impossible_budget_returns_none(self, screenshot):
+        """Test that None is returned when the budget cannot be met."""
+        assert image_to_data_uri(str(screenshot), 800, 100) is None
+
+    def test_unreadable_file_returns_none(self, tmp_path):
+        """Test that non-images return None."""
+        path = tmp_path / "fake.png"
+        path.write_bytes(b"nope")
+
+        assert image_to_data_uri(str(path), 800, 100_000) is None